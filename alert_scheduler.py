@@ -0,0 +1,330 @@
+"""
+⏰ Alert Scheduler Module
+Spreads daily subscription alerts over a delivery window:
+  → Users are hashed into shards, each shard gets its own slot in the window
+  → Per-user preferred alert time and time zone
+  → Users wait in a heap keyed by their next slot, so a tick only touches
+    the users that are due
+  → Append-only checkpoint so a restart resumes instead of resending
+"""
+
+import os
+import heapq
+import hashlib
+import logging
+import datetime
+from functools import lru_cache
+from typing import Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import fast_json
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ALERT_TIME = "09:00"
+DEFAULT_ALERT_TZ = "Asia/Kolkata"
+
+
+@lru_cache(maxsize=1024)  # Most users share a handful of times and zones
+def parse_alert_time(value: str) -> Optional[datetime.time]:
+    """Parse 'HH:MM' (24h) into a time, or None if invalid."""
+    try:
+        hour, minute = value.strip().split(":")
+        return datetime.time(hour=int(hour), minute=int(minute))
+    except (ValueError, AttributeError):
+        return None
+
+
+@lru_cache(maxsize=1024)
+def parse_timezone(value: str) -> Optional[datetime.tzinfo]:
+    """Parse an IANA zone ('Asia/Kolkata') or a UTC offset ('+05:30')."""
+    value = (value or "").strip()
+    if not value:
+        return None
+    if value[0] in "+-":
+        try:
+            sign = -1 if value[0] == "-" else 1
+            hours, _, minutes = value[1:].partition(":")
+            delta = datetime.timedelta(hours=int(hours), minutes=int(minutes or 0))
+            if delta > datetime.timedelta(hours=14):
+                return None
+            return datetime.timezone(sign * delta)
+        except ValueError:
+            return None
+    try:
+        return ZoneInfo(value)
+    except (ZoneInfoNotFoundError, ValueError):
+        return None
+
+
+class AlertScheduler:
+    """
+    Decides which subscribers are due for their daily alert.
+
+    Every user has a base time (their preferred time, or the default) in their
+    own zone. On top of that the user is hashed into one of `num_shards`
+    shards, and each shard is offset by an equal slice of `window_minutes`,
+    so a popular alert time is spread out instead of landing in one minute.
+
+    Delivered alerts are appended to a checkpoint log as `<local date> <user_id>`
+    lines. After a crash the log is replayed, so users already served today
+    are not sent again and the rest are still picked up (as long as their
+    slot is less than `max_lateness_hours` old).
+
+    Each tracked user's next slot is computed once (when they are tracked,
+    change their preference, or are served) and pushed on a heap, so
+    due_users() pops only the users whose slot has come instead of working
+    out every subscriber's slot every minute. A failed delivery is retried
+    `retry_minutes` later, within the same lateness limit.
+    """
+
+    def __init__(
+        self,
+        prefs_file: str,
+        checkpoint_file: str,
+        window_minutes: int = 60,
+        num_shards: int = 12,
+        max_per_tick: int = 200,
+        max_lateness_hours: float = 12,
+        retry_minutes: float = 10,
+    ):
+        self.prefs_file = prefs_file
+        self.checkpoint_file = checkpoint_file
+        self.window_minutes = max(0, window_minutes)
+        self.num_shards = max(1, num_shards)
+        self.max_per_tick = max(1, max_per_tick)
+        self.max_lateness = datetime.timedelta(hours=max_lateness_hours)
+        self.retry_delay = datetime.timedelta(minutes=retry_minutes)
+        self.prefs = {}
+        self.delivered = {}  # {user_id: "YYYY-MM-DD"}
+        self._compacted_on = None
+        self._heap = []    # (due timestamp, user_id); entries not matching _queued are stale
+        self._queued = {}  # {user_id: (due timestamp, slot)}
+        self._due = {}     # {user_id: slot} popped from the heap, not served yet (oldest first)
+
+    def load(self):
+        """Read preferences and replay the checkpoint log."""
+        self.prefs = self._load_prefs()
+        self.delivered = self._load_checkpoint()
+
+    # ─── Preferences ─────────────────────────────────────────────────────────
+
+    def _load_prefs(self) -> dict:
+        if os.path.exists(self.prefs_file):
+            try:
+                return fast_json.load_file(self.prefs_file, default={})
+            except Exception as e:
+                logger.error(f"Failed to load alert preferences: {e}")
+        return {}
+
+    def _save_prefs(self):
+        try:
+            fast_json.dump_file(self.prefs_file, self.prefs)
+        except Exception as e:
+            logger.error(f"Failed to save alert preferences: {e}")
+
+    def set_preference(self, user_id: str, alert_time: str, tz_name: str = ""):
+        """Store a user's preferred alert time ('HH:MM') and zone."""
+        pref = {"time": alert_time}
+        if tz_name:
+            pref["tz"] = tz_name
+        self.prefs[str(user_id)] = pref
+        self._save_prefs()
+        self._schedule(str(user_id), datetime.datetime.now(datetime.timezone.utc))
+
+    def get_preference(self, user_id: str) -> tuple[datetime.time, datetime.tzinfo]:
+        pref = self.prefs.get(str(user_id), {})
+        alert_time = parse_alert_time(pref.get("time", "")) or parse_alert_time(DEFAULT_ALERT_TIME)
+        tz = parse_timezone(pref.get("tz", "")) or parse_timezone(DEFAULT_ALERT_TZ)
+        return alert_time, tz
+
+    # ─── Checkpoint log ──────────────────────────────────────────────────────
+
+    def _load_checkpoint(self) -> dict:
+        delivered = {}
+        if os.path.exists(self.checkpoint_file):
+            try:
+                with open(self.checkpoint_file, "r", encoding="utf-8") as f:
+                    for line in f:
+                        date_str, _, user_id = line.strip().partition(" ")
+                        if user_id:
+                            delivered[user_id] = date_str
+            except Exception as e:
+                logger.error(f"Failed to load alert checkpoint: {e}")
+        return delivered
+
+    def mark_delivered(self, user_id: str, now: Optional[datetime.datetime] = None):
+        """Record that the current alert slot for `user_id` was served, and queue the next one."""
+        user_id = str(user_id)
+        now = now or datetime.datetime.now(datetime.timezone.utc)
+        slot = self._due.pop(user_id, None) or self.latest_slot(user_id, now) or now
+        slot_date = slot.date().isoformat()
+        self.delivered[user_id] = slot_date
+        try:
+            with open(self.checkpoint_file, "a", encoding="utf-8") as f:
+                f.write(f"{slot_date} {user_id}\n")
+        except Exception as e:
+            logger.error(f"Failed to write alert checkpoint: {e}")
+        self._push(user_id, self.next_slot(user_id, max(slot, now)))
+
+    def mark_failed(self, user_id: str, now: Optional[datetime.datetime] = None):
+        """Delivery to `user_id` failed: try again after `retry_delay`, unless that is too late."""
+        user_id = str(user_id)
+        now = now or datetime.datetime.now(datetime.timezone.utc)
+        slot = self._due.pop(user_id, None)
+        if slot is None:
+            return
+        retry_at = now + self.retry_delay
+        if retry_at - slot > self.max_lateness:
+            self._push(user_id, self.next_slot(user_id, now))
+        else:
+            self._push(user_id, slot, retry_at)
+
+    def compact_checkpoint(self, active_users):
+        """Rewrite the log keeping one line per active user."""
+        active = {str(u) for u in active_users}
+        self.delivered = {u: d for u, d in self.delivered.items() if u in active}
+        tmp_path = f"{self.checkpoint_file}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for user_id, date_str in self.delivered.items():
+                    f.write(f"{date_str} {user_id}\n")
+            os.replace(tmp_path, self.checkpoint_file)
+        except Exception as e:
+            logger.error(f"Failed to compact alert checkpoint: {e}")
+
+    def maybe_compact(self, active_users, now: Optional[datetime.datetime] = None):
+        """Compact the log at most once per UTC day."""
+        today = (now or datetime.datetime.now(datetime.timezone.utc)).date()
+        if self._compacted_on != today:
+            self.compact_checkpoint(active_users)
+            self._compacted_on = today
+
+    # ─── Scheduling ──────────────────────────────────────────────────────────
+
+    def shard_of(self, user_id: str) -> int:
+        digest = hashlib.md5(str(user_id).encode("utf-8")).digest()
+        return int.from_bytes(digest[:4], "big") % self.num_shards
+
+    def _slot_params(self, user_id: str) -> tuple[datetime.time, datetime.tzinfo, datetime.timedelta]:
+        """(base time, zone, shard offset) of a user, for the slot functions below."""
+        alert_time, tz = self.get_preference(user_id)
+        offset = self.shard_of(user_id) * self.window_minutes * 60 / self.num_shards
+        return alert_time, tz, datetime.timedelta(seconds=offset)
+
+    def slot_for(self, user_id: str, day: datetime.date, params: Optional[tuple] = None) -> datetime.datetime:
+        """Delivery time of `user_id`'s alert for local date `day`."""
+        alert_time, tz, offset = params or self._slot_params(user_id)
+        return datetime.datetime.combine(day, alert_time, tzinfo=tz) + offset
+
+    def latest_slot(self, user_id: str, now: datetime.datetime,
+                    params: Optional[tuple] = None) -> Optional[datetime.datetime]:
+        """
+        The most recent slot that has already started, or None.
+
+        Yesterday's slot is considered too, since a late base time plus the
+        shard offset can roll a slot past local midnight.
+        """
+        params = params or self._slot_params(user_id)
+        today = now.astimezone(params[1]).date()
+        for day in (today, today - datetime.timedelta(days=1)):
+            slot = self.slot_for(user_id, day, params)
+            if slot <= now:
+                return slot
+        return None
+
+    def next_slot(self, user_id: str, after: datetime.datetime,
+                  params: Optional[tuple] = None) -> datetime.datetime:
+        """The first slot that starts after `after`."""
+        params = params or self._slot_params(user_id)
+        day = after.astimezone(params[1]).date() - datetime.timedelta(days=1)
+        while True:
+            slot = self.slot_for(user_id, day, params)
+            if slot > after:
+                return slot
+            day += datetime.timedelta(days=1)
+
+    # ─── Queue ───────────────────────────────────────────────────────────────
+
+    def track(self, user_ids, now: Optional[datetime.datetime] = None):
+        """Queue every user in `user_ids` that isn't queued yet (e.g. the subscribers after load())."""
+        now = now or datetime.datetime.now(datetime.timezone.utc)
+        for user_id in user_ids:
+            user_id = str(user_id)
+            if user_id not in self._queued and user_id not in self._due:
+                self._schedule(user_id, now)
+
+    def forget(self, user_id: str):
+        """Stop scheduling `user_id` (their heap entry goes stale)."""
+        self._queued.pop(str(user_id), None)
+        self._due.pop(str(user_id), None)
+
+    def _schedule(self, user_id: str, now: datetime.datetime):
+        """Queue the user's current slot if it is still unserved and not too late, else the next one."""
+        self._due.pop(user_id, None)
+        params = self._slot_params(user_id)
+        # latest_slot()/next_slot() inlined: today's slot and, if that hasn't
+        # started, yesterday's cover nearly every user (this runs for every
+        # subscriber on start)
+        today = now.astimezone(params[1]).date()
+        slot, upcoming = self.slot_for(user_id, today, params), None
+        if slot > now:
+            slot, upcoming = self.slot_for(user_id, today - datetime.timedelta(days=1), params), slot
+        if slot > now or now - slot > self.max_lateness or self.delivered.get(user_id) == slot.date().isoformat():
+            slot = upcoming if upcoming is not None and slot <= now else self.next_slot(user_id, now, params)
+        self._push(user_id, slot)
+
+    def _push(self, user_id: str, slot: datetime.datetime, at: Optional[datetime.datetime] = None):
+        due_at = (at or slot).timestamp()
+        self._queued[user_id] = (due_at, slot)
+        heapq.heappush(self._heap, (due_at, user_id))
+
+    def due_users(self, now: Optional[datetime.datetime] = None, active=None) -> list[str]:
+        """
+        Users whose slot has started, who have not been served for it yet, and
+        whose slot is not older than `max_lateness`. Earliest first, capped
+        at `max_per_tick`; they stay due until mark_delivered()/mark_failed().
+        Users not in `active` (if given) are forgotten.
+        """
+        now = now or datetime.datetime.now(datetime.timezone.utc)
+        # A slot left due too long (never marked) gives way to the current
+        # one, which may have started already
+        for user_id in [u for u, slot in self._due.items() if now - slot > self.max_lateness]:
+            self._schedule(user_id, now)
+        limit = now.timestamp()
+        while self._heap and self._heap[0][0] <= limit:
+            due_at, user_id = heapq.heappop(self._heap)
+            entry = self._queued.get(user_id)
+            if entry is None or entry[0] != due_at:
+                continue
+            del self._queued[user_id]
+            self._due[user_id] = entry[1]
+
+        due = []
+        for user_id, slot in list(self._due.items()):
+            if active is not None and user_id not in active:
+                self.forget(user_id)
+            elif now - slot > self.max_lateness:
+                self._schedule(user_id, now)
+            else:
+                due.append(user_id)
+                if len(due) >= self.max_per_tick:
+                    break
+        return due
+
+    def upcoming(self, until: datetime.datetime, active=None) -> list[str]:
+        """Users due now or by `until`, without taking them off the queue."""
+        limit = until.timestamp()
+        users = [user_id for user_id in self._due if active is None or user_id in active]
+        # Only the part of the heap at or below `limit` is visited
+        stack = [0] if self._heap else []
+        while stack:
+            i = stack.pop()
+            due_at, user_id = self._heap[i]
+            if due_at > limit:
+                continue
+            entry = self._queued.get(user_id)
+            if entry is not None and entry[0] == due_at and (active is None or user_id in active):
+                users.append(user_id)
+            stack.extend(child for child in (2 * i + 1, 2 * i + 2) if child < len(self._heap))
+        return users
@@ -0,0 +1,98 @@
+"""
+⏱️ Benchmark: job description cleaning
+Compares the original `_clean_description` implementation with the
+precompiled single-pass `clean_description` on a corpus shaped like real
+JSearch descriptions (5-10 KB of HTML, lists, entities, long paragraphs).
+
+Usage:
+    python benchmarks/bench_clean_description.py [--jobs 500] [--repeat 5]
+"""
+
+import os
+import re
+import sys
+import random
+import argparse
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from job_searcher import clean_description  # noqa: E402
+
+WORDS = (
+    "we are looking for a motivated software engineer to join our growing team "
+    "you will design build and maintain scalable backend services work closely "
+    "with product managers designers and other engineers to deliver high quality "
+    "features experience with python django flask fastapi aws docker kubernetes "
+    "postgresql redis ci_cd pipelines and *agile* practices is a plus strong "
+    "communication skills ownership mindset and `attention` to detail required"
+).split()
+
+
+def _sentence(rng: random.Random) -> str:
+    words = rng.choices(WORDS, k=rng.randint(8, 22))
+    words[0] = words[0].capitalize()
+    return " ".join(words) + "."
+
+
+def make_description(rng: random.Random) -> str:
+    """One JSearch-like description: paragraphs, bullet lists, entities."""
+    parts = []
+    target = rng.randint(5_000, 10_000)
+    size = 0
+    while size < target:
+        kind = rng.random()
+        if kind < 0.45:
+            block = "<p>" + " ".join(_sentence(rng) for _ in range(rng.randint(2, 6))) + "</p>\n"
+        elif kind < 0.8:
+            items = "".join(f"<li>{_sentence(rng)}</li>\n" for _ in range(rng.randint(3, 8)))
+            block = f"<p><strong>Requirements &amp; Skills:</strong></p>\n<ul>\n{items}</ul>\n"
+        else:
+            block = "Benefits:&nbsp;" + " &bull; ".join(_sentence(rng) for _ in range(3)) + "<br/><br/>\n"
+        parts.append(block)
+        size += len(block)
+    return "".join(parts)
+
+
+def clean_description_old(text: str) -> str:
+    """The implementation this benchmark replaced, kept for comparison."""
+    if not text:
+        return "Description not available"
+    text = re.sub(r"<[^>]+>", "", text)
+    text = re.sub(r"\s+", " ", text).strip()
+    text = text.replace("*", "").replace("`", "").replace("_", " ")
+    sentences = text.split(". ")
+    result = ""
+    for s in sentences:
+        if len(result) + len(s) > 400:
+            break
+        result += s + ". "
+    return result.strip() or text[:400]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=500, help="descriptions in the corpus")
+    parser.add_argument("--repeat", type=int, default=5, help="timing repetitions (best is reported)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = [make_description(rng) for _ in range(args.jobs)]
+    total_kb = sum(len(d) for d in corpus) / 1024
+    print(f"Corpus: {len(corpus)} descriptions, {total_kb:.0f} KB, avg {total_kb / len(corpus):.1f} KB")
+
+    results = {}
+    for name, func in (("old", clean_description_old), ("new", clean_description)):
+        best = min(timeit.repeat(lambda: [func(d) for d in corpus], number=1, repeat=args.repeat))
+        results[name] = best
+        print(f"  {name:>3}: {best * 1000:8.2f} ms total, {best / len(corpus) * 1e6:8.1f} µs/description")
+
+    print(f"Speedup: {results['old'] / results['new']:.1f}x")
+
+    sample = clean_description(corpus[0])
+    print(f"\nSample output ({len(sample)} chars):\n{sample}")
+
+
+if __name__ == "__main__":
+    main()
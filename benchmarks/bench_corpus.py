@@ -0,0 +1,87 @@
+"""
+⏱️ Benchmark: local job corpus
+Ingests N parsed jobs (synthetic JSearch records, posted over the last
+`--max-age-days`) into a JobCorpus in batches the size of a search result,
+then runs a mix of overlapping user queries against it. Reports ingest
+cost, search latency and how many queries the corpus could answer without
+an upstream call. Fails (exit code 1) if the p95 search exceeds the budget.
+
+Usage:
+    python benchmarks/bench_corpus.py [--jobs 20000] [--budget-ms 50] [--path corpus.db]
+"""
+
+import os
+import sys
+import time
+import random
+import hashlib
+import argparse
+import datetime
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from job_corpus import JobCorpus  # noqa: E402
+from job_searcher import JobSearcher  # noqa: E402
+from bench_json import make_record  # noqa: E402
+from mock_services import percentile  # noqa: E402
+from bench_replay import QUERIES  # noqa: E402
+
+
+def job_hash(job: dict) -> str:
+    s = f"{job.get('title', '')}{job.get('company', '')}{job.get('apply_url', '')}"
+    return hashlib.md5(s.encode("utf-8")).hexdigest()[:10]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=20_000, help="jobs ingested")
+    parser.add_argument("--batch", type=int, default=10, help="jobs per ingest call (one search result)")
+    parser.add_argument("--queries", type=int, default=500, help="searches run against the corpus")
+    parser.add_argument("--results", type=int, default=8, help="results a search needs to count as answered")
+    parser.add_argument("--max-age-days", type=float, default=20.0)
+    parser.add_argument("--budget-ms", type=float, default=50.0, help="max p95 search latency")
+    parser.add_argument("--path", help="database file (default: a temporary file)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    jobs = JobSearcher().parse_jobs([make_record(rng, i) for i in range(args.jobs)])
+    for job in jobs:
+        job["posted_at"] = (now - datetime.timedelta(days=rng.random() * args.max_age_days)).isoformat()
+
+    path = args.path or os.path.join(tempfile.mkdtemp(prefix="jobbot-corpus-"), "corpus.db")
+    corpus = JobCorpus(path, hash_job=job_hash, max_jobs=args.jobs)
+
+    start = time.perf_counter()
+    ingest_times = []
+    for i in range(0, len(jobs), args.batch):
+        batch_start = time.perf_counter()
+        corpus.ingest(jobs[i:i + args.batch])
+        ingest_times.append(time.perf_counter() - batch_start)
+    ingest_seconds = time.perf_counter() - start
+
+    latencies, answered = [], 0
+    for _ in range(args.queries):
+        query = rng.choice(QUERIES)
+        start = time.perf_counter()
+        results, _newest = corpus.search(query, args.results)
+        latencies.append(time.perf_counter() - start)
+        answered += len(results) >= args.results
+
+    p95_ms = percentile(latencies, 95) * 1000
+    print(f"Ingest {len(jobs)} jobs: {ingest_seconds * 1000:.0f} ms "
+          f"(p95 {percentile(ingest_times, 95) * 1000:.2f} ms per {args.batch}-job batch), {corpus.count} stored")
+    print(f"Search: p50 {percentile(latencies, 50) * 1000:.2f} ms, p95 {p95_ms:.2f} ms (budget {args.budget_ms:.0f} ms)")
+    print(f"Answered locally: {answered}/{args.queries} ({answered / args.queries:.0%}) with ≥{args.results} results")
+    corpus.close()
+
+    if p95_ms > args.budget_ms:
+        print("FAIL: corpus search is over budget")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+⏱️ Benchmark: JSON decoding and encoding
+Measures parse time and peak memory for a realistic 10-page JSearch
+response with every available backend (stdlib json, orjson, msgspec typed
+decoding), plus encode time for a state file the size of saved_jobs.json.
+
+Usage:
+    python benchmarks/bench_json.py [--pages 10] [--repeat 5]
+"""
+
+import os
+import sys
+import json
+import random
+import argparse
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fast_json  # noqa: E402
+from bench_clean_description import make_description  # noqa: E402
+
+EMPLOYERS = ["Infosys", "TCS", "Wipro", "Flipkart", "Razorpay", "Zomato", "Swiggy", "Freshworks"]
+CITIES = [("Bengaluru", "Karnataka"), ("Mumbai", "Maharashtra"), ("Pune", "Maharashtra"), ("Hyderabad", "Telangana")]
+
+
+def make_record(rng: random.Random, i: int) -> dict:
+    """One JSearch /search record with the full set of upstream fields."""
+    city, state = rng.choice(CITIES)
+    employer = rng.choice(EMPLOYERS)
+    return {
+        "job_id": f"{i:08x}-{rng.getrandbits(64):016x}",
+        "employer_name": employer,
+        "employer_logo": f"https://logo.example.com/{employer.lower()}.png",
+        "employer_website": f"www.{employer.lower()}.com",
+        "employer_company_type": rng.choice(["Information Technology", "Finance", None]),
+        "employer_linkedin": None,
+        "job_publisher": rng.choice(["LinkedIn", "Indeed", "Glassdoor", "Naukri"]),
+        "job_employment_type": rng.choice(["FULLTIME", "CONTRACTOR", "INTERN"]),
+        "job_employment_types": ["FULLTIME"],
+        "job_title": rng.choice(["Python Developer", "Data Scientist", "Backend Engineer", "SDE II"]),
+        "job_apply_link": f"https://www.linkedin.com/jobs/view/{rng.getrandbits(40)}",
+        "job_apply_is_direct": False,
+        "job_apply_quality_score": rng.random(),
+        "apply_options": [
+            {"publisher": p, "apply_link": f"https://{p.lower()}.com/job/{rng.getrandbits(32)}", "is_direct": False}
+            for p in ("LinkedIn", "Indeed", "Glassdoor")
+        ],
+        "job_description": make_description(rng),
+        "job_is_remote": rng.random() < 0.2,
+        "job_posted_human_readable": "3 days ago",
+        "job_posted_at_timestamp": 1760000000 + i,
+        "job_posted_at_datetime_utc": "2026-10-15T10:00:00.000Z",
+        "job_location": f"{city}, {state}",
+        "job_city": city,
+        "job_state": state,
+        "job_country": "IN",
+        "job_latitude": 12.97 + rng.random(),
+        "job_longitude": 77.59 + rng.random(),
+        "job_benefits": ["health_insurance", "paid_time_off"],
+        "job_google_link": f"https://www.google.com/search?q=jobs&ibp=htl;jobs#{rng.getrandbits(40)}",
+        "job_offer_expiration_datetime_utc": None,
+        "job_required_experience": {
+            "no_experience_required": False,
+            "required_experience_in_months": rng.choice([None, 12, 24, 36, 60]),
+            "experience_mentioned": True,
+            "experience_preferred": False,
+        },
+        "job_required_skills": rng.sample(["Python", "Django", "AWS", "SQL", "Docker", "Kubernetes", "React"], 4),
+        "job_required_education": {"postgraduate_degree": False, "bachelors_degree": True},
+        "job_experience_in_place_of_education": False,
+        "job_min_salary": rng.choice([None, 600000, 1200000]),
+        "job_max_salary": rng.choice([None, 1500000, 2400000]),
+        "job_salary_currency": "INR",
+        "job_salary_period": rng.choice([None, "YEAR"]),
+        "job_highlights": {
+            "Qualifications": [f"{rng.randint(1, 8)}+ years of experience" for _ in range(5)],
+            "Responsibilities": [f"Own feature area number {n}" for n in range(8)],
+            "Benefits": ["Salary: ₹12-24 LPA", "Health insurance"],
+        },
+        "job_job_title": None,
+        "job_posting_language": "en",
+        "job_onet_soc": "15113200",
+        "job_onet_job_zone": "4",
+        "job_naics_code": "541511",
+        "job_naics_name": "Custom Computer Programming Services",
+    }
+
+
+def measure(decode, payload: bytes, repeat: int) -> tuple[float, float]:
+    """Best decode time (s) and peak traced memory (MB) while the result is alive."""
+    best = min(timeit.repeat(lambda: decode(payload), number=1, repeat=repeat))
+    tracemalloc.start()
+    result = decode(payload)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return best, peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=10, help="JSearch pages (10 records each)")
+    parser.add_argument("--repeat", type=int, default=5, help="timing repetitions (best is reported)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    response = {
+        "status": "OK",
+        "request_id": "bench",
+        "parameters": {"query": "python developer india", "page": 1, "num_pages": args.pages},
+        "data": [make_record(rng, i) for i in range(args.pages * 10)],
+    }
+    payload = json.dumps(response).encode("utf-8")
+    print(f"Response: {len(response['data'])} records, {len(payload) / 1024:.0f} KB")
+    print(f"fast_json backend: {fast_json.BACKEND}\n")
+
+    decoders = [("stdlib json.loads", json.loads)]
+    if fast_json.orjson is not None:
+        decoders.append(("orjson.loads", fast_json.orjson.loads))
+    if fast_json.msgspec is not None:
+        decoders.append(("msgspec untyped", fast_json.msgspec.json.decode))
+        decoders.append(("msgspec typed (JSearchRecord)", fast_json.decode_jsearch_response))
+
+    print(f"{'decoder':<32}{'time (ms)':>12}{'peak (MB)':>12}")
+    for name, decode in decoders:
+        seconds, peak = measure(decode, payload, args.repeat)
+        print(f"{name:<32}{seconds * 1000:>12.2f}{peak:>12.2f}")
+
+    # State file encoding: ~1000 users with 5 saved jobs each
+    state = {
+        str(100000 + u): [
+            {"title": r["job_title"], "company": r["employer_name"], "description": r["job_description"][:400]}
+            for r in response["data"][:5]
+        ]
+        for u in range(1000)
+    }
+    print(f"\n{'state file encode':<32}{'time (ms)':>12}{'size (KB)':>12}")
+    for name, encode in (
+        ("json.dumps(indent=4)", lambda: json.dumps(state, indent=4).encode("utf-8")),
+        (f"fast_json.dumps ({fast_json.BACKEND})", lambda: fast_json.dumps(state)),
+    ):
+        best = min(timeit.repeat(encode, number=1, repeat=args.repeat))
+        print(f"{name:<32}{best * 1000:>12.2f}{len(encode()) / 1024:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+"""
+⏱️ Benchmark: offline replay of the bot's main flows
+Runs the real handlers from bot.py against local stand-ins (see
+mock_services.py): JSearch replaying recorded responses, a Telegram Bot API
+with latency and flood limits, a stubbed translator and a stubbed Gemini.
+
+Scenarios (each at --concurrency concurrent updates):
+  search     text messages → perform_search
+  callbacks  page / save / applied / language button presses
+  resume     PDF uploads → handle_resume_pdf
+  alerts     one send_daily_jobs tick for --alert-users subscribers
+
+Reports p50/p95/p99 latency, throughput, errors, Telegram 429s and RSS, and
+exits with code 1 when a gate fails:
+  → --max-p95-ms SCENARIO=MS, --max-error-rate, --max-rss-mb
+  → --baseline FILE: p95 or throughput more than --tolerance worse than a
+    run saved earlier with --save-baseline FILE
+
+Usage:
+    python benchmarks/bench_replay.py [--scenarios search,callbacks] [--requests 50] [--concurrency 10]
+    python benchmarks/bench_replay.py --recording recorded/ --save-baseline baseline.json
+    python benchmarks/bench_replay.py --baseline baseline.json --tolerance 0.2
+"""
+
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import datetime
+
+from mock_services import BenchBot, UpdateFactory, add_service_args, percentile, rss_mb, start_services
+
+SCENARIOS = ("search", "callbacks", "resume", "alerts")
+QUERIES = [
+    "python developer", "data scientist bangalore", "react developer remote", "java developer pune",
+    "devops engineer", "product manager mumbai", "sde 2 hyderabad", "android developer",
+    "data analyst delhi", "backend engineer golang", "ui ux designer", "qa automation engineer",
+]
+USER_ID_BASE = 5_000_000
+
+
+async def drive(bench: BenchBot, payloads: list[dict], concurrency: int) -> tuple[list[float], float]:
+    """Process updates with `concurrency` workers; returns (latencies, wall seconds)."""
+    queue: asyncio.Queue = asyncio.Queue()
+    for payload in payloads:
+        queue.put_nowait(payload)
+    latencies = []
+
+    async def worker():
+        while not queue.empty():
+            payload = queue.get_nowait()
+            start = time.perf_counter()
+            await bench.process(payload)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, time.perf_counter() - start
+
+
+def search_updates(bench: BenchBot, factory: UpdateFactory, rng: random.Random, args) -> list[dict]:
+    payloads = []
+    for n in range(args.requests):
+        user_id = USER_ID_BASE + n
+        bench.bot.user_langs[str(user_id)] = args.lang
+        payloads.append(factory.text(user_id, rng.choice(QUERIES)))
+    return payloads
+
+
+async def callback_updates(bench: BenchBot, factory: UpdateFactory, rng: random.Random, args) -> list[dict]:
+    bot = bench.bot
+    jobs = await bot.searcher.search_jobs("python developer", num_results=10)
+    hashes = []
+    for job in jobs:
+        bot.build_job_keyboard(job)  # Registers the job in JOB_CACHE like a rendered card does
+        hashes.append(bot.get_job_hash(job))
+
+    encode = bot.callback_codec.encode
+    payloads = []
+    for n in range(args.requests):
+        user_id = USER_ID_BASE + 100_000 + n
+        bot.user_langs[str(user_id)] = args.lang
+        bot.user_sessions.put(user_id, "python developer", jobs)
+        kind = rng.random()
+        if kind < 0.4:
+            data = encode("page", 1, user_id)
+        elif kind < 0.7:
+            data = encode("save", rng.choice(hashes))
+        elif kind < 0.9:
+            data = encode("applied", rng.choice(hashes))
+        else:
+            data = encode("lang", rng.choice(["hi", "ta", "en"]))
+        payloads.append(factory.callback(user_id, data))
+    return payloads
+
+
+def resume_updates(bench: BenchBot, factory: UpdateFactory, args) -> list[dict]:
+    payloads = []
+    for n in range(args.requests):
+        user_id = USER_ID_BASE + 200_000 + n
+        bench.bot.user_langs[str(user_id)] = args.lang
+        payloads.append(factory.document(user_id, size=len(bench.telegram.pdf_bytes)))
+    return payloads
+
+
+async def run_alerts(bench: BenchBot, rng: random.Random, args) -> tuple[list[float], float]:
+    """One send_daily_jobs tick with every seeded subscriber due."""
+    bot = bench.bot
+    # An alert time a full window ago makes every shard slot due now
+    minutes_ago = bot.alert_scheduler.window_minutes + 5
+    alert_at = (datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(minutes=minutes_ago)).strftime("%H:%M")
+    for n in range(args.alert_users):
+        user_id = str(USER_ID_BASE + 300_000 + n)
+        bot.subscriptions[user_id] = [{"id": "1", "query": rng.choice(QUERIES), "filters": {}}]
+        bot.user_langs[user_id] = args.lang
+        bot.alert_scheduler.set_preference(user_id, alert_at, "+00:00")
+    bot.ALERT_USER_DELAY = args.alert_delay
+
+    latencies = []
+    send_user_alert = bot.send_user_alert
+
+    async def timed_send_user_alert(*a, **kw):
+        start = time.perf_counter()
+        try:
+            return await send_user_alert(*a, **kw)
+        finally:
+            latencies.append(time.perf_counter() - start)
+
+    bot.send_user_alert = timed_send_user_alert
+    try:
+        start = time.perf_counter()
+        await bot.send_daily_jobs(bench.context())
+        return latencies, time.perf_counter() - start
+    finally:
+        bot.send_user_alert = send_user_alert
+
+
+async def run_scenario(name: str, bench: BenchBot, args) -> dict:
+    rng = random.Random(args.seed)
+    factory = UpdateFactory()
+    errors_before = sum(bench.errors.values())
+    flood_before = sum(bench.telegram.flood_limited.values())
+    translations_before = bench.translator.calls
+    rss_before = rss_mb()
+
+    if name == "alerts":
+        latencies, elapsed = await run_alerts(bench, rng, args)
+        ops = args.alert_users
+    else:
+        if name == "search":
+            payloads = search_updates(bench, factory, rng, args)
+        elif name == "callbacks":
+            payloads = await callback_updates(bench, factory, rng, args)
+        else:
+            payloads = resume_updates(bench, factory, args)
+        latencies, elapsed = await drive(bench, payloads, args.concurrency)
+        ops = len(payloads)
+
+    errors = sum(bench.errors.values()) - errors_before
+    return {
+        "scenario": name,
+        "ops": ops,
+        "errors": errors,
+        "error_rate": errors / ops if ops else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "throughput": ops / elapsed if elapsed else 0.0,
+        "telegram_429": sum(bench.telegram.flood_limited.values()) - flood_before,
+        "translations": bench.translator.calls - translations_before,
+        "rss_mb": rss_mb(),
+        "rss_growth_mb": rss_mb() - rss_before,
+    }
+
+
+def print_report(results: list[dict]):
+    print(f"\n{'scenario':<11}{'ops':>6}{'err':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+          f"{'ops/s':>9}{'429s':>7}{'transl':>8}{'RSS MB':>9}{'ΔRSS':>8}")
+    for r in results:
+        print(f"{r['scenario']:<11}{r['ops']:>6}{r['errors']:>6}{r['p50_ms']:>10.0f}{r['p95_ms']:>10.0f}"
+              f"{r['p99_ms']:>10.0f}{r['throughput']:>9.2f}{r['telegram_429']:>7}{r['translations']:>8}"
+              f"{r['rss_mb']:>9.1f}{r['rss_growth_mb']:>8.1f}")
+
+
+def check_gates(results: list[dict], args) -> list[str]:
+    failures = []
+    max_p95 = dict(item.split("=", 1) for item in args.max_p95_ms)
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = {r["scenario"]: r for r in json.load(f)["results"]}
+
+    for r in results:
+        name = r["scenario"]
+        if name in max_p95 and r["p95_ms"] > float(max_p95[name]):
+            failures.append(f"{name}: p95 {r['p95_ms']:.0f} ms > {float(max_p95[name]):.0f} ms")
+        if r["error_rate"] > args.max_error_rate:
+            failures.append(f"{name}: error rate {r['error_rate']:.1%} > {args.max_error_rate:.1%}")
+        base = baseline.get(name)
+        if base:
+            if r["p95_ms"] > base["p95_ms"] * (1 + args.tolerance):
+                failures.append(f"{name}: p95 regressed {base['p95_ms']:.0f} → {r['p95_ms']:.0f} ms")
+            if r["throughput"] < base["throughput"] * (1 - args.tolerance):
+                failures.append(f"{name}: throughput regressed {base['throughput']:.2f} → {r['throughput']:.2f} ops/s")
+    if args.max_rss_mb and results and max(r["rss_mb"] for r in results) > args.max_rss_mb:
+        failures.append(f"RSS {max(r['rss_mb'] for r in results):.1f} MB > {args.max_rss_mb:.0f} MB")
+    return failures
+
+
+async def run(args) -> int:
+    jsearch, telegram, translator, genai = await start_services(args)
+    bench = await BenchBot(jsearch, telegram, translator, genai).start()
+    print(f"Mocks: JSearch {jsearch.server.url}, Telegram {telegram.server.url}; state in {bench.workdir}")
+
+    results = []
+    try:
+        for name in args.scenarios.split(","):
+            if name not in SCENARIOS:
+                raise SystemExit(f"unknown scenario {name!r}, choose from {', '.join(SCENARIOS)}")
+            print(f"→ {name} ...", flush=True)
+            results.append(await run_scenario(name, bench, args))
+    finally:
+        await bench.stop()
+        await jsearch.server.stop()
+        await telegram.server.stop()
+
+    print_report(results)
+    if bench.errors:
+        print(f"\nHandler errors: {dict(bench.errors)}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2, default=str)
+        print(f"Baseline saved to {args.save_baseline}")
+
+    failures = check_gates(results, args)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("OK")
+    return 1 if failures else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma separated")
+    parser.add_argument("--requests", type=int, default=40, help="updates per scenario")
+    parser.add_argument("--concurrency", type=int, default=10, help="updates processed at once")
+    parser.add_argument("--lang", default="hi", help="language of the simulated users (en skips translation)")
+    parser.add_argument("--alert-users", type=int, default=40, help="subscribers due in the alerts tick")
+    parser.add_argument("--alert-delay", type=float, default=0.0,
+                        help="bot.ALERT_USER_DELAY for the run (the bot's default is 1 s per user)")
+    gates = parser.add_argument_group("gates")
+    gates.add_argument("--max-p95-ms", action="append", default=[], metavar="SCENARIO=MS")
+    gates.add_argument("--max-error-rate", type=float, default=0.02)
+    gates.add_argument("--max-rss-mb", type=float, default=0.0, help="0 disables")
+    gates.add_argument("--baseline", help="results JSON from an earlier --save-baseline run")
+    gates.add_argument("--tolerance", type=float, default=0.25, help="allowed regression vs the baseline")
+    gates.add_argument("--save-baseline", help="write this run's results to a JSON file")
+    add_service_args(parser)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+⏱️ Benchmark: resume-to-job matching
+Builds a JobIndex over N parsed jobs (synthetic JSearch records) and times
+index building and per-resume scoring. Fails (exit code 1) if scoring one
+resume takes longer than the budget.
+
+Usage:
+    python benchmarks/bench_resume_match.py [--jobs 10000] [--budget-ms 50]
+"""
+
+import os
+import sys
+import random
+import argparse
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from job_searcher import JobSearcher  # noqa: E402
+from resume_matcher import JobIndex, ResumeProfile  # noqa: E402
+from bench_json import make_record  # noqa: E402
+
+RESUME = """
+Rahul Sharma · Pune · rahul@example.com
+Senior Software Engineer, Acme Fintech (2019 - Present)
+  Built payment microservices in Python, Django and FastAPI on AWS (EKS, RDS).
+  Led migration from a monolith to Docker/Kubernetes; CI/CD with GitHub Actions.
+Software Engineer, Bluebird Labs (2016 - 2019)
+  REST APIs with Flask and PostgreSQL, Redis caching, Celery workers.
+Skills: Python, Django, FastAPI, SQL, PostgreSQL, Redis, AWS, Docker, Kubernetes, Git, Agile
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=10_000, help="jobs in the index")
+    parser.add_argument("--repeat", type=int, default=20, help="scoring repetitions (best and median reported)")
+    parser.add_argument("--budget-ms", type=float, default=50.0, help="max time to score one resume")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    searcher = JobSearcher()
+    jobs = searcher.parse_jobs([make_record(rng, i) for i in range(args.jobs)])
+    print(f"Parsed {len(jobs)} jobs")
+
+    index = JobIndex()
+    add_seconds = timeit.timeit(lambda: [index.add(f"{i:08x}", job) for i, job in enumerate(jobs)], number=1)
+    profile = ResumeProfile(RESUME)
+    build_seconds = timeit.timeit(index._build, number=1)
+    timings = sorted(timeit.repeat(lambda: index.top(profile, k=10), number=1, repeat=args.repeat))
+    best, median = timings[0], timings[len(timings) // 2]
+
+    print(f"Resume: {profile.summary()}")
+    print(f"Tokenize + add {len(index)} jobs: {add_seconds * 1000:.0f} ms ({len(index.vocabulary)} terms)")
+    print(f"Build matrix:  {build_seconds * 1000:.1f} ms")
+    print(f"Score resume:  best {best * 1000:.2f} ms, median {median * 1000:.2f} ms (budget {args.budget_ms:.0f} ms)")
+    for job, score in index.top(profile, k=5):
+        print(f"  {score:.3f}  {job['title']} @ {job['company']} ({job['experience_months']} months)")
+
+    if median * 1000 > args.budget_ms:
+        print("FAIL: resume scoring is over budget")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
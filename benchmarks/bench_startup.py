@@ -0,0 +1,96 @@
+"""
+⏱️ Benchmark: bot cold start
+Imports bot.py in a fresh interpreter with `-X importtime`, reports the
+slowest imports, and fails (exit code 1) if:
+  → the total import time exceeds the startup budget, or
+  → a dependency that must stay lazy (PDF, Gemini, translator, Flask) is
+    imported at module load.
+Also times load_state() against the state files in the working directory.
+
+Usage:
+    python benchmarks/bench_startup.py [--budget-ms 1500] [--top 15] [--runs 3]
+"""
+
+import os
+import sys
+import argparse
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that bot.py must only import on first use
+LAZY_MODULES = ("PyPDF2", "google.generativeai", "deep_translator", "flask", "numpy")
+
+LOAD_STATE_SNIPPET = (
+    "import time, bot; t = time.perf_counter(); bot.load_state(); "
+    "print(f'{(time.perf_counter() - t) * 1000:.2f}')"
+)
+
+
+def run_importtime() -> list[tuple[int, int, str]]:
+    """Return (self_us, cumulative_us, module) rows for `import bot`."""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="0")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import bot"],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr[-2000:])
+        raise SystemExit("import bot failed")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        # "import time:   self_us | cumulative_us | <2 spaces per nesting level>name"
+        try:
+            self_us, cumulative_us, name = line.split(":", 1)[1].split("|", 2)
+            rows.append((int(self_us), int(cumulative_us), name[1:].rstrip()))
+        except ValueError:
+            continue
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=1500.0, help="max total import time of bot.py")
+    parser.add_argument("--top", type=int, default=15, help="slowest imports to list")
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters to run (best is used)")
+    args = parser.parse_args()
+
+    best_rows, best_total = None, None
+    for _ in range(args.runs):
+        rows = run_importtime()
+        total = max(cumulative for _, cumulative, name in rows if name.strip() == "bot")
+        if best_total is None or total < best_total:
+            best_rows, best_total = rows, total
+
+    print(f"{'cumulative (ms)':>16}{'self (ms)':>12}  module")
+    # Direct imports of bot.py (nesting level 1), they carry the nested cost
+    direct = [r for r in best_rows if r[2].startswith("  ") and not r[2].startswith("    ")]
+    for self_us, cumulative_us, name in sorted(direct, key=lambda r: -r[1])[:args.top]:
+        print(f"{cumulative_us / 1000:>16.1f}{self_us / 1000:>12.1f}  {name.strip()}")
+
+    imported = {name.strip() for _, _, name in best_rows}
+    eager = [m for m in LAZY_MODULES if m in imported]
+
+    state = subprocess.run([sys.executable, "-c", LOAD_STATE_SNIPPET], cwd=ROOT, capture_output=True, text=True)
+    load_ms = state.stdout.strip().splitlines()[-1] if state.returncode == 0 and state.stdout.strip() else "n/a"
+
+    print(f"\nimport bot: {best_total / 1000:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    print(f"load_state(): {load_ms} ms")
+
+    failed = False
+    if best_total / 1000 > args.budget_ms:
+        print("FAIL: startup import time is over budget")
+        failed = True
+    if eager:
+        print(f"FAIL: imported at startup but should be lazy: {', '.join(eager)}")
+        failed = True
+    if not failed:
+        print("OK")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+"""
+📈 Load generator: simulated user populations
+Feeds synthetic updates from a population of users to the real bot.py
+Application (through its update queue, as polling would) against the local
+mocks from mock_services.py, and reports how the bot scales.
+
+Each population size runs in a fresh interpreter. Its state files are
+seeded to match the size: languages for every user, saved jobs,
+subscriptions and applications for a fraction. Then `--rate` updates/s
+arrive for `--duration` seconds, drawn from this mix:
+  search 45% · page click 25% · save 15% · language change 10% · PDF upload 5%
+Active users are skewed: a few users send most of the updates.
+
+Recorded per population:
+  → update latency (enqueue → handled) and update-queue depth
+  → event-loop lag (a 50 ms sleeper's overshoot)
+  → deep size of user_sessions, JOB_CACHE and TRANSLATION_CACHE
+  → state-file write time (every fast_json.dump_file call)
+  → RSS
+
+Usage:
+    python benchmarks/load_generator.py [--users 1000,10000,100000] [--rate 10] [--duration 30]
+    python benchmarks/load_generator.py --users 10000 --concurrent-updates 32 --json report.json
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import subprocess
+from collections import defaultdict
+
+from mock_services import BenchBot, UpdateFactory, add_service_args, percentile, rss_mb, start_services, synthetic_responses
+
+MIX = (("search", 0.45), ("page", 0.25), ("save", 0.15), ("language", 0.10), ("pdf", 0.05))
+LANGUAGES = (("hi", 0.5), ("en", 0.3), ("ta", 0.1), ("te", 0.05), ("bn", 0.05))
+QUERIES = [
+    "python developer", "data scientist bangalore", "react developer remote", "java developer pune",
+    "devops engineer", "product manager mumbai", "sde 2 hyderabad", "android developer",
+    "data analyst delhi", "backend engineer golang", "ui ux designer", "qa automation engineer",
+    "sales executive", "hr recruiter noida", "content writer", "business analyst chennai",
+]
+USER_ID_BASE = 7_000_000
+LAG_INTERVAL = 0.05
+
+
+def deep_sizeof(obj, seen: set = None) -> int:
+    """Approximate bytes held by `obj` and everything it references (shared objects counted once)."""
+    seen = set() if seen is None else seen
+    stack = [obj]
+    total = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        elif hasattr(item, "__dict__"):
+            stack.append(vars(item))
+        elif hasattr(type(item), "__slots__"):
+            stack.extend(getattr(item, name) for name in type(item).__slots__ if hasattr(item, name))
+    return total
+
+
+def weighted(rng: random.Random, choices) -> str:
+    return rng.choices([c for c, _ in choices], weights=[w for _, w in choices])[0]
+
+
+class Population:
+    """Seeds bot state for `size` users and generates their updates."""
+
+    def __init__(self, bench: BenchBot, size: int, rng: random.Random):
+        self.bench = bench
+        self.bot = bench.bot
+        self.size = size
+        self.rng = rng
+        self.factory = UpdateFactory()
+        self.searched = []  # Users with a search session, targets for page clicks
+
+    def seed(self):
+        bot = self.bot
+        records = json.loads(synthetic_responses(count=1, records=10)[0])["data"]
+        jobs = bot.searcher.parse_jobs(records)
+        for n in range(self.size):
+            user_id = str(USER_ID_BASE + n)
+            bot.user_langs[user_id] = weighted(self.rng, LANGUAGES)
+            if self.rng.random() < 0.2:
+                bot.saved_jobs[user_id] = self.rng.sample(jobs, 3)
+            if self.rng.random() < 0.3:
+                bot.subscriptions[user_id] = [{"id": "1", "query": self.rng.choice(QUERIES), "filters": {}}]
+            if self.rng.random() < 0.1:
+                job = self.rng.choice(jobs)
+                bot.applications[user_id] = {bot.get_job_hash(job): {"job": job, "status": "applied", "date": "01 Oct 2026"}}
+        for job in jobs:
+            bot.build_job_keyboard(job)
+
+    def pick_user(self) -> int:
+        # Skewed activity: rng**3 favours low indexes, i.e. a core of heavy users
+        return USER_ID_BASE + int(self.size * self.rng.random() ** 3)
+
+    def next_update(self) -> tuple[str, dict]:
+        kind = weighted(self.rng, MIX)
+        user_id = self.pick_user()
+        if kind == "search":
+            self.searched.append(user_id)
+            return kind, self.factory.text(user_id, self.rng.choice(QUERIES))
+        if kind == "page":
+            target = self.rng.choice(self.searched) if self.searched else user_id
+            return kind, self.factory.callback(target, f"page_1_{target}")
+        if kind == "save":
+            job_hash = self.rng.choice(list(self.bot.JOB_CACHE))
+            return kind, self.factory.callback(user_id, f"save_{job_hash}")
+        if kind == "language":
+            return kind, self.factory.callback(user_id, f"lang_{weighted(self.rng, LANGUAGES)}")
+        return kind, self.factory.document(user_id, size=len(self.bench.telegram.pdf_bytes))
+
+
+async def measure_loop_lag(samples: list[float], stop: asyncio.Event):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(LAG_INTERVAL)
+        samples.append(max(0.0, loop.time() - start - LAG_INTERVAL))
+
+
+def record_state_writes(writes: dict):
+    """Wrap fast_json.dump_file so every state-file write is timed."""
+    import fast_json
+
+    dump_file = fast_json.dump_file
+
+    def timed_dump_file(path, obj):
+        start = time.perf_counter()
+        try:
+            return dump_file(path, obj)
+        finally:
+            writes[os.path.basename(path)].append((time.perf_counter() - start, os.path.getsize(path)))
+
+    fast_json.dump_file = timed_dump_file
+
+
+async def run_population(args) -> dict:
+    jsearch, telegram, translator, genai = await start_services(args)
+    bench = await BenchBot(jsearch, telegram, translator, genai,
+                           concurrent_updates=args.concurrent_updates or False).start()
+    bot = bench.bot
+    rng = random.Random(args.seed)
+
+    writes = defaultdict(list)
+    record_state_writes(writes)
+    population = Population(bench, args.population, rng)
+    start = time.perf_counter()
+    population.seed()
+    seed_seconds = time.perf_counter() - start
+    rss_seeded = rss_mb()
+
+    enqueued, handled = {}, {}
+    kinds = {}
+
+    async def mark_handled(update, context):
+        handled[update.update_id] = time.perf_counter()
+
+    from telegram import Update
+    from telegram.ext import TypeHandler
+
+    bench.app.add_handler(TypeHandler(Update, mark_handled), group=99)
+    await bench.app.start()
+
+    stop = asyncio.Event()
+    lag = []
+    lag_task = asyncio.create_task(measure_loop_lag(lag, stop))
+    queue_depth = []
+
+    interval = 1 / args.rate
+    run_start = time.perf_counter()
+    next_at = run_start
+    while time.perf_counter() - run_start < args.duration:
+        kind, payload = population.next_update()
+        update = Update.de_json(payload, bench.app.bot)
+        enqueued[update.update_id] = time.perf_counter()
+        kinds[update.update_id] = kind
+        await bench.app.update_queue.put(update)
+        queue_depth.append(bench.app.update_queue.qsize())
+        next_at += interval
+        await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+
+    drain_start = time.perf_counter()
+    while len(handled) < len(enqueued) and time.perf_counter() - drain_start < args.drain_timeout:
+        await asyncio.sleep(0.1)
+    stop.set()
+    await lag_task
+
+    # Jobs are shared: count them once, under the job store
+    seen = set()
+    job_cache_bytes = deep_sizeof(bot.JOB_CACHE, seen)
+    session_bytes = deep_sizeof(bot.user_sessions, seen)
+
+    latencies = defaultdict(list)
+    for update_id, at in handled.items():
+        latencies[kinds[update_id]].append(at - enqueued[update_id])
+    all_latencies = [v for values in latencies.values() for v in values]
+
+    report = {
+        "population": args.population,
+        "seed_seconds": seed_seconds,
+        "updates": len(enqueued),
+        "handled": len(handled),
+        "errors": sum(bench.errors.values()),
+        "p50_ms": percentile(all_latencies, 50) * 1000,
+        "p95_ms": percentile(all_latencies, 95) * 1000,
+        "p99_ms": percentile(all_latencies, 99) * 1000,
+        "by_kind_p95_ms": {kind: percentile(values, 95) * 1000 for kind, values in latencies.items()},
+        "max_queue_depth": max(queue_depth, default=0),
+        "final_queue_depth": bench.app.update_queue.qsize(),
+        "loop_lag_p99_ms": percentile(lag, 99) * 1000,
+        "loop_lag_max_ms": max(lag, default=0.0) * 1000,
+        "user_sessions_mb": session_bytes / 2**20,
+        "job_cache_mb": job_cache_bytes / 2**20,
+        "translation_cache_mb": deep_sizeof(bot.TRANSLATION_CACHE) / 2**20,
+        "state_writes": {
+            name: {
+                "count": len(samples),
+                "p50_ms": percentile([s for s, _ in samples], 50) * 1000,
+                "max_ms": max(s for s, _ in samples) * 1000,
+                "size_kb": samples[-1][1] / 1024,
+            }
+            for name, samples in writes.items()
+        },
+        "rss_seeded_mb": rss_seeded,
+        "rss_mb": rss_mb(),
+        "telegram_429": sum(telegram.flood_limited.values()),
+    }
+    await bench.stop()
+    await jsearch.server.stop()
+    await telegram.server.stop()
+    return report
+
+
+def run_child(args, population: int) -> dict:
+    """Run one population in a fresh interpreter so memory numbers don't mix."""
+    argv = [sys.executable, os.path.abspath(__file__), "--population", str(population)]
+    for key, value in vars(args).items():
+        if key in ("users", "json", "population") or value is None:
+            continue
+        argv += [f"--{key.replace('_', '-')}", str(value)]
+    proc = subprocess.run(argv, capture_output=True, text=True)
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr[-3000:])
+        raise SystemExit(f"population {population} failed")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def print_report(reports: list[dict]):
+    print(f"\n{'users':>8}{'updates':>9}{'handled':>9}{'err':>5}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+          f"{'max q':>7}{'lag p99':>9}{'lag max':>9}{'sess MB':>9}{'jobs MB':>9}{'tr MB':>7}{'RSS MB':>8}")
+    for r in reports:
+        print(f"{r['population']:>8}{r['updates']:>9}{r['handled']:>9}{r['errors']:>5}{r['p50_ms']:>9.0f}"
+              f"{r['p95_ms']:>9.0f}{r['p99_ms']:>9.0f}{r['max_queue_depth']:>7}{r['loop_lag_p99_ms']:>9.1f}"
+              f"{r['loop_lag_max_ms']:>9.1f}{r['user_sessions_mb']:>9.2f}{r['job_cache_mb']:>9.2f}"
+              f"{r['translation_cache_mb']:>7.2f}{r['rss_mb']:>8.1f}")
+
+    print(f"\n{'users':>8}  {'state file':<24}{'writes':>7}{'p50 ms':>9}{'max ms':>9}{'size KB':>10}")
+    for r in reports:
+        for name, w in sorted(r["state_writes"].items()):
+            print(f"{r['population']:>8}  {name:<24}{w['count']:>7}{w['p50_ms']:>9.2f}{w['max_ms']:>9.2f}{w['size_kb']:>10.0f}")
+
+    print(f"\n{'users':>8}  p95 by update kind (ms)")
+    for r in reports:
+        kinds = "  ".join(f"{k} {v:.0f}" for k, v in sorted(r["by_kind_p95_ms"].items()))
+        print(f"{r['population']:>8}  {kinds}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", default="1000,10000,100000", help="population sizes, comma separated")
+    parser.add_argument("--rate", type=float, default=10.0, help="updates per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of traffic per population")
+    parser.add_argument("--drain-timeout", type=float, default=60.0, help="seconds to wait for the queue to drain")
+    parser.add_argument("--concurrent-updates", type=int, default=0,
+                        help="Application.concurrent_updates (0 = sequential, as deployed)")
+    parser.add_argument("--json", help="also write the reports to this file")
+    parser.add_argument("--population", type=int, help=argparse.SUPPRESS)  # Child process mode
+    add_service_args(parser)
+    args = parser.parse_args()
+
+    if args.population:
+        print(json.dumps(asyncio.run(run_population(args))))
+        return
+
+    reports = []
+    for size in (int(s) for s in args.users.split(",")):
+        print(f"→ {size} users ...", flush=True)
+        reports.append(run_child(args, size))
+    print_report(reports)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(reports, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,516 @@
+"""
+🧪 Local stand-ins for the bot's external services (benchmarks only)
+  → MockJSearch: replays recorded (or synthetic) JSearch /search responses
+  → MockTelegram: Bot API with latency and per-chat / global flood limits
+  → StubTranslator / StubGenAI: replace deep_translator and Gemini
+  → BenchBot: imports bot.py in a scratch directory wired to all of the above
+  → Update builders for messages, commands, callbacks and PDF uploads
+
+Nothing here talks to the internet; every server binds to 127.0.0.1.
+"""
+
+import os
+import sys
+import json
+import time
+import math
+import random
+import asyncio
+import hashlib
+import logging
+import tempfile
+from collections import Counter, defaultdict
+from urllib.parse import urlsplit, parse_qsl
+from typing import Awaitable, Callable, Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT)
+
+BOT_TOKEN = "123456:BENCH"
+BOT_USER = {"id": 123456, "is_bot": True, "first_name": "JobBot", "username": "bench_job_bot"}
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 429: "Too Many Requests", 503: "Service Unavailable"}
+
+Handler = Callable[[str, str, dict, dict, bytes], Awaitable[tuple[int, dict, bytes]]]
+
+
+def rss_mb() -> float:
+    """Current resident set size in MB (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1024 if sys.platform != "darwin" else peak / (1024 * 1024)
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of unsorted samples (0 for no samples)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))]
+
+
+# ─── Minimal HTTP server ─────────────────────────────────────────────────────
+
+class MockHTTPServer:
+    """
+    Just enough HTTP/1.1 for httpx: keep-alive connections and
+    Content-Length request bodies. `handler(method, path, query, headers,
+    body)` returns (status, headers, body).
+    """
+
+    def __init__(self, handler: Handler):
+        self.handler = handler
+        self._server: Optional[asyncio.base_events.Server] = None
+        self.port = 0
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0) or 0))
+
+                url = urlsplit(target)
+                status, extra_headers, payload = await self.handler(
+                    method, url.path, dict(parse_qsl(url.query)), headers, body)
+                head = [f"HTTP/1.1 {status} {REASONS.get(status, 'OK')}", f"Content-Length: {len(payload)}"]
+                head.extend(f"{k}: {v}" for k, v in extra_headers.items())
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + payload)
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass  # Client went away or the server is stopping
+        finally:
+            writer.close()
+
+
+def _latency(rng: random.Random, mean_ms: float) -> float:
+    """Seconds to wait: exponential-ish jitter around `mean_ms`."""
+    if mean_ms <= 0:
+        return 0.0
+    return rng.uniform(0.5, 1.5) * mean_ms / 1000
+
+
+# ─── JSearch ─────────────────────────────────────────────────────────────────
+
+def load_recording(path: str) -> list[bytes]:
+    """
+    Recorded JSearch responses: a single response JSON file, a JSONL file
+    with one response per line, or a directory of *.json responses.
+    """
+    if os.path.isdir(path):
+        files = sorted(os.path.join(path, name) for name in os.listdir(path) if name.endswith(".json"))
+        return [open(f, "rb").read() for f in files]
+    with open(path, "rb") as f:
+        data = f.read()
+    if path.endswith(".jsonl"):
+        return [line for line in data.splitlines() if line.strip()]
+    return [data]
+
+
+def synthetic_responses(count: int = 8, records: int = 10, seed: int = 42) -> list[bytes]:
+    """JSearch-shaped responses built with the generator from bench_json."""
+    from bench_json import make_record
+
+    rng = random.Random(seed)
+    return [
+        json.dumps({"status": "OK", "request_id": f"synthetic-{n}",
+                    "data": [make_record(rng, n * records + i) for i in range(records)]}).encode("utf-8")
+        for n in range(count)
+    ]
+
+
+class MockJSearch:
+    """Serves GET /search from recorded responses (chosen by query hash)."""
+
+    def __init__(self, responses: list[bytes], latency_ms: float = 300.0, error_rate: float = 0.0, seed: int = 1):
+        self.responses = responses
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.requests = Counter()
+        self.server = MockHTTPServer(self.handle)
+
+    async def start(self):
+        await self.server.start()
+        return self
+
+    async def handle(self, method, path, query, headers, body):
+        await asyncio.sleep(_latency(self.rng, self.latency_ms))
+        if self.rng.random() < self.error_rate:
+            self.requests["503"] += 1
+            return 503, {}, b'{"message": "upstream unavailable"}'
+        self.requests["200"] += 1
+        digest = hashlib.md5(query.get("query", "").encode("utf-8")).digest()
+        payload = self.responses[int.from_bytes(digest[:4], "big") % len(self.responses)]
+        return 200, {
+            "Content-Type": "application/json",
+            "x-ratelimit-requests-limit": "10000",
+            "x-ratelimit-requests-remaining": str(max(0, 10000 - sum(self.requests.values()))),
+        }, payload
+
+
+# ─── Telegram Bot API ────────────────────────────────────────────────────────
+
+class _TokenBucket:
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def take(self) -> float:
+        """Take a token; returns 0 on success or the seconds until one is available."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+# Methods that post something into a chat and count against flood limits
+SEND_METHODS = {"sendMessage", "editMessageText", "sendDocument", "sendPhoto", "deleteMessage"}
+
+
+class MockTelegram:
+    """
+    Bot API stand-in. Every call waits `latency_ms`; chat-visible calls are
+    limited per chat (`chat_rate`/s, bursts of `chat_burst`) and globally
+    (`global_rate`/s) and answered with Telegram's 429 + retry_after.
+    """
+
+    def __init__(self, latency_ms: float = 60.0, chat_rate: float = 1.0, chat_burst: float = 8.0,
+                 global_rate: float = 30.0, pdf_bytes: bytes = b"", seed: int = 2):
+        self.latency_ms = latency_ms
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.global_bucket = _TokenBucket(global_rate, global_rate)
+        self.chat_buckets: dict[str, _TokenBucket] = {}
+        self.pdf_bytes = pdf_bytes or make_pdf("Python developer with 4 years of Django and AWS experience in Pune")
+        self.rng = random.Random(seed)
+        self.calls = Counter()
+        self.flood_limited = Counter()
+        self.sent_per_chat = defaultdict(int)
+        self._message_id = 0
+        self.server = MockHTTPServer(self.handle)
+
+    async def start(self):
+        await self.server.start()
+        return self
+
+    @property
+    def base_url(self) -> str:
+        return f"{self.server.url}/bot"
+
+    @property
+    def base_file_url(self) -> str:
+        return f"{self.server.url}/file/bot"
+
+    def _params(self, headers: dict, body: bytes) -> dict:
+        content_type = headers.get("content-type", "")
+        if "application/json" in content_type:
+            return json.loads(body or b"{}")
+        if "application/x-www-form-urlencoded" in content_type:
+            return dict(parse_qsl(body.decode("utf-8")))
+        return {}
+
+    def _reply(self, result) -> tuple[int, dict, bytes]:
+        return 200, {"Content-Type": "application/json"}, json.dumps({"ok": True, "result": result}).encode("utf-8")
+
+    async def handle(self, method, path, query, headers, body):
+        await asyncio.sleep(_latency(self.rng, self.latency_ms))
+        if path.startswith("/file/"):
+            self.calls["download"] += 1
+            return 200, {"Content-Type": "application/pdf"}, self.pdf_bytes
+
+        api_method = path.rsplit("/", 1)[-1]
+        params = self._params(headers, body)
+        self.calls[api_method] += 1
+
+        chat_id = str(params.get("chat_id", ""))
+        if api_method in SEND_METHODS:
+            bucket = self.chat_buckets.get(chat_id)
+            if bucket is None:
+                bucket = self.chat_buckets[chat_id] = _TokenBucket(self.chat_rate, self.chat_burst)
+            wait = max(bucket.take(), self.global_bucket.take())
+            if wait > 0:
+                self.flood_limited[api_method] += 1
+                retry_after = max(1, math.ceil(wait))
+                return 429, {"Content-Type": "application/json"}, json.dumps({
+                    "ok": False, "error_code": 429,
+                    "description": f"Too Many Requests: retry after {retry_after}",
+                    "parameters": {"retry_after": retry_after},
+                }).encode("utf-8")
+            self.sent_per_chat[chat_id] += 1
+
+        if api_method == "getMe":
+            return self._reply(BOT_USER)
+        if api_method in ("sendMessage", "editMessageText", "sendDocument"):
+            self._message_id += 1
+            return self._reply({
+                "message_id": int(params.get("message_id") or self._message_id),
+                "date": int(time.time()),
+                "chat": {"id": int(chat_id or 0), "type": "private"},
+                "from": BOT_USER,
+                "text": params.get("text", ""),
+            })
+        if api_method == "getFile":
+            return self._reply({
+                "file_id": params.get("file_id", ""), "file_unique_id": "u" + params.get("file_id", ""),
+                "file_size": len(self.pdf_bytes), "file_path": "documents/resume.pdf",
+            })
+        return self._reply(True)
+
+
+# ─── Translator and LLM stubs ────────────────────────────────────────────────
+
+class StubTranslator:
+    """Drop-in for bot._translate_sync: blocks its worker thread like the real client."""
+
+    def __init__(self, latency_ms: float = 120.0, seed: int = 3):
+        self.latency_ms = latency_ms
+        self.rng = random.Random(seed)
+        self.calls = 0
+
+    def __call__(self, text: str, target_lang: str) -> str:
+        self.calls += 1
+        time.sleep(_latency(self.rng, self.latency_ms))
+        return f"[{target_lang}] {text}"
+
+
+class _StubResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class StubGenAI:
+    """
+    Stands in for the google.generativeai module. generate_content() blocks
+    the calling thread for `latency_ms`, as the real synchronous SDK does.
+    """
+
+    def __init__(self, latency_ms: float = 1500.0, seed: int = 4):
+        self.latency_ms = latency_ms
+        self.rng = random.Random(seed)
+        self.calls = 0
+        stub = self
+
+        class GenerativeModel:
+            def __init__(self, name: str):
+                self.name = name
+
+            def generate_content(self, prompt: str):
+                stub.calls += 1
+                time.sleep(_latency(stub.rng, stub.latency_ms))
+                return _StubResponse(
+                    '```json\n{"role": "Python Developer", "query": "Python Developer Pune", '
+                    '"explanation": "Resume mein Django aur AWS ka experience hai."}\n```'
+                )
+
+        self.GenerativeModel = GenerativeModel
+
+    def configure(self, **kwargs):
+        pass
+
+
+def make_pdf(text: str) -> bytes:
+    """A minimal one-page PDF with `text` in Helvetica (PyPDF2 can extract it)."""
+    escaped = text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+    stream = f"BT /F1 12 Tf 72 720 Td ({escaped}) Tj ET".encode("latin-1", "replace")
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        b"/Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+# ─── Updates ─────────────────────────────────────────────────────────────────
+
+class UpdateFactory:
+    """Builds Bot API update payloads as Telegram would deliver them."""
+
+    def __init__(self):
+        self._update_id = 0
+        self._message_id = 0
+
+    def _next(self) -> tuple[int, int]:
+        self._update_id += 1
+        self._message_id += 1
+        return self._update_id, self._message_id
+
+    @staticmethod
+    def user(user_id: int) -> dict:
+        return {"id": user_id, "is_bot": False, "first_name": f"User{user_id}", "language_code": "en"}
+
+    def _message(self, user_id: int, message_id: int, **fields) -> dict:
+        return {
+            "message_id": message_id,
+            "date": int(time.time()),
+            "chat": {"id": user_id, "type": "private"},
+            "from": self.user(user_id),
+            **fields,
+        }
+
+    def text(self, user_id: int, text: str) -> dict:
+        update_id, message_id = self._next()
+        fields = {"text": text}
+        if text.startswith("/"):
+            fields["entities"] = [{"type": "bot_command", "offset": 0, "length": len(text.split()[0])}]
+        return {"update_id": update_id, "message": self._message(user_id, message_id, **fields)}
+
+    def document(self, user_id: int, size: int = 2048) -> dict:
+        update_id, message_id = self._next()
+        document = {
+            "file_id": f"resume-{user_id}", "file_unique_id": f"ur-{user_id}",
+            "file_name": "resume.pdf", "mime_type": "application/pdf", "file_size": size,
+        }
+        return {"update_id": update_id, "message": self._message(user_id, message_id, document=document)}
+
+    def callback(self, user_id: int, data: str, message_text: str = "Job card") -> dict:
+        update_id, message_id = self._next()
+        message = self._message(user_id, message_id, text=message_text)
+        message["from"] = BOT_USER
+        return {"update_id": update_id, "callback_query": {
+            "id": str(update_id), "from": self.user(user_id), "chat_instance": str(user_id),
+            "data": data, "message": message,
+        }}
+
+
+# ─── Bot wiring ──────────────────────────────────────────────────────────────
+
+class BenchBot:
+    """
+    Imports bot.py from a scratch working directory (so state files stay out
+    of the repo), points it at the mocks and builds the real Application.
+    """
+
+    def __init__(self, jsearch: MockJSearch, telegram: MockTelegram,
+                 translator: StubTranslator, genai: StubGenAI, workdir: Optional[str] = None,
+                 concurrent_updates=False):
+        self.jsearch = jsearch
+        self.telegram = telegram
+        self.translator = translator
+        self.genai = genai
+        self.concurrent_updates = concurrent_updates
+        self.workdir = workdir or tempfile.mkdtemp(prefix="jobbot-bench-")
+        self.bot = None
+        self.app = None
+        self.errors = Counter()
+
+    async def start(self):
+        # Set before bot.py runs load_dotenv() so a developer's .env can't
+        # point the benchmark at real services
+        os.environ.update({
+            "TELEGRAM_BOT_TOKEN": BOT_TOKEN, "RAPIDAPI_KEY": "bench", "GEMINI_API_KEY": "bench",
+            "ADZUNA_APP_ID": "", "ADZUNA_APP_KEY": "", "JOB_FIXTURES_FILE": "", "TRACE_EXPORTER": "none",
+            # Simulated users send far faster than real ones; measure the handlers, not the throttle
+            "RATE_LIMIT_SEARCH": "0", "RATE_LIMIT_PDF": "0", "RATE_LIMIT_CALLBACK": "0", "SEARCH_DEBOUNCE_SECONDS": "0",
+        })
+        os.chdir(self.workdir)
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+
+        import bot
+        import providers
+
+        providers.JSEARCH_BASE_URL = self.jsearch.server.url
+        bot._translate_sync = self.translator
+        bot._genai = self.genai
+        bot.load_state()
+
+        self.bot = bot
+        self.app = bot.build_application(BOT_TOKEN, self.telegram.base_url, self.telegram.base_file_url,
+                                         concurrent_updates=self.concurrent_updates)
+        self.app.add_error_handler(self._count_error)
+        await self.app.initialize()
+        await self.app.post_init(self.app)  # As run_polling() would, starts the loop watchdog
+        return self
+
+    async def stop(self):
+        if self.app is not None:
+            if self.app.running:
+                await self.app.stop()
+            await self.app.shutdown()
+
+    async def _count_error(self, update, context):
+        self.errors[type(context.error).__name__] += 1
+
+    async def process(self, payload: dict):
+        """Run one update through the real handler stack."""
+        from telegram import Update
+
+        await self.app.process_update(Update.de_json(payload, self.app.bot))
+
+    def context(self):
+        """A CallbackContext like the job queue passes to send_daily_jobs."""
+        from telegram.ext import CallbackContext
+
+        return CallbackContext(self.app)
+
+
+async def start_services(args) -> tuple[MockJSearch, MockTelegram, StubTranslator, StubGenAI]:
+    """Start the mocks from the shared command line options (see add_service_args)."""
+    responses = load_recording(args.recording) if args.recording else synthetic_responses(seed=args.seed)
+    jsearch = await MockJSearch(responses, args.jsearch_latency_ms, args.jsearch_error_rate, args.seed).start()
+    telegram = await MockTelegram(args.telegram_latency_ms, args.chat_rate, args.chat_burst, args.global_rate,
+                                  seed=args.seed).start()
+    return jsearch, telegram, StubTranslator(args.translate_latency_ms, args.seed), StubGenAI(args.llm_latency_ms, args.seed)
+
+
+def add_service_args(parser):
+    group = parser.add_argument_group("mock services")
+    group.add_argument("--recording", help="recorded JSearch response(s): .json, .jsonl or a directory")
+    group.add_argument("--jsearch-latency-ms", type=float, default=300.0)
+    group.add_argument("--jsearch-error-rate", type=float, default=0.0, help="fraction answered with 503")
+    group.add_argument("--telegram-latency-ms", type=float, default=60.0)
+    group.add_argument("--chat-rate", type=float, default=1.0, help="messages/s per chat before 429")
+    group.add_argument("--chat-burst", type=float, default=8.0, help="burst allowance per chat")
+    group.add_argument("--global-rate", type=float, default=30.0, help="messages/s per bot before 429")
+    group.add_argument("--translate-latency-ms", type=float, default=120.0)
+    group.add_argument("--llm-latency-ms", type=float, default=1500.0)
+    group.add_argument("--seed", type=int, default=42)
@@ -9,17 +9,19 @@ Searches the internet for jobs and returns:
 
 import os
 import sys
+import time
 import logging
 import asyncio
 import json
 import datetime
-import tempfile
 import hashlib
 import threading
-import PyPDF2
-from flask import Flask
-import google.generativeai as genai
-from deep_translator import GoogleTranslator
+import itertools
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Union
+# PyPDF2, flask, google.generativeai and deep_translator are heavy and only
+# needed by a few code paths, so they are imported lazily on first use.
 
 # Fix Windows console Unicode encoding
 if sys.platform == "win32":
@@ -35,32 +37,109 @@ from telegram.ext import (
     filters,
 )
 from telegram.constants import ParseMode, ChatAction
+from telegram.error import BadRequest, Forbidden
+from telegram.request import HTTPXRequest
 from dotenv import load_dotenv
-from job_searcher import JobSearcher
+from job_searcher import JobSearcher, ensure_description
+from job_corpus import JobCorpus
+import fast_json
+from providers import AdzunaProvider, FixtureProvider
+from alert_scheduler import AlertScheduler, parse_alert_time, parse_timezone
+from seen_filter import SeenStore
+from session_store import JobStore, SessionStore
+from prefetch import Prefetcher, PrefetchTarget, QueryTracker
+from render_cache import RenderCache, RenderedCard
+from html_format import bold, code, escape, safe_html, validate
+from callback_codec import PREFIX as CALLBACK_PREFIX, CallbackCodec
+from throttle import Debouncer, QuotaGovernor, RateLimiter, clip_query, parse_limit
+from snapshot import Snapshot, encode_job, write_snapshot
+import resume_pdf
+import metrics
+from tracing import span, traced, traced_handler
+import loop_watchdog
+from query_planner import (
+    parse_subscription_args, describe_filters, matches_filters, plan_queries, normalize_query, split_salary_filter,
+)
 
 # ─── Load environment variables ─────────────────────────────────────────────
 load_dotenv()
 
 # Health Check Server (For Cloud Deployment)
-app_web = Flask(__name__)
-
-@app_web.route('/')
-def home():
-    return "Bot is running! 🚀"
+# Proxies in front of the web server whose X-Forwarded-For is trusted (0 if none)
+TRUSTED_PROXY_HOPS = int(os.getenv("TRUSTED_PROXY_HOPS", "0"))
+
+def create_health_app():
+    from flask import Flask, jsonify, request
+    from werkzeug.middleware.proxy_fix import ProxyFix
+
+    app_web = Flask(__name__)
+    if TRUSTED_PROXY_HOPS:
+        # remote_addr becomes the client's address instead of the proxy's
+        app_web.wsgi_app = ProxyFix(app_web.wsgi_app, x_for=TRUSTED_PROXY_HOPS)
+
+    @app_web.before_request
+    def limit_by_ip():
+        """Per-IP limit (RATE_LIMIT_HTTP), so / and /metrics can't be hammered. /health is exempt: the platform polls it."""
+        if request.path == "/health":
+            return None
+        retry_after, _ = limiter.check("http", request.remote_addr)
+        if retry_after:
+            return "Too Many Requests", 429, {"Retry-After": str(int(retry_after) + 1)}
+
+    @app_web.route('/')
+    def home():
+        return "Bot is running! 🚀"
+
+    @app_web.route('/health')
+    def health():
+        """Per-provider circuit state, remaining RapidAPI quota and recent event loop stalls."""
+        return jsonify({"status": "ok", "providers": searcher.stats(), "watchdog": watchdog.stats(),
+                        "prefetch": prefetcher.last_run, "quota": searcher.governor.stats()})
+
+    @app_web.route('/metrics')
+    def metrics_endpoint():
+        """Prometheus scrape endpoint."""
+        return metrics.REGISTRY.render(), 200, {"Content-Type": metrics.CONTENT_TYPE}
+
+    return app_web
 
 def run_health_check_server():
     port = int(os.environ.get("PORT", 8080))
-    app_web.run(host='0.0.0.0', port=port)
+    create_health_app().run(host='0.0.0.0', port=port)
 
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 RAPIDAPI_KEY = os.getenv("RAPIDAPI_KEY")
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
-if GEMINI_API_KEY:
-    try:
-        genai.configure(api_key=GEMINI_API_KEY)
-    except Exception as e:
-        print(f"Failed to configure Gemini API: {e}")
+# Signs inline button payloads; derived from the bot token unless CALLBACK_SECRET is set.
+# Unsigned buttons from before signing are honoured until LEGACY_CALLBACKS_UNTIL
+# (ISO date, UTC), e.g. a week after upgrading; unset rejects them.
+def _utc_timestamp(value: str) -> Optional[float]:
+    if not value:
+        return None
+    moment = datetime.datetime.fromisoformat(value)
+    return (moment if moment.tzinfo else moment.replace(tzinfo=datetime.timezone.utc)).timestamp()
+
+callback_codec = CallbackCodec(
+    (os.getenv("CALLBACK_SECRET") or f"callback:{TELEGRAM_BOT_TOKEN}").encode("utf-8"),
+    legacy_until=_utc_timestamp(os.getenv("LEGACY_CALLBACKS_UNTIL", "")),
+)
+
+_genai = None
+_genai_lock = threading.Lock()
+
+def get_genai():
+    """Import and configure google.generativeai on first use."""
+    global _genai
+    with _genai_lock:
+        if _genai is None:
+            import google.generativeai as genai
+            try:
+                genai.configure(api_key=GEMINI_API_KEY)
+            except Exception as e:
+                logger.error(f"Failed to configure Gemini API: {e}")
+            _genai = genai
+    return _genai
 
 # ─── Logging setup ──────────────────────────────────────────────────────────
 logging.basicConfig(
@@ -70,31 +149,104 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # ─── Initialize Job Searcher ─────────────────────────────────────────────────
-searcher = JobSearcher(api_key=RAPIDAPI_KEY)
+def build_extra_providers() -> list:
+    """Optional providers besides JSearch, enabled through environment variables."""
+    providers = []
+    if os.getenv("ADZUNA_APP_ID") and os.getenv("ADZUNA_APP_KEY"):
+        providers.append(AdzunaProvider(
+            os.getenv("ADZUNA_APP_ID"),
+            os.getenv("ADZUNA_APP_KEY"),
+            country=os.getenv("ADZUNA_COUNTRY", "in"),
+        ))
+    return providers
 
-# ─── User session state ──────────────────────────────────────────────────────
-user_sessions = {}  # {user_id: {"query": str, "results": list, "page": int}}
+def get_job_hash(job: dict) -> str:
+    s = f"{job.get('title', '')}{job.get('company', '')}{job.get('apply_url', '')}"
+    return hashlib.md5(s.encode("utf-8")).hexdigest()[:10]
+
+def build_corpus() -> Optional[JobCorpus]:
+    """Local job index (JOB_CORPUS_PATH, empty to disable) for answering searches without an upstream call."""
+    path = os.getenv("JOB_CORPUS_PATH", "job_corpus.db")
+    if not path:
+        return None
+    return JobCorpus(path, hash_job=get_job_hash, max_jobs=int(os.getenv("JOB_CORPUS_MAX_JOBS", "50000")))
+
+searcher = JobSearcher(api_key=RAPIDAPI_KEY, providers=build_extra_providers(), corpus=build_corpus())
+if os.getenv("JOB_FIXTURES_FILE"):
+    searcher.providers.append(FixtureProvider(os.getenv("JOB_FIXTURES_FILE"), searcher.parse_jobs))
+metrics.UPSTREAM_QUOTA_REMAINING.set_function(lambda: searcher.quota.remaining)
+# Searches go local first, then cache-only, as the RapidAPI quota runs out
+searcher.governor = QuotaGovernor(
+    searcher.quota,
+    local_first_below=float(os.getenv("QUOTA_LOCAL_FIRST_BELOW", "0.2")),
+    cache_only_below=float(os.getenv("QUOTA_CACHE_ONLY_BELOW", "0.05")),
+)
+
+# Reports handlers that block the event loop (see loop_watchdog.py)
+watchdog = loop_watchdog.configure_from_env()
+
+# ─── Abuse throttling ────────────────────────────────────────────────────────
+# "count/seconds" per user (per IP for "http"); "0" disables a limit
+limiter = RateLimiter({
+    "search": parse_limit(os.getenv("RATE_LIMIT_SEARCH", "6/60")),
+    "pdf": parse_limit(os.getenv("RATE_LIMIT_PDF", "3/600")),
+    "callback": parse_limit(os.getenv("RATE_LIMIT_CALLBACK", "40/60")),
+    "http": parse_limit(os.getenv("RATE_LIMIT_HTTP", "60/60")),
+})
+# A message is searched at once; more sent (or edited) right after it become one search for the last of them
+search_debouncer = Debouncer(float(os.getenv("SEARCH_DEBOUNCE_SECONDS", "1.5")))
 
 # ─── Subscription State ──────────────────────────────────────────────────────
 SUBSCRIPTIONS_FILE = "subscriptions.json"
 
+MAX_SUBSCRIPTIONS_PER_USER = 5
+
 def load_subscriptions():
     if os.path.exists(SUBSCRIPTIONS_FILE):
         try:
-            with open(SUBSCRIPTIONS_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
+            data = fast_json.load_file(SUBSCRIPTIONS_FILE, default={})
+            # Older files stored a single query string per user
+            for user_id, subs in data.items():
+                if isinstance(subs, str):
+                    data[user_id] = [{"id": "1", "query": subs, "filters": {}}]
+            return data
         except Exception as e:
             logger.error(f"Failed to load subscriptions: {e}")
     return {}
 
 def save_subscriptions():
     try:
-        with open(SUBSCRIPTIONS_FILE, "w", encoding="utf-8") as f:
-            json.dump(subscriptions, f, indent=4)
+        fast_json.dump_file(SUBSCRIPTIONS_FILE, subscriptions)
     except Exception as e:
         logger.error(f"Failed to save subscriptions: {e}")
 
-subscriptions = load_subscriptions()
+subscriptions = {}  # Filled by load_state()
+# Structure: {user_id: [{"id": str, "query": str, "filters": {remote, job_type, min_salary, experience}}]}
+
+def subscription_key(user_id: str, sub: dict) -> str:
+    """Key identifying one saved search (used for its seen-jobs filter)."""
+    return f"{user_id}:{sub['id']}"
+
+# ─── Alert Scheduling State ──────────────────────────────────────────────────
+ALERT_PREFS_FILE = "alert_prefs.json"
+ALERT_CHECKPOINT_FILE = "alert_checkpoint.log"
+
+# Users served at once by an alert tick. Each user's messages are 0.4 s apart,
+# so 8 users stay under Telegram's ~30 messages/second for a bot.
+ALERT_CONCURRENCY = int(os.getenv("ALERT_CONCURRENCY", "8"))
+
+alert_scheduler = AlertScheduler(
+    prefs_file=ALERT_PREFS_FILE,
+    checkpoint_file=ALERT_CHECKPOINT_FILE,
+    window_minutes=int(os.getenv("ALERT_WINDOW_MINUTES", "60")),
+    num_shards=int(os.getenv("ALERT_SHARDS", "12")),
+    # About a minute's work (a user takes ~2 s), so each tick keeps up with its shard
+    max_per_tick=ALERT_CONCURRENCY * 30,
+)
+
+# Jobs already sent to each subscription (Bloom filters, see seen_filter.py)
+SEEN_JOBS_FILE = "seen_jobs.bin"
+seen_jobs = SeenStore(SEEN_JOBS_FILE)
 
 # ─── Language State ──────────────────────────────────────────────────────────
 LANGUAGES_FILE = "user_langs.json"
@@ -103,20 +255,18 @@ DEFAULT_LANG = "hi"  # Default Hindi
 def load_langs():
     if os.path.exists(LANGUAGES_FILE):
         try:
-            with open(LANGUAGES_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
+            return fast_json.load_file(LANGUAGES_FILE, default={})
         except Exception:
             pass
     return {}
 
 def save_langs():
     try:
-        with open(LANGUAGES_FILE, "w", encoding="utf-8") as f:
-            json.dump(user_langs, f, indent=4)
+        fast_json.dump_file(LANGUAGES_FILE, user_langs)
     except Exception:
         pass
 
-user_langs = load_langs()
+user_langs = {}  # Filled by load_state()
 
 # ─── Saved Jobs State ────────────────────────────────────────────────────────
 SAVED_JOBS_FILE = "saved_jobs.json"
@@ -124,26 +274,58 @@ SAVED_JOBS_FILE = "saved_jobs.json"
 def load_saved_jobs():
     if os.path.exists(SAVED_JOBS_FILE):
         try:
-            with open(SAVED_JOBS_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
+            return fast_json.load_file(SAVED_JOBS_FILE, default={})
         except Exception:
             pass
     return {}
 
 def save_saved_jobs_file():
     try:
-        with open(SAVED_JOBS_FILE, "w", encoding="utf-8") as f:
-            json.dump(saved_jobs, f, indent=4)
+        fast_json.dump_file(SAVED_JOBS_FILE, saved_jobs)
     except Exception:
         pass
 
-saved_jobs = load_saved_jobs()
+saved_jobs = {}  # Filled by load_state()
 
-JOB_CACHE = {}
+# ─── User session state ──────────────────────────────────────────────────────
+# Every rendered job is kept once in JOB_CACHE; sessions only hold job hashes
+JOB_CACHE = JobStore(
+    max_bytes=int(os.getenv("JOB_CACHE_MAX_MB", "64")) * 1024 * 1024,
+    hash_job=get_job_hash,
+)
+user_sessions = SessionStore(
+    JOB_CACHE,
+    ttl=int(os.getenv("SESSION_TTL_MINUTES", "30")) * 60,
+    max_bytes=int(os.getenv("SESSION_MAX_MB", "8")) * 1024 * 1024,
+)
 
-def get_job_hash(job: dict) -> str:
-    s = f"{job.get('title', '')}{job.get('company', '')}{job.get('apply_url', '')}"
-    return hashlib.md5(s.encode("utf-8")).hexdigest()[:10]
+# Finished job cards per (job, language, view), see render_cache.py
+RENDER_CACHE = RenderCache(
+    max_bytes=int(os.getenv("RENDER_CACHE_MAX_MB", "16")) * 1024 * 1024,
+    ttl=int(os.getenv("RENDER_CACHE_TTL_HOURS", "6")) * 3600,
+)
+
+# Recent searches, for the background warmer
+recent_queries = QueryTracker(window=int(os.getenv("PREFETCH_WINDOW_HOURS", "6")) * 3600)
+
+# ─── Resume matching ─────────────────────────────────────────────────────────
+# TF-IDF index over JOB_CACHE, created on the first resume upload (imports NumPy)
+_resume_index = None
+_resume_index_lock = threading.Lock()
+
+def build_resume_profile(text: str):
+    import resume_matcher
+    return resume_matcher.ResumeProfile(text)
+
+def rank_for_resume(profile, jobs: list[tuple[str, dict]], k: int = 8) -> list[dict]:
+    """Best `k` of `jobs` ((hash, job) pairs) for a resume. Blocking: run in a thread."""
+    global _resume_index
+    with _resume_index_lock:
+        if _resume_index is None:
+            import resume_matcher
+            _resume_index = resume_matcher.JobIndex()
+        _resume_index.sync(jobs)
+        return [job for job, _ in _resume_index.top(profile, k)]
 
 # ─── Application Tracking State ──────────────────────────────────────────────
 APPLICATIONS_FILE = "applications.json"
@@ -151,22 +333,52 @@ APPLICATIONS_FILE = "applications.json"
 def load_applications():
     if os.path.exists(APPLICATIONS_FILE):
         try:
-            with open(APPLICATIONS_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
+            return fast_json.load_file(APPLICATIONS_FILE, default={})
         except Exception:
             pass
     return {}
 
 def save_applications_file():
     try:
-        with open(APPLICATIONS_FILE, "w", encoding="utf-8") as f:
-            json.dump(applications, f, indent=4)
+        fast_json.dump_file(APPLICATIONS_FILE, applications)
     except Exception:
         pass
 
-applications = load_applications()
+applications = {}  # Filled by load_state()
 # Structure: {user_id: {job_hash: {"job": job_dict, "status": str, "date": str}}}
 
+def load_state():
+    """
+    Load every state file. Called from main() instead of at import time, and
+    the files are read in parallel so a large state doesn't serialize startup.
+    """
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        loaded = {
+            "subscriptions": pool.submit(load_subscriptions),
+            "user_langs": pool.submit(load_langs),
+            "saved_jobs": pool.submit(load_saved_jobs),
+            "applications": pool.submit(load_applications),
+        }
+        scheduler_loaded = pool.submit(alert_scheduler.load)
+        seen_loaded = pool.submit(seen_jobs.load)
+        snapshot_loaded = pool.submit(restore_snapshot)
+
+        subscriptions.update(loaded["subscriptions"].result())
+        user_langs.update(loaded["user_langs"].result())
+        saved_jobs.update(loaded["saved_jobs"].result())
+        applications.update(loaded["applications"].result())
+        scheduler_loaded.result()
+        seen_loaded.result()
+        snapshot_loaded.result()
+
+    alert_scheduler.track(subscriptions)
+
+    # Seen-sets used to be keyed by user only, move them to the user's first subscription
+    for user_id, subs in subscriptions.items():
+        if subs and user_id in seen_jobs.filters:
+            seen_jobs.rename(user_id, subscription_key(user_id, subs[0]))
+    seen_jobs.save()
+
 APP_STATUSES = {
     "applied": "📝 Applied",
     "interviewing": "🤝 Interviewing",
@@ -177,8 +389,16 @@ APP_STATUSES = {
 # ─── Translation Helper ──────────────────────────────────────────────────────
 TRANSLATION_CACHE = {}
 
-async def translate_text(text: str, target_lang: str) -> str:
-    """Translate text asynchronously using deep_translator."""
+def _translate_sync(text: str, target_lang: str) -> str:
+    # Imported here (in the worker thread) so deep_translator stays off the startup path
+    from deep_translator import GoogleTranslator
+    return GoogleTranslator(source='auto', target=target_lang).translate(text)
+
+async def translate_text(text: str, target_lang: str, errors: Optional[list] = None) -> str:
+    """
+    Translate text asynchronously using deep_translator. On failure the text
+    is returned untranslated (and the exception appended to `errors`).
+    """
     if not text or target_lang in ("en", "hinglish"): # Assume source is similar enough for hinglish fallback, or we use standard translation
         return text
     
@@ -187,18 +407,24 @@ async def translate_text(text: str, target_lang: str) -> str:
     
     cache_key = f"{target_lang}:{text}"
     if cache_key in TRANSLATION_CACHE:
+        metrics.TRANSLATIONS.labels("hit").inc()
         return TRANSLATION_CACHE[cache_key]
 
+    start = time.perf_counter()
     try:
-        translated = await asyncio.to_thread(
-            GoogleTranslator(source='auto', target=target_lang).translate, text
-        )
+        with span("translate", lang=target_lang, chars=len(text)):
+            translated = await asyncio.to_thread(_translate_sync, text, target_lang)
+        metrics.TRANSLATION_LATENCY.observe(time.perf_counter() - start)
+        metrics.TRANSLATIONS.labels("miss").inc()
         if translated:
             TRANSLATION_CACHE[cache_key] = translated
             return translated
         return text
     except Exception as e:
+        metrics.TRANSLATIONS.labels("error").inc()
         logger.error(f"Translation error: {e}")
+        if errors is not None:
+            errors.append(e)
         return text
 
 def get_user_lang(user_id):
@@ -209,6 +435,32 @@ def get_user_lang(user_id):
 #  COMMAND HANDLERS
 # ════════════════════════════════════════════════════════════════════════════
 
+async def throttled(update: Update, action: str) -> bool:
+    """
+    True if the user is over their `action` rate limit. They are told once
+    per run of refused requests; button presses are always answered.
+    """
+    retry_after, notify = limiter.check(action, update.effective_user.id)
+    if not retry_after:
+        return False
+    msg = None
+    if notify:
+        msg = "⏳ You're sending requests too fast. Please wait a minute and try again."
+        lang = get_user_lang(str(update.effective_user.id))
+        if lang != "en": msg = await translate_text(msg, lang)
+    if update.callback_query:
+        await update.callback_query.answer(msg, show_alert=bool(msg))
+    elif msg:
+        await update.effective_message.reply_text(msg)
+    return True
+
+
+async def reply_query_too_long(update: Update, lang: str):
+    msg = "✂️ That's too long for a job search. Please send a short query, like: `Python Developer Mumbai`"
+    if lang != "en": msg = await translate_text(msg, lang)
+    await update.effective_message.reply_text(msg, parse_mode=ParseMode.MARKDOWN)
+
+
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /start command."""
     user = update.effective_user
@@ -242,7 +494,9 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
         "/saved - View Saved Jobs\n"
         "/applications - Track Applied Jobs\n"
         "/subscribe - Activate Daily alerts\n"
+        "/subscriptions - View your Subscriptions\n"
         "/unsubscribe - Stop Daily alerts\n"
+        "/alerttime - Set Daily alert time\n"
         "/trending - View Trending jobs\n"
         "/clear - Clear Session\n"
     )
@@ -263,16 +517,21 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
         
     await update.message.reply_text(welcome_text, parse_mode=ParseMode.MARKDOWN, reply_markup=menu_keyboard)
 
+# Languages offered by /language, in button order
+SUPPORTED_LANGS = {
+    "en": "English 🇬🇧",
+    "hi": "Hindi (हिंदी) 🇮🇳",
+    "mr": "Marathi (मराठी) 🇮🇳",
+    "ta": "Tamil (தமிழ்) 🇮🇳",
+    "bn": "Bengali (বাংলা) 🇮🇳",
+    "te": "Telugu (తెలుగు) 🇮🇳",
+}
+
 async def language_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /language command."""
-    keyboard = InlineKeyboardMarkup([
-        [InlineKeyboardButton("English 🇬🇧", callback_data="lang_en"), 
-         InlineKeyboardButton("Hindi (हिंदी) 🇮🇳", callback_data="lang_hi")],
-        [InlineKeyboardButton("Marathi (मराठी) 🇮🇳", callback_data="lang_mr"),
-         InlineKeyboardButton("Tamil (தமிழ்) 🇮🇳", callback_data="lang_ta")],
-        [InlineKeyboardButton("Bengali (বাংলা) 🇮🇳", callback_data="lang_bn"),
-         InlineKeyboardButton("Telugu (తెలుగు) 🇮🇳", callback_data="lang_te")]
-    ])
+    buttons = [InlineKeyboardButton(label, callback_data=callback_codec.encode("lang", code))
+               for code, label in SUPPORTED_LANGS.items()]
+    keyboard = InlineKeyboardMarkup([buttons[i:i + 2] for i in range(0, len(buttons), 2)])
     msg = "Please choose your preferred language / कृपया अपनी भाषा चुनें:"
     await update.message.reply_text(msg, reply_markup=keyboard)
 
@@ -310,7 +569,10 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         "/saved - View your saved jobs\n"
         "/applications - View your job application status\n"
         "/subscribe `[query]` - Subscribe for daily jobs\n"
-        "/unsubscribe - Unsubscribe from daily jobs\n"
+        "    Filters: `remote=yes type=fulltime salary=10L exp=3`\n"
+        "/subscriptions - List your subscriptions\n"
+        "/unsubscribe `[number]` - Unsubscribe from daily jobs\n"
+        "/alerttime `[HH:MM]` `[zone]` - Set daily alert time\n"
         "/clear - Clear your search history\n\n"
         "━━━━━━━━━━━━━━━━━━━━━━━━━\n"
         "📄 *AI Resume Matcher:*\n"
@@ -323,20 +585,42 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await update.message.reply_text(help_text, parse_mode=ParseMode.MARKDOWN)
 
 async def subscribe_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Handle /subscribe command."""
-    if not context.args:
+    """Handle /subscribe command - add a saved search with optional filters."""
+    user_id = str(update.effective_user.id)
+    lang = get_user_lang(user_id)
+    query, filters = parse_subscription_args(context.args or [])
+    if query and clip_query(query) is None:
+        await reply_query_too_long(update, lang)
+        return
+    if not query:
         await update.message.reply_text(
-            "⚠️ Please query add karein.\nUsage: `/subscribe Python Developer Mumbai`",
+            "⚠️ Please query add karein.\nUsage: `/subscribe Python Developer Mumbai`\n"
+            "Filters (optional): `remote=yes type=fulltime salary=10L exp=3`",
             parse_mode=ParseMode.MARKDOWN
         )
         return
-    query = " ".join(context.args)
-    user_id = str(update.effective_user.id)
-    subscriptions[user_id] = query
+
+    user_subs = subscriptions.setdefault(user_id, [])
+    for sub in user_subs:
+        if normalize_query(sub["query"]) == normalize_query(query) and sub.get("filters", {}) == filters:
+            msg = "⚠️ Yeh subscription pehle se active hai. /subscriptions dekhein."
+            if lang != "en": msg = await translate_text(msg, lang)
+            await update.message.reply_text(msg)
+            return
+    if len(user_subs) >= MAX_SUBSCRIPTIONS_PER_USER:
+        msg = f"⚠️ Aap maximum {MAX_SUBSCRIPTIONS_PER_USER} subscriptions rakh sakte hain. Pehle `/unsubscribe [number]` karein."
+        if lang != "en": msg = await translate_text(msg, lang)
+        await update.message.reply_text(msg, parse_mode=ParseMode.MARKDOWN)
+        return
+
+    next_id = max((int(sub["id"]) for sub in user_subs), default=0) + 1
+    user_subs.append({"id": str(next_id), "query": query, "filters": filters})
     save_subscriptions()
-    lang = get_user_lang(str(update.effective_user.id))
-    
-    msg = f"Aapne *'{query}'* ke liye subscribe kiya hai.\nAb roz subah bot aapko latest jobs message karega. 🌅\n\nBand karne ke liye /unsubscribe send karein."
+    alert_scheduler.track([user_id])
+
+    filters_str = describe_filters(filters)
+    filters_line = f"\nFilters: {filters_str}" if filters_str else ""
+    msg = f"Aapne *'{query}'* ke liye subscribe kiya hai.{filters_line}\nAb roz subah bot aapko latest jobs message karega. 🌅\n\nSabhi subscriptions dekhne ke liye /subscriptions, band karne ke liye /unsubscribe send karein."
     header = "✅ *Subscription Successful!*\n\n"
     if lang != "en":
         msg = await translate_text(msg, lang)
@@ -347,28 +631,101 @@ async def subscribe_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         parse_mode=ParseMode.MARKDOWN
     )
 
+async def subscriptions_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle /subscriptions command - list saved searches."""
+    user_id = str(update.effective_user.id)
+    lang = get_user_lang(user_id)
+
+    user_subs = subscriptions.get(user_id, [])
+    if not user_subs:
+        msg = "🔔 Type `/subscribe [Your Job Role & Location]` to get daily morning alerts.\nType `/unsubscribe` to stop.\nExample: `/subscribe Python Developer Bangalore remote=yes salary=10L`"
+        if lang != "en": msg = await translate_text(msg, lang)
+        await update.message.reply_text(msg, parse_mode=ParseMode.MARKDOWN)
+        return
+
+    lines = [f"🔔 *Your Subscriptions* ({len(user_subs)})\n━━━━━━━━━━━━━━━━━━━━━━━━━\n"]
+    for sub in user_subs:
+        filters_str = describe_filters(sub.get("filters", {}))
+        lines.append(f"*{sub['id']}.* `{sub['query']}`" + (f"\n    {filters_str}" if filters_str else ""))
+    lines.append("\nHatane ke liye: `/unsubscribe [number]` (ya sab ke liye sirf `/unsubscribe`)")
+    msg = "\n".join(lines)
+    if lang != "en": msg = await translate_text(msg, lang)
+    await update.message.reply_text(msg, parse_mode=ParseMode.MARKDOWN)
+
+def remove_subscriptions(user_id: str, removed: list[dict]):
+    """Drop `removed` from the user's subscriptions (and the user from alerts if none are left)."""
+    user_subs = subscriptions.get(user_id, [])
+    for sub in removed:
+        user_subs.remove(sub)
+        seen_jobs.forget(subscription_key(user_id, sub))
+    if not user_subs:
+        subscriptions.pop(user_id, None)
+        alert_scheduler.forget(user_id)
+    save_subscriptions()
+    seen_jobs.save()
+
 async def unsubscribe_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Handle /unsubscribe command."""
+    """Handle /unsubscribe command - remove one saved search, or all of them."""
     user_id = str(update.effective_user.id)
     lang = get_user_lang(user_id)
-    
-    if user_id in subscriptions:
-        del subscriptions[user_id]
-        save_subscriptions()
-        msg = "⛔ *Unsubscribed!*\n\nAapko ab daily alerts nahi aayengi."
+
+    user_subs = subscriptions.get(user_id, [])
+    if context.args:
+        removed = [sub for sub in user_subs if sub["id"] == context.args[0]]
+    else:
+        removed = list(user_subs)
+
+    if removed:
+        remove_subscriptions(user_id, removed)
+        if user_subs:
+            msg = f"⛔ *Unsubscribed!*\n\n'{removed[0]['query']}' ke alerts band ho gaye."
+        else:
+            msg = "⛔ *Unsubscribed!*\n\nAapko ab daily alerts nahi aayengi."
         if lang != "en":
             msg = await translate_text(msg, lang)
         await update.message.reply_text(msg, parse_mode=ParseMode.MARKDOWN)
     else:
-        msg = "Aapki koi active subscription nahi hai."
+        msg = "Aapki koi active subscription nahi hai." if not user_subs else "⚠️ Is number ki koi subscription nahi hai. /subscriptions dekhein."
         if lang != "en":
             msg = await translate_text(msg, lang)
         await update.message.reply_text(msg)
 
+async def alert_time_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle /alerttime command - set preferred daily alert time and zone."""
+    user_id = str(update.effective_user.id)
+    lang = get_user_lang(user_id)
+
+    if not context.args or not parse_alert_time(context.args[0]):
+        alert_time, tz = alert_scheduler.get_preference(user_id)
+        msg = (
+            f"⏰ Aapka current alert time: *{alert_time.strftime('%H:%M')}* ({tz})\n\n"
+            "Badalne ke liye: `/alerttime 08:30` ya `/alerttime 08:30 Asia/Kolkata` ya `/alerttime 18:00 +04:00`"
+        )
+        if lang != "en": msg = await translate_text(msg, lang)
+        await update.message.reply_text(msg, parse_mode=ParseMode.MARKDOWN)
+        return
+
+    alert_time = context.args[0]
+    tz_name = context.args[1] if len(context.args) > 1 else ""
+    if tz_name and not parse_timezone(tz_name):
+        msg = "⚠️ Invalid time zone. Example: `Asia/Kolkata` ya `+05:30`"
+        if lang != "en": msg = await translate_text(msg, lang)
+        await update.message.reply_text(msg, parse_mode=ParseMode.MARKDOWN)
+        return
+
+    alert_scheduler.set_preference(user_id, alert_time, tz_name)
+    msg = f"✅ Daily alerts ab roz *{alert_time}* {tz_name} ke aas-paas aayengi."
+    if lang != "en": msg = await translate_text(msg, lang)
+    await update.message.reply_text(msg, parse_mode=ParseMode.MARKDOWN)
+
+
+TRENDING_QUERIES = ["Software Engineer India 2025", "Data Scientist India", "Product Manager India"]
 
 async def trending_jobs(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /trending command - show trending jobs in India."""
     lang = get_user_lang(str(update.effective_user.id))
+    if await throttled(update, "search"):
+        return
     
     status = "⏳ Searching for Trending jobs in India..."
     if lang != "en": status = await translate_text(status, lang)
@@ -376,10 +733,9 @@ async def trending_jobs(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await update.message.reply_text(status, parse_mode=ParseMode.MARKDOWN)
     await context.bot.send_chat_action(update.effective_chat.id, ChatAction.TYPING)
 
-    trending_queries = ["Software Engineer India 2025", "Data Scientist India", "Product Manager India"]
-    query = trending_queries[0]
+    query = TRENDING_QUERIES[0]
 
-    jobs = await searcher.search_jobs(query, num_results=5)
+    jobs = await searcher.search_jobs(query, num_results=5, local_first=True)
 
     if not jobs:
         msg = "❌ Unable to find trending jobs right now. Please try again later."
@@ -387,15 +743,14 @@ async def trending_jobs(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text(msg)
         return
 
-    header = "🔥 *Trending Jobs in India — 2025*\n━━━━━━━━━━━━━━━━━━━━━━━━━\n\n"
-    if lang != "en": header = await translate_text(header, lang)
+    header = "🔥 <b>Trending Jobs in India — 2025</b>\n━━━━━━━━━━━━━━━━━━━━━━━━━\n\n"
+    if lang != "en": header = safe_html(await translate_text(header, lang))
     
-    await update.message.reply_text(header, parse_mode=ParseMode.MARKDOWN)
+    await update.message.reply_text(header, parse_mode=ParseMode.HTML)
 
     for i, job in enumerate(jobs[:5], 1):
-        msg_card = await format_job_card(job, i, lang)
-        keyboard = build_job_keyboard(job, lang)
-        await update.message.reply_text(msg_card, parse_mode=ParseMode.MARKDOWN, reply_markup=keyboard)
+        card = await render_job(job, lang)
+        await update.message.reply_text(card.html(i), parse_mode=ParseMode.HTML, reply_markup=card.keyboard)
         await asyncio.sleep(0.3)
 
 
@@ -407,7 +762,12 @@ async def search_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         if lang != "en": usage = await translate_text(usage, lang)
         await update.message.reply_text(usage, parse_mode=ParseMode.MARKDOWN)
         return
-    query = " ".join(context.args)
+    query = clip_query(" ".join(context.args))
+    if query is None:
+        await reply_query_too_long(update, lang)
+        return
+    if await throttled(update, "search"):
+        return
     await perform_search(update, context, query)
 
 async def saved_jobs_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -422,14 +782,13 @@ async def saved_jobs_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
         await update.message.reply_text(msg, parse_mode=ParseMode.MARKDOWN)
         return
 
-    msg = f"💾 *Your Saved Jobs* ({len(jobs)})\n━━━━━━━━━━━━━━━━━━━━━━━━━\n\n"
-    if lang != "en": msg = await translate_text(msg, lang)
-    await update.message.reply_text(msg, parse_mode=ParseMode.MARKDOWN)
+    msg = f"💾 <b>Your Saved Jobs</b> ({len(jobs)})\n━━━━━━━━━━━━━━━━━━━━━━━━━\n\n"
+    if lang != "en": msg = safe_html(await translate_text(msg, lang))
+    await update.message.reply_text(msg, parse_mode=ParseMode.HTML)
 
     for i, job in enumerate(jobs, 1):
-        msg_card = await format_job_card(job, i, lang)
-        keyboard = build_job_keyboard(job, lang, saved_view=True)
-        await update.message.reply_text(msg_card, parse_mode=ParseMode.MARKDOWN, reply_markup=keyboard)
+        card = await render_job(job, lang, view="saved")
+        await update.message.reply_text(card.html(i), parse_mode=ParseMode.HTML, reply_markup=card.keyboard)
         await asyncio.sleep(0.3)
 
 async def applications_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -472,13 +831,13 @@ async def applications_command(update: Update, context: ContextTypes.DEFAULT_TYP
         status_row = []
         for sk, sd in APP_STATUSES.items():
             if sk != status_key:
-                status_row.append(InlineKeyboardButton(sd, callback_data=f"status_{job_hash}_{sk}"))
+                status_row.append(InlineKeyboardButton(sd, callback_data=callback_codec.encode("status", job_hash, sk)))
         
         if status_row:
             keyboard.append(status_row[:2])
             keyboard.append(status_row[2:])
             
-        keyboard.append([InlineKeyboardButton("🗑️ Remove Tracker", callback_data=f"remapp_{job_hash}")])
+        keyboard.append([InlineKeyboardButton("🗑️ Remove Tracker", callback_data=callback_codec.encode("remapp", job_hash))])
         
         await update.message.reply_text(msg_card, parse_mode=ParseMode.MARKDOWN, reply_markup=InlineKeyboardMarkup(keyboard))
         await asyncio.sleep(0.3)
@@ -487,8 +846,7 @@ async def clear_session(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /clear command."""
     user_id = update.effective_user.id
     lang = get_user_lang(str(user_id))
-    if user_id in user_sessions:
-        del user_sessions[user_id]
+    user_sessions.delete(user_id)
         
     msg = "✅ Your search history has been cleared!"
     if lang != "en": msg = await translate_text(msg, lang)
@@ -500,13 +858,14 @@ async def clear_session(update: Update, context: ContextTypes.DEFAULT_TYPE):
 # ════════════════════════════════════════════════════════════════════════════
 
 async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Handle plain text messages as job search queries."""
+    """Handle plain text messages (and edits of them) as job search queries."""
     user_id = update.effective_user.id
     lang = get_user_lang(str(user_id))
-    query = update.message.text.strip()
+    message = update.effective_message
+    query = message.text.strip()
 
-    # Handle bottom menu button clicks
-    btn_txt = query.lower()
+    # Handle bottom menu button clicks (an edited message is always a typed query)
+    btn_txt = query.lower() if update.message else ""
     if "trending jobs" in btn_txt or btn_txt == "🔥 trending jobs":
         await trending_jobs(update, context)
         return
@@ -517,9 +876,7 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await help_command(update, context)
         return
     elif "subscriptions" in btn_txt or btn_txt == "🔔 subscriptions":
-        msg = "🔔 Type `/subscribe [Your Job Role & Location]` to get daily morning alerts.\nType `/unsubscribe` to stop.\nExample: `/subscribe Python Developer Bangalore`"
-        if lang != "en": msg = await translate_text(msg, lang)
-        await update.message.reply_text(msg, parse_mode=ParseMode.MARKDOWN)
+        await subscriptions_command(update, context)
         return
     elif "search jobs" in btn_txt or btn_txt == "🔍 search jobs":
         msg = "🔍 Which job are you looking for?\nPlease type like: `Python Developer Mumbai`"
@@ -541,10 +898,20 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if len(query) < 2:
         msg = "🔍 Please provide more details, like: `Python Developer Mumbai`"
         if lang != "en": msg = await translate_text(msg, lang)
-        await update.message.reply_text(msg, parse_mode=ParseMode.MARKDOWN)
+        await message.reply_text(msg, parse_mode=ParseMode.MARKDOWN)
+        return
+    query = clip_query(query)
+    if query is None:
+        await reply_query_too_long(update, lang)
         return
 
-    await perform_search(update, context, query)
+    async def search():
+        if not await throttled(update, "search"):
+            await perform_search(update, context, query)
+
+    await search_debouncer.call(user_id, search)
+
+MAX_RESUME_BYTES = 5 * 1024 * 1024
 
 async def handle_resume_pdf(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle PDF document uploads for AI Resume matching."""
@@ -556,6 +923,8 @@ async def handle_resume_pdf(update: Update, context: ContextTypes.DEFAULT_TYPE):
         if lang != "en": msg = await translate_text(msg, lang)
         await update.message.reply_text(msg)
         return
+    if await throttled(update, "pdf"):
+        return
 
     # Send a process indicator
     status_text = "📥 Downloading your Resume PDF..."
@@ -564,41 +933,38 @@ async def handle_resume_pdf(update: Update, context: ContextTypes.DEFAULT_TYPE):
     status_msg = await update.message.reply_text(status_text, parse_mode=ParseMode.MARKDOWN)
     await context.bot.send_chat_action(update.effective_chat.id, ChatAction.TYPING)
 
-    # 1. Download document
+    # 1. Download document (the declared size is checked first, the real one while streaming)
     doc = update.message.document
-    if doc.file_size > 5 * 1024 * 1024:  # 5MB limit
-        await status_msg.edit_text("❌ Please 5MB se chhota PDF upload karein.")
+    too_large = "❌ Please 5MB se chhota PDF upload karein."
+    if doc.file_size and doc.file_size > MAX_RESUME_BYTES:
+        await status_msg.edit_text(too_large)
         return
 
     try:
+        stage_start = time.perf_counter()
         file = await context.bot.get_file(doc.file_id)
-        
-        # Save it to a temp file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-            pdf_path = tmp_file.name
-        await file.download_to_drive(pdf_path)
+        try:
+            pdf_bytes = await resume_pdf.download(file, MAX_RESUME_BYTES, context.bot.request)
+        except resume_pdf.FileTooLargeError as e:
+            logger.warning(f"Resume from {user_id_str} refused: {e}")
+            await status_msg.edit_text(too_large)
+            return
+        metrics.RESUME_STAGE_LATENCY.labels("download").observe(time.perf_counter() - stage_start)
 
-        # 2. Extract text from PDF
+        # 2. Extract text from PDF, in memory and off the event loop
         await status_msg.edit_text("📄 Resume se skills aur details padh raha hoon... (AI Magic ✨)", parse_mode=ParseMode.MARKDOWN)
         
-        pdf_text = ""
-        with open(pdf_path, "rb") as f:
-            reader = PyPDF2.PdfReader(f)
-            for page in reader.pages:
-                text = page.extract_text()
-                if text:
-                    pdf_text += text + "\n"
-        
-        # Clean up temp file
-        try:
-            os.remove(pdf_path)
-        except Exception as e:
-            logger.error(f"Failed to delete temp pdf: {e}")
+        stage_start = time.perf_counter()
+        pdf_text = await asyncio.to_thread(resume_pdf.extract_text, pdf_bytes)
+        del pdf_bytes
+        metrics.RESUME_STAGE_LATENCY.labels("extract").observe(time.perf_counter() - stage_start)
 
         if not pdf_text.strip():
             await status_msg.edit_text("❌ Is PDF se valid text samajh nahi aaya. Kripya doosra resume bhejein.")
             return
 
+        profile = await asyncio.to_thread(build_resume_profile, pdf_text)
+
         # 3. Use Gemini AI to extract the best matching job role and query
         prompt = (
             "You are an expert HR and Technical Recruiter. Based on the following resume text, "
@@ -610,9 +976,11 @@ async def handle_resume_pdf(update: Update, context: ContextTypes.DEFAULT_TYPE):
             f"Resume Text:\n{pdf_text[:8000]}"
         )
 
-        model = genai.GenerativeModel("gemini-2.5-flash")
+        stage_start = time.perf_counter()
+        model = get_genai().GenerativeModel("gemini-2.5-flash")
         response = model.generate_content(prompt)
         ai_response = response.text
+        metrics.RESUME_STAGE_LATENCY.labels("llm").observe(time.perf_counter() - stage_start)
 
         # Try to parse JSON from response
         clean_text = ai_response.replace("```json", "").replace("```", "").strip()
@@ -623,18 +991,19 @@ async def handle_resume_pdf(update: Update, context: ContextTypes.DEFAULT_TYPE):
         explanation = job_data.get("explanation", "Yeh jobs aapke resume ke hisab se best match karti hain.")
 
         await status_msg.edit_text(
-            f"🤖 *AI Analysis Complete!*\n\n"
-            f"🎯 *Best Role Match:* {role}\n"
-            f"💡 *AI Says:* {explanation}\n\n"
-            f"🔍 Searching best jobs for `{query}`...",
-            parse_mode=ParseMode.MARKDOWN
+            f"🤖 <b>AI Analysis Complete!</b>\n\n"
+            f"🎯 <b>Best Role Match:</b> {escape(role)}\n"
+            f"💡 <b>AI Says:</b> {escape(explanation)}\n"
+            f"📊 <b>Resume:</b> {escape(profile.summary())}\n\n"
+            f"🔍 Searching best jobs for {code(query)}...",
+            parse_mode=ParseMode.HTML
         )
 
         # Wait briefly so user can read message
         await asyncio.sleep(2)
         
-        # 4. Perform the job search using the new query
-        await perform_search(update, context, query)
+        # 4. Perform the job search using the new query, ranked against the resume
+        await perform_search(update, context, query, resume=profile)
 
     except json.JSONDecodeError as je:
         logger.error(f"JSON Parsing Error: {je} - AI Output: {ai_response}")
@@ -648,22 +1017,36 @@ async def handle_resume_pdf(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await status_msg.edit_text(msg)
 
 
-async def perform_search(update: Update, context: ContextTypes.DEFAULT_TYPE, query: str):
-    """Core job search logic."""
+def search_terms(query: str) -> tuple[str, Optional[float]]:
+    """(query without its pay floor, the floor in INR/year or None)."""
+    search_query, min_salary = split_salary_filter(query)
+    return (search_query, min_salary) if search_query else (query, None)
+
+
+@traced("perform_search")
+async def perform_search(update: Update, context: ContextTypes.DEFAULT_TYPE, query: str, resume=None):
+    """
+    Core job search logic. With a `resume` profile, results are ranked
+    against it; with a pay floor in the query ("min 10 LPA") the best paid
+    jobs above it come first.
+    """
     user_id = update.effective_user.id
     lang = get_user_lang(str(user_id))
+    search_query, min_salary = search_terms(query)
+
+    recent_queries.record(search_query, lang)
 
     # Show typing indicator
     await context.bot.send_chat_action(update.effective_chat.id, ChatAction.TYPING)
 
     # Show search message
-    search_txt = f"🔍 Searching for jobs related to *'{query}'*...\n⏳ Please wait..."
-    if lang != "en": search_txt = await translate_text(search_txt, lang)
+    search_txt = f"🔍 Searching for jobs related to <b>'{escape(query)}'</b>...\n⏳ Please wait..."
+    if lang != "en": search_txt = safe_html(await translate_text(search_txt, lang))
     
-    search_msg = await update.message.reply_text(search_txt, parse_mode=ParseMode.MARKDOWN)
+    search_msg = await update.effective_message.reply_text(search_txt, parse_mode=ParseMode.HTML)
 
     try:
-        jobs = await searcher.search_jobs(query, num_results=8)
+        jobs = await searcher.search_jobs(search_query, num_results=8, local_first=True, min_salary=min_salary)
     except Exception as e:
         logger.error(f"Search error: {e}")
         err_txt = "❌ Problem occurred while searching. Please try again!"
@@ -673,46 +1056,47 @@ async def perform_search(update: Update, context: ContextTypes.DEFAULT_TYPE, que
 
     if not jobs:
         msg = (
-            f"😔 We couldn't find jobs for *'{query}'*.\n\n"
+            f"😔 We couldn't find jobs for <b>'{escape(query)}'</b>.\n\n"
             "Try this:\n"
-            "• Add location: `Python Developer Mumbai`\n"
+            f"• Add location: {code('Python Developer Mumbai')}\n"
             "• Change keywords\n"
-            "• Broader search: `Developer India`"
+            f"• Broader search: {code('Developer India')}"
         )
-        if lang != 'en': msg = await translate_text(msg, lang)
-        await search_msg.edit_text(msg, parse_mode=ParseMode.MARKDOWN)
+        if lang != 'en': msg = safe_html(await translate_text(msg, lang))
+        await search_msg.edit_text(msg, parse_mode=ParseMode.HTML)
         return
 
+    if resume is not None:
+        # Rank the fresh results together with every job seen recently
+        stage_start = time.perf_counter()
+        candidates = JOB_CACHE.items() + [(get_job_hash(job), job) for job in jobs]
+        with span("resume_match", jobs=len(candidates)):
+            jobs = await asyncio.to_thread(rank_for_resume, resume, candidates) or jobs
+        metrics.RESUME_STAGE_LATENCY.labels("match").observe(time.perf_counter() - stage_start)
+
     # Save session
-    user_sessions[user_id] = {
-        "query": query,
-        "results": jobs,
-        "page": 0
-    }
+    user_sessions.put(user_id, query, jobs)
 
     # Delete "searching..." message
     await search_msg.delete()
 
     # Send header
     header = (
-        f"✅ Found *{len(jobs)} jobs* for *'{query}'*!\n"
+        f"✅ Found <b>{len(jobs)} jobs</b> for <b>'{escape(query)}'</b>!\n"
         "━━━━━━━━━━━━━━━━━━━━━━━━━\n\n"
     )
-    if lang != 'en': header = await translate_text(header, lang)
-    await update.message.reply_text(header, parse_mode=ParseMode.MARKDOWN)
+    if lang != 'en': header = safe_html(await translate_text(header, lang))
+    await update.effective_message.reply_text(header, parse_mode=ParseMode.HTML)
 
-    # Send each job card
+    # Send each job card (already valid HTML, see format_job_card)
     for i, job in enumerate(jobs[:5], 1):
-        msg_card = await format_job_card(job, i, lang)
-        keyboard = build_job_keyboard(job, lang)
+        card = await render_job(job, lang)
         try:
-            await update.message.reply_text(msg_card, parse_mode=ParseMode.MARKDOWN, reply_markup=keyboard)
-            await asyncio.sleep(0.4)
+            await update.effective_message.reply_text(card.html(i), parse_mode=ParseMode.HTML, reply_markup=card.keyboard)
+            with span("sleep"):
+                await asyncio.sleep(0.4)
         except Exception as e:
             logger.warning(f"Failed to send job {i}: {e}")
-            # Send without markdown if parsing fails
-            plain = await format_job_card_plain(job, i, lang)
-            await update.message.reply_text(plain, reply_markup=keyboard)
 
     # Show navigation if more results
     if len(jobs) > 5:
@@ -723,9 +1107,9 @@ async def perform_search(update: Update, context: ContextTypes.DEFAULT_TYPE, que
             more_txt = await translate_text(more_txt, lang)
             
         nav_keyboard = InlineKeyboardMarkup([
-            [InlineKeyboardButton(nav_txt, callback_data=f"page_1_{user_id}")]
+            [InlineKeyboardButton(nav_txt, callback_data=callback_codec.encode("page", 1, user_id))]
         ])
-        await update.message.reply_text(more_txt, reply_markup=nav_keyboard)
+        await update.effective_message.reply_text(more_txt, reply_markup=nav_keyboard)
 
 
 # ════════════════════════════════════════════════════════════════════════════
@@ -733,151 +1117,216 @@ async def perform_search(update: Update, context: ContextTypes.DEFAULT_TYPE, que
 # ════════════════════════════════════════════════════════════════════════════
 
 async def callback_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Handle inline keyboard button presses."""
+    """Handle inline keyboard button presses: decode the payload and dispatch on its action."""
     query = update.callback_query
+    if await throttled(update, "callback"):
+        return
     await query.answer()
 
-    data = query.data
+    data = query.data or ""
+    decoded = callback_codec.parse(data)
+    handler = CALLBACK_ACTIONS.get(decoded[0]) if decoded else None
+    if handler is None:
+        metrics.CALLBACKS.labels("invalid", "rejected").inc()
+        logger.warning(f"Rejected callback data {data[:64]!r} from {update.effective_user.id}")
+        return
+
+    action, args = decoded
     user_id = str(update.effective_user.id)
     lang = get_user_lang(user_id)
+    metrics.CALLBACKS.labels(action, "legacy" if not data.startswith(CALLBACK_PREFIX) else "ok").inc()
+    await handler(query, user_id, lang, *args)
 
-    # Handle Language Change
-    if data.startswith("lang_"):
-        selected_lang = data.split("_")[1]
-        user_langs[user_id] = selected_lang
-        save_langs()
-        
-        msg = f"Language changed successfully to {selected_lang.upper()} ✅"
-        if selected_lang != "en":
-            msg = await translate_text(msg, selected_lang)
-            
-        await query.message.edit_text(msg)
+
+async def on_lang(query, user_id: str, lang: str, selected_lang: str):
+    if selected_lang not in SUPPORTED_LANGS:
+        metrics.CALLBACKS.labels("lang", "rejected").inc()
+        logger.warning(f"User {user_id} picked unsupported language {selected_lang[:16]!r}")
         return
+    user_langs[user_id] = selected_lang
+    save_langs()
+    
+    msg = f"Language changed successfully to {selected_lang.upper()} ✅"
+    if selected_lang != "en":
+        msg = await translate_text(msg, selected_lang)
+        
+    await query.message.edit_text(msg)
 
-    if data.startswith("save_"):
-        job_hash = data.split("_")[1]
-        job = JOB_CACHE.get(job_hash)
-        if job:
-            if user_id not in saved_jobs:
-                saved_jobs[user_id] = []
-            
-            # Check if already saved
-            already_saved = any(get_job_hash(sj) == job_hash for sj in saved_jobs[user_id])
-            if not already_saved:
-                saved_jobs[user_id].append(job)
-                save_saved_jobs_file()
-                msg = "✅ Job saved successfully!"
-            else:
-                msg = "⚠️ This job is already saved."
-            
-            if lang != "en": msg = await translate_text(msg, lang)
-            await query.answer(msg, show_alert=True)
+
+async def on_save(query, user_id: str, lang: str, job_hash: str):
+    job = JOB_CACHE.get(job_hash)
+    if job:
+        if user_id not in saved_jobs:
+            saved_jobs[user_id] = []
+        
+        # Check if already saved
+        already_saved = any(get_job_hash(sj) == job_hash for sj in saved_jobs[user_id])
+        if not already_saved:
+            saved_jobs[user_id].append(job)
+            save_saved_jobs_file()
+            msg = "✅ Job saved successfully!"
         else:
-            await query.answer("❌ Job expired. Please search again.", show_alert=True)
-        return
+            msg = "⚠️ This job is already saved."
+        
+        if lang != "en": msg = await translate_text(msg, lang)
+        await query.answer(msg, show_alert=True)
+    else:
+        await query.answer("❌ Job expired. Please search again.", show_alert=True)
 
-    if data.startswith("unsave_"):
-        job_hash = data.split("_")[1]
-        if user_id in saved_jobs:
-            original_len = len(saved_jobs[user_id])
-            saved_jobs[user_id] = [j for j in saved_jobs[user_id] if get_job_hash(j) != job_hash]
-            if len(saved_jobs[user_id]) < original_len:
-                save_saved_jobs_file()
-                msg = "❌ Job removed from saved list."
-                if lang != "en": msg = await translate_text(msg, lang)
-                await query.answer(msg, show_alert=True)
-                await query.message.delete()
-            else:
-                await query.answer("⚠️ Job not found in saved list.", show_alert=True)
-        return
 
-    if data.startswith("applied_"):
-        job_hash = data.split("_")[1]
-        job = JOB_CACHE.get(job_hash)
-        if job:
-            if user_id not in applications:
-                applications[user_id] = {}
-            
-            if job_hash not in applications[user_id]:
-                applications[user_id][job_hash] = {
-                    "job": job,
-                    "status": "applied",
-                    "date": datetime.datetime.now().strftime("%d %b %Y")
-                }
-                save_applications_file()
-                msg = "✅ Added to Tracked Applications!"
-            else:
-                msg = "⚠️ Already tracking this application."
-                
+async def on_unsave(query, user_id: str, lang: str, job_hash: str):
+    if user_id in saved_jobs:
+        original_len = len(saved_jobs[user_id])
+        saved_jobs[user_id] = [j for j in saved_jobs[user_id] if get_job_hash(j) != job_hash]
+        if len(saved_jobs[user_id]) < original_len:
+            save_saved_jobs_file()
+            msg = "❌ Job removed from saved list."
             if lang != "en": msg = await translate_text(msg, lang)
             await query.answer(msg, show_alert=True)
+            await query.message.delete()
         else:
-            await query.answer("❌ Job expired. Please search again.", show_alert=True)
-        return
+            await query.answer("⚠️ Job not found in saved list.", show_alert=True)
 
-    if data.startswith("status_"):
-        _, job_hash, new_status = data.split("_")
-        if user_id in applications and job_hash in applications[user_id]:
-            applications[user_id][job_hash]["status"] = new_status
-            save_applications_file()
-            msg = f"✅ Status updated to {APP_STATUSES.get(new_status, new_status)}"
-            if lang != "en": msg = await translate_text(msg, lang)
-            await query.answer(msg, show_alert=True)
-            # Update the message to show new status
-            await query.message.edit_text(
-                query.message.text.split("Status:")[0] + f"Status: `{APP_STATUSES.get(new_status, new_status)}`",
-                parse_mode=ParseMode.MARKDOWN,
-                reply_markup=query.message.reply_markup # Keep keyboard
-            )
-        return
 
-    if data.startswith("remapp_"):
-        job_hash = data.split("_")[1]
-        if user_id in applications and job_hash in applications[user_id]:
-            del applications[user_id][job_hash]
+async def on_applied(query, user_id: str, lang: str, job_hash: str):
+    job = JOB_CACHE.get(job_hash)
+    if job:
+        if user_id not in applications:
+            applications[user_id] = {}
+        
+        if job_hash not in applications[user_id]:
+            applications[user_id][job_hash] = {
+                "job": job,
+                "status": "applied",
+                "date": datetime.datetime.now().strftime("%d %b %Y")
+            }
             save_applications_file()
-            msg = "🗑️ Application tracker removed."
-            if lang != "en": msg = await translate_text(msg, lang)
-            await query.answer(msg, show_alert=True)
-            await query.message.delete()
+            msg = "✅ Added to Tracked Applications!"
+        else:
+            msg = "⚠️ Already tracking this application."
+            
+        if lang != "en": msg = await translate_text(msg, lang)
+        await query.answer(msg, show_alert=True)
+    else:
+        await query.answer("❌ Job expired. Please search again.", show_alert=True)
+
+
+async def on_status(query, user_id: str, lang: str, job_hash: str, new_status: str):
+    if new_status not in APP_STATUSES:
         return
+    if user_id in applications and job_hash in applications[user_id]:
+        applications[user_id][job_hash]["status"] = new_status
+        save_applications_file()
+        msg = f"✅ Status updated to {APP_STATUSES.get(new_status, new_status)}"
+        if lang != "en": msg = await translate_text(msg, lang)
+        await query.answer(msg, show_alert=True)
+        # Update the message to show new status
+        await query.message.edit_text(
+            query.message.text.split("Status:")[0] + f"Status: `{APP_STATUSES.get(new_status, new_status)}`",
+            parse_mode=ParseMode.MARKDOWN,
+            reply_markup=query.message.reply_markup # Keep keyboard
+        )
+
+
+async def on_remove_application(query, user_id: str, lang: str, job_hash: str):
+    if user_id in applications and job_hash in applications[user_id]:
+        del applications[user_id][job_hash]
+        save_applications_file()
+        msg = "🗑️ Application tracker removed."
+        if lang != "en": msg = await translate_text(msg, lang)
+        await query.answer(msg, show_alert=True)
+        await query.message.delete()
 
-    if data.startswith("page_"):
-        _, page_str, target_user = data.split("_")
-        page = int(page_str)
-        target_uid = int(target_user)
 
-        if target_uid not in user_sessions:
+async def on_page(query, user_id: str, lang: str, page: int, target_uid: int):
+    # Sessions are per user: a button for someone else's results is refused
+    if target_uid != int(user_id):
+        metrics.CALLBACKS.labels("page", "rejected").inc()
+        logger.warning(f"User {user_id} pressed a page button for user {target_uid}")
+        return
+
+    session = user_sessions.get(target_uid)
+    jobs = user_sessions.results(session) if session else None
+    if jobs is None:
+        # Session expired or its jobs were evicted: search the same query again
+        last_query = user_sessions.last_query(target_uid)
+        if last_query:
+            search_query, min_salary = search_terms(last_query)
+            try:
+                jobs = await searcher.search_jobs(search_query, num_results=8, local_first=True, min_salary=min_salary)
+            except Exception as e:
+                logger.error(f"Search error while restoring session: {e}")
+                jobs = []
+            if jobs:
+                user_sessions.put(target_uid, last_query, jobs)
+        if not jobs:
             msg = "❌ Session has expired. Please search again."
             if lang != "en": msg = await translate_text(msg, lang)
             await query.message.reply_text(msg)
             return
 
-        session = user_sessions[target_uid]
-        jobs = session["results"]
+    start_idx = page * 5
+    end_idx = start_idx + 5
+    page_jobs = jobs[start_idx:end_idx]
 
-        start_idx = page * 5
-        end_idx = start_idx + 5
-        page_jobs = jobs[start_idx:end_idx]
+    for i, job in enumerate(page_jobs, start_idx + 1):
+        card = await render_job(job, lang)
+        await query.message.reply_text(card.html(i), parse_mode=ParseMode.HTML, reply_markup=card.keyboard)
+        await asyncio.sleep(0.3)
 
-        for i, job in enumerate(page_jobs, start_idx + 1):
-            msg_card = await format_job_card(job, i, lang)
-            keyboard = build_job_keyboard(job, lang)
-            await query.message.reply_text(msg_card, parse_mode=ParseMode.MARKDOWN, reply_markup=keyboard)
-            await asyncio.sleep(0.3)
 
-    elif data == "new_search":
-        msg = "🔍 Try a new job search, for example:\n`React Developer Bangalore`"
-        if lang != "en": msg = await translate_text(msg, lang)
-        await query.message.reply_text(msg, parse_mode=ParseMode.MARKDOWN)
+async def on_new_search(query, user_id: str, lang: str):
+    msg = "🔍 Try a new job search, for example:\n`React Developer Bangalore`"
+    if lang != "en": msg = await translate_text(msg, lang)
+    await query.message.reply_text(msg, parse_mode=ParseMode.MARKDOWN)
+
+
+# Button action → handler(query, user_id, lang, *args), see callback_codec.ACTIONS
+CALLBACK_ACTIONS = {
+    "lang": on_lang,
+    "save": on_save,
+    "unsave": on_unsave,
+    "applied": on_applied,
+    "status": on_status,
+    "remapp": on_remove_application,
+    "page": on_page,
+    "new_search": on_new_search,
+}
 
 
 # ════════════════════════════════════════════════════════════════════════════
 #  HELPER FUNCTIONS
 # ════════════════════════════════════════════════════════════════════════════
 
-async def format_job_card(job: dict, index: int, lang: str = "en") -> str:
-    """Format a job dict into a beautiful Telegram message."""
+async def render_job(job: dict, lang: str = "en", view: str = "card") -> RenderedCard:
+    """
+    The job's card in `lang`: validated HTML text plus its keyboard (`view`
+    "saved" gets the remove button). Served from RENDER_CACHE when the job
+    was shown in this language before.
+    """
+    job_hash = get_job_hash(job)
+    # Clean before caching: saving or applying copies the cached job, and a
+    # cached card skips format_job_card
+    JOB_CACHE[job_hash] = ensure_description(job)  # Callbacks look the job up by hash
+    card = RENDER_CACHE.get(job_hash, lang, view)
+    if card is None:
+        errors = []
+        body = await format_job_card(job, lang, errors)
+        card = RenderedCard(body, build_job_keyboard(job, lang, saved_view=(view == "saved")))
+        # A failed translation falls back to English: don't keep that for the language
+        if not errors:
+            RENDER_CACHE.put(job_hash, lang, view, card)
+    return card
+
+
+async def format_job_card(job: dict, lang: str = "en", errors: Optional[list] = None) -> str:
+    """
+    Format a job dict into a beautiful Telegram message body (HTML). Every
+    field is escaped after translation; if the result still isn't valid
+    HTML, a plain-text version is returned instead, so sending never fails.
+    """
+    start = time.perf_counter()
+    ensure_description(job)
     title = job.get("title", "Job Title N/A")
     company = job.get("company", "Company N/A")
     location = job.get("location", "Location N/A")
@@ -899,60 +1348,33 @@ async def format_job_card(job: dict, index: int, lang: str = "en") -> str:
     
     # Translate dynamic strings if needed
     if lang != "en":
-        title = await translate_text(title, lang)
-        description = await translate_text(description, lang)
-        location = await translate_text(location, lang)
-        salary = await translate_text(salary, lang)
-        labels["company_lbl"] = await translate_text(labels["company_lbl"], lang)
-        labels["location_lbl"] = await translate_text(labels["location_lbl"], lang)
-        labels["type_lbl"] = await translate_text(labels["type_lbl"], lang)
-        labels["salary_lbl"] = await translate_text(labels["salary_lbl"], lang)
-        labels["desc_lbl"] = await translate_text(labels["desc_lbl"], lang)
-
-    # Clean up text for Markdown
-    title = str(title).replace("*", "").replace("_", " ").replace("`", "")
-    company = str(company).replace("*", "").replace("_", " ")
-    location = str(location).replace("*", "")
-
-    rating_str = f" ⭐ {rating}" if rating else ""
-    posted_str = f" • {posted}" if posted else ""
-
-    card = (
-        f"━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-        f"🔢 *# {index}*\n"
-        f"━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-        f"🏷️ *{title}*\n\n"
-        f"🏢 *{labels['company_lbl']}* {company}{rating_str}\n"
-        f"📍 *{labels['location_lbl']}* {location}\n"
-        f"💼 *{labels['type_lbl']}* {job_type}{posted_str}\n"
-        f"💰 *{labels['salary_lbl']}* {salary}\n\n"
-        f"📝 *{labels['desc_lbl']}*\n{description}\n"
+        title = await translate_text(title, lang, errors)
+        description = await translate_text(description, lang, errors)
+        location = await translate_text(location, lang, errors)
+        salary = await translate_text(salary, lang, errors)
+        for key in labels:
+            labels[key] = await translate_text(labels[key], lang, errors)
+
+    rating_str = f" ⭐ {escape(rating)}" if rating else ""
+    posted_str = f" • {escape(posted)}" if posted else ""
+
+    # The "# N" header is added per message by RenderedCard.html()
+    body = (
+        f"🏷️ {bold(title)}\n\n"
+        f"🏢 {bold(labels['company_lbl'])} {escape(company)}{rating_str}\n"
+        f"📍 {bold(labels['location_lbl'])} {escape(location)}\n"
+        f"💼 {bold(labels['type_lbl'])} {escape(job_type)}{posted_str}\n"
+        f"💰 {bold(labels['salary_lbl'])} {escape(salary)}\n\n"
+        f"📝 {bold(labels['desc_lbl'])}\n{escape(description)}\n"
     )
-    return card
+    error = validate(body)
+    if error:
+        logger.warning(f"Job card is not valid HTML ({error}), sending it as plain text")
+        body = safe_html(body)
+    metrics.CARD_RENDER_LATENCY.observe(time.perf_counter() - start)
+    return body
 
 
-async def format_job_card_plain(job: dict, index: int, lang: str = "en") -> str:
-    """Plain text job card (no markdown)."""
-    title = job.get("title", "N/A")
-    company = job.get("company", "N/A")
-    location = job.get("location", "N/A")
-    salary = job.get("salary", "Not mentioned")
-    description = job.get("description", "N/A")[:250]
-
-    if lang != "en":
-        title = await translate_text(title, lang)
-        description = await translate_text(description, lang)
-
-    return (
-        f"─────────────────────────\n"
-        f"Job #{index}: {title}\n"
-        f"Company: {company}\n"
-        f"Location: {location}\n"
-        f"Salary: {salary}\n"
-        f"Description: {description}...\n"
-        f"─────────────────────────"
-    )
-
 def build_job_keyboard(job: dict, lang: str = "en", saved_view: bool = False) -> InlineKeyboardMarkup:
     """Build inline keyboard for a job card."""
     buttons = []
@@ -973,15 +1395,15 @@ def build_job_keyboard(job: dict, lang: str = "en", saved_view: bool = False) ->
 
     row2 = []
     if saved_view:
-        row2.append(InlineKeyboardButton("❌ Remove Saved Job", callback_data=f"unsave_{job_hash}"))
+        row2.append(InlineKeyboardButton("❌ Remove Saved Job", callback_data=callback_codec.encode("unsave", job_hash)))
     else:
-        row2.append(InlineKeyboardButton("💾 Save Job", callback_data=f"save_{job_hash}"))
+        row2.append(InlineKeyboardButton("💾 Save Job", callback_data=callback_codec.encode("save", job_hash)))
     
-    row2.append(InlineKeyboardButton("✅ I Applied", callback_data=f"applied_{job_hash}"))
+    row2.append(InlineKeyboardButton("✅ I Applied", callback_data=callback_codec.encode("applied", job_hash)))
     buttons.append(row2)
 
     buttons.append([
-        InlineKeyboardButton("🔍 New Search", callback_data="new_search")
+        InlineKeyboardButton("🔍 New Search", callback_data=callback_codec.encode("new_search"))
     ])
     return InlineKeyboardMarkup(buttons)
 
@@ -1008,88 +1430,367 @@ async def error_handler(update: object, context: ContextTypes.DEFAULT_TYPE):
 #  MAIN
 # ════════════════════════════════════════════════════════════════════════════
 
-async def send_daily_jobs(context: ContextTypes.DEFAULT_TYPE):
-    """Job queue callback to send daily jobs to subscribed users."""
-    logger.info("Running daily job alerts...")
-    for user_id_str, query in subscriptions.items():
-        try:
-            lang = get_user_lang(user_id_str)
-            jobs = await searcher.search_jobs(query, num_results=3) # Top 3 jobs daily
-            if not jobs:
-                continue
-
-            user_id = int(user_id_str)
-            header = (
-                f"🌅 *Good Morning!* ☕\n\n"
-                f"For your *'{query}'* subscription, here are today's top jobs:\n"
-                "━━━━━━━━━━━━━━━━━━━━━━━━━\n\n"
-            )
-            if lang != "en": header = await translate_text(header, lang)
-            
-            await context.bot.send_message(chat_id=user_id, text=header, parse_mode=ParseMode.MARKDOWN)
-
-            for i, job in enumerate(jobs[:3], 1):
-                msg_card = await format_job_card(job, i, lang)
-                keyboard = build_job_keyboard(job, lang)
-                try:
-                    await context.bot.send_message(chat_id=user_id, text=msg_card, parse_mode=ParseMode.MARKDOWN, reply_markup=keyboard)
-                    await asyncio.sleep(0.4)
-                except Exception as e:
-                    logger.warning(f"Failed to send daily job to {user_id}: {e}")
-                    plain = await format_job_card_plain(job, i, lang)
-                    await context.bot.send_message(chat_id=user_id, text=plain, reply_markup=keyboard)
-            
-            # Small delay between users to avoid hitting Telegram API limits
-            await asyncio.sleep(1)
+def is_permanent_send_error(error: Exception) -> bool:
+    """Whether a send failed because the chat is gone for good (bot blocked, account deleted)."""
+    if isinstance(error, Forbidden):
+        return True
+    return isinstance(error, BadRequest) and "chat not found" in str(error).lower()
+
+async def send_user_alert(context: ContextTypes.DEFAULT_TYPE, user_id_str: str, sub: dict, jobs: list[dict]) -> str:
+    """
+    Send one subscription's daily alert with up to 3 jobs from the shared
+    results that pass its filters and were not sent before. A salary filter
+    goes through the searcher's index of `jobs`, built once for all
+    subscribers.
+
+    Returns "nothing_new" (nothing was sent), "sent", or "failed" if a card
+    could not be sent; only the cards that went out are marked seen, so a
+    retry sends the rest. Permanent errors (see is_permanent_send_error)
+    are raised.
+    """
+    lang = get_user_lang(user_id_str)
+    key = subscription_key(user_id_str, sub)
+    filters = sub.get("filters", {})
+    query = sub["query"]
+
+    # Only deliver matching jobs this subscription hasn't seen yet
+    if filters.get("min_salary"):
+        jobs = searcher.salary_indexes.get(jobs).at_least(filters["min_salary"])
+    by_hash = {}
+    for job in jobs:
+        if matches_filters(job, filters):
+            by_hash.setdefault(get_job_hash(job), job)
+    new_hashes = seen_jobs.unseen(key, list(by_hash))[:3] # Top 3 new jobs daily
+    if not new_hashes:
+        return "nothing_new"
+
+    user_id = int(user_id_str)
+    header = (
+        f"🌅 <b>Good Morning!</b> ☕\n\n"
+        f"For your <b>'{escape(query)}'</b> subscription, here are today's top jobs:\n"
+        "━━━━━━━━━━━━━━━━━━━━━━━━━\n\n"
+    )
+    if lang != "en": header = safe_html(await translate_text(header, lang))
+
+    await context.bot.send_message(chat_id=user_id, text=header, parse_mode=ParseMode.HTML)
 
+    sent = []
+    for i, job_hash in enumerate(new_hashes, 1):
+        card = await render_job(by_hash[job_hash], lang)
+        try:
+            await context.bot.send_message(chat_id=user_id, text=card.html(i), parse_mode=ParseMode.HTML, reply_markup=card.keyboard)
+            sent.append(job_hash)
+            await asyncio.sleep(0.4)
         except Exception as e:
-            logger.error(f"Error processing daily job for user {user_id_str}: {e}")
+            if is_permanent_send_error(e):
+                raise
+            logger.warning(f"Failed to send daily job to {user_id}: {e}")
 
-def main():
-    if not TELEGRAM_BOT_TOKEN:
-        raise ValueError("TELEGRAM_BOT_TOKEN .env file mein set nahi hai!")
-    if not RAPIDAPI_KEY:
-        raise ValueError("RAPIDAPI_KEY .env file mein set nahi hai!")
+    # Only what went out counts as seen; the others are offered again next time
+    seen_jobs.mark_seen(key, sent)
+    return "sent" if len(sent) == len(new_hashes) else "failed"
 
-    print("[BOT] Telegram Job Search Bot starting...")
-    
-    # Start Health Check Server in background
-    print("[WEB] Starting Health Check Server...")
-    threading.Thread(target=run_health_check_server, daemon=True).start()
-    
-    print("[OK]  Press Ctrl+C to stop")
 
-    app = Application.builder().token(TELEGRAM_BOT_TOKEN).build()
+_alerts_running = False
 
-    # Schedule daily job at 9:00 AM IST
-    ist_tz = datetime.timezone(datetime.timedelta(hours=5, minutes=30))
-    job_time = datetime.time(hour=9, minute=0, tzinfo=ist_tz)
-    
-    app.job_queue.run_daily(send_daily_jobs, time=job_time)
+async def send_daily_jobs(context: ContextTypes.DEFAULT_TYPE):
+    """
+    Job queue callback (runs every minute) that sends alerts to the
+    subscribers whose shard slot is due. See AlertScheduler.
+
+    All subscriptions of the due users go through the query planner, so each
+    distinct query is searched once and shared by every subscriber. Users are
+    then served ALERT_CONCURRENCY at a time; one who has blocked the bot is
+    unsubscribed instead of retried.
+    """
+    global _alerts_running
+    if _alerts_running:  # Previous tick is still sending
+        return
+    _alerts_running = True
+    try:
+        alert_scheduler.maybe_compact(subscriptions.keys())
+        due = alert_scheduler.due_users(active=subscriptions)
+        if not due:
+            return
+
+        plan = plan_queries(
+            (user_id_str, sub)
+            for user_id_str in due
+            for sub in subscriptions.get(user_id_str, [])
+        )
+        logger.info(f"Running daily job alerts for {len(due)} users ({len(plan)} distinct queries)...")
+
+        results = {}
+        for normalized, entries in plan.items():
+            try:
+                # Usually warmed by prefetch_tick shortly before the slot
+                results[normalized] = await searcher.search_jobs(
+                    entries[0][1]["query"], num_results=10, view="alert", local_first=True)
+            except Exception as e:
+                logger.error(f"Daily alert search failed for '{normalized}': {e}")
+                results[normalized] = None
+
+
+        semaphore = asyncio.Semaphore(ALERT_CONCURRENCY)
+
+        async def serve(user_id_str: str):
+            async with semaphore:
+                failed = False
+                for sub in list(subscriptions.get(user_id_str, [])):
+                    normalized = normalize_query(sub["query"])
+                    jobs = results.get(normalized)
+                    if jobs is None:  # The search failed, try again on the retry
+                        metrics.ALERTS_SENT.labels("failed").inc()
+                        failed = True
+                        continue
+                    if not jobs:
+                        metrics.ALERTS_SENT.labels("no_results").inc()
+                        continue
+                    try:
+                        outcome = await send_user_alert(context, user_id_str, sub, jobs)
+                    except Exception as e:
+                        if is_permanent_send_error(e):
+                            # Blocked or gone: retrying can't help, stop their alerts
+                            metrics.ALERTS_SENT.labels("unreachable").inc()
+                            logger.info(f"Unsubscribing unreachable user {user_id_str}: {e}")
+                            remove_subscriptions(user_id_str, list(subscriptions.get(user_id_str, [])))
+                            return
+                        outcome = "failed"
+                        logger.error(f"Error processing daily job for user {user_id_str}: {e}")
+                    metrics.ALERTS_SENT.labels(outcome).inc()
+                    failed = failed or outcome == "failed"
+                # Checkpoint after every user so a crash resumes from here. A failed
+                # user is retried later in the day; jobs that did go out are marked
+                # seen, so the retry doesn't repeat them.
+                if failed:
+                    alert_scheduler.mark_failed(user_id_str)
+                else:
+                    alert_scheduler.mark_delivered(user_id_str)
+
+        tick_start = time.perf_counter()
+        await asyncio.gather(*(serve(user_id_str) for user_id_str in due))
+        metrics.ALERT_USERS_PER_SECOND.set(len(due) / (time.perf_counter() - tick_start))
+    finally:
+        seen_jobs.save()
+        _alerts_running = False
+
+# ─── Background prefetch ─────────────────────────────────────────────────────
+PREFETCH_INTERVAL_MINUTES = int(os.getenv("PREFETCH_INTERVAL_MINUTES", "30"))  # 0 disables
+PREFETCH_TOP_QUERIES = int(os.getenv("PREFETCH_TOP_QUERIES", "10"))
+PREFETCH_ALERT_LOOKAHEAD_MINUTES = 45
+
+async def warm_cards(jobs: list[dict], langs: set[str]):
+    """Render the cards a search would show first into RENDER_CACHE."""
+    for lang in langs:
+        for job in jobs[:5]:
+            await render_job(job, lang)
+
+prefetcher = Prefetcher(
+    searcher,
+    warm_cards,
+    max_queries=int(os.getenv("PREFETCH_MAX_QUERIES", "10")),
+    quota_reserve=float(os.getenv("PREFETCH_QUOTA_RESERVE", "0.3")),
+    refresh_after=PREFETCH_INTERVAL_MINUTES * 60 * 0.9,
+)
+
+def prefetch_targets() -> list[PrefetchTarget]:
+    """Trending first, then subscriptions due soon (most shared first), then frequent searches."""
+    active_langs = recent_queries.languages() or {DEFAULT_LANG}
+    targets = [PrefetchTarget(q, "card", active_langs, "trending") for q in TRENDING_QUERIES]
+
+    soon = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(minutes=PREFETCH_ALERT_LOOKAHEAD_MINUTES)
+    due = alert_scheduler.upcoming(soon, active=subscriptions)
+    plan = plan_queries((user_id_str, sub) for user_id_str in due for sub in subscriptions.get(user_id_str, []))
+    for entries in sorted(plan.values(), key=len, reverse=True):
+        langs = {get_user_lang(user_id_str) for user_id_str, _ in entries}
+        targets.append(PrefetchTarget(entries[0][1]["query"], "alert", langs, "subscription"))
+
+    targets += [PrefetchTarget(q, "card", langs, "frequent") for q, langs in recent_queries.top(PREFETCH_TOP_QUERIES)]
+    return targets
+
+async def prefetch_tick(context: ContextTypes.DEFAULT_TYPE):
+    """Job queue callback that keeps hot queries warm (see prefetch.py)."""
+    await prefetcher.run(prefetch_targets())
+
+# ─── Restart snapshot ────────────────────────────────────────────────────────
+# JOB_CACHE, sessions and translations survive a restart (see snapshot.py)
+SNAPSHOT_PATH = os.getenv("SNAPSHOT_PATH", "state_snapshot.bin")
+SNAPSHOT_MAX_JOBS = int(os.getenv("SNAPSHOT_MAX_JOBS", "20000"))
+SHUTDOWN_DRAIN_SECONDS = 10.0
+
+restored_snapshot: Optional[Snapshot] = None
+
+def restore_snapshot():
+    """Map the last run's snapshot: sessions are restored now, jobs when first asked for."""
+    global restored_snapshot
+    snap = Snapshot.open(SNAPSHOT_PATH)
+    if snap is None:
+        return
+    downtime = snap.age
+    user_sessions.restore(
+        [(user_id, query, hashes, idle + downtime) for user_id, query, hashes, idle in snap.sessions],
+        snap.last_queries,
+    )
+    JOB_CACHE.fallback = snap.job
+    restored_snapshot = snap
+    logger.info(f"Snapshot restored: {len(snap.sessions)} sessions, {len(snap)} jobs "
+                f"(written {downtime:.0f}s ago)")
+
+async def restore_translations():
+    """Fill TRANSLATION_CACHE from the snapshot, decoded in a worker thread."""
+    if restored_snapshot is None:
+        return
+    translations = await asyncio.to_thread(restored_snapshot.translations)
+    for key, value in translations.items():
+        TRANSLATION_CACHE.setdefault(key, value)
+
+def save_snapshot() -> dict:
+    """Write the snapshot: most recently used jobs first, then those never read back from the last one."""
+    live = ((job_hash, encode_job(job)) for job_hash, job in reversed(JOB_CACHE.items()))
+    carried = restored_snapshot.job_records() if restored_snapshot is not None else []
+    return write_snapshot(
+        SNAPSHOT_PATH,
+        itertools.islice(itertools.chain(live, carried), SNAPSHOT_MAX_JOBS),
+        user_sessions.export(),
+        user_sessions.last_queries(),
+        dict(TRANSLATION_CACHE),
+        previous=restored_snapshot,
+    )
+
+def flush_state():
+    """Write every state file and the snapshot (at shutdown, from a worker thread)."""
+    save_subscriptions()
+    save_langs()
+    save_saved_jobs_file()
+    save_applications_file()
+    seen_jobs.save()
+    if SNAPSHOT_PATH:
+        try:
+            stats = save_snapshot()
+            logger.info(f"Snapshot written: {stats}")
+        except Exception as e:
+            logger.error(f"Failed to write snapshot: {e}", exc_info=True)
+    if searcher.corpus is not None:
+        searcher.corpus.close()
+
+class InstrumentedRequest(HTTPXRequest):
+    """HTTPXRequest that records the latency and status of every Bot API call (and a span when traced)."""
+
+    async def do_request(self, url, method, *args, **kwargs):
+        api_method = url.rsplit("/", 1)[-1]
+        start = time.perf_counter()
+        status = "error"
+        try:
+            with span(f"telegram.{api_method}") as send_span:
+                code, payload = await super().do_request(url, method, *args, **kwargs)
+                send_span.set("status", code)
+            status = str(code)
+            return code, payload
+        finally:
+            metrics.TELEGRAM_REQUESTS.labels(api_method, status).observe(time.perf_counter() - start)
+
+    @contextlib.asynccontextmanager
+    async def stream(self, url: str):
+        """
+        GET a file URL as a streamed httpx response, over this request's own
+        client (its pool, proxy and timeouts), recorded as "file_download".
+        """
+        start = time.perf_counter()
+        status = "error"
+        try:
+            with span("telegram.file_download"):
+                async with self._client.stream("GET", url) as response:
+                    status = str(response.status_code)
+                    yield response
+        finally:
+            metrics.TELEGRAM_REQUESTS.labels("file_download", status).observe(time.perf_counter() - start)
+
+async def post_init(app: Application):
+    """Runs on the event loop once the Application is initialized."""
+    watchdog.start()
+    # Not awaited, so a big translation cache doesn't hold up polling
+    app.bot_data["restore_translations"] = asyncio.create_task(restore_translations())
+
+async def post_stop(app: Application):
+    """
+    Runs after SIGTERM/SIGINT, once polling has stopped and the updates in
+    flight have been handled: waits for deferred searches and background
+    refreshes, then flushes state and writes the snapshot.
+    """
+    await search_debouncer.drain(SHUTDOWN_DRAIN_SECONDS)
+    await searcher.drain(SHUTDOWN_DRAIN_SECONDS)
+    await asyncio.to_thread(flush_state)
+
+def build_application(token: str, base_url: Optional[str] = None, base_file_url: Optional[str] = None,
+                      concurrent_updates: Union[bool, int] = False) -> Application:
+    """
+    Build the Application with every handler registered. `base_url` and
+    `base_file_url` point the bot at another Bot API server (the benchmarks
+    use a local mock); `concurrent_updates` is passed to the builder.
+    """
+    builder = (
+        Application.builder()
+        .token(token)
+        .concurrent_updates(concurrent_updates)
+        # Custom requests don't get the builder's default pool, size it for concurrent updates
+        .request(InstrumentedRequest(connection_pool_size=256))
+        .get_updates_request(InstrumentedRequest())
+    )
+    if base_url:
+        builder = builder.base_url(base_url)
+    if base_file_url:
+        builder = builder.base_file_url(base_file_url)
+    app = builder.post_init(post_init).post_stop(post_stop).build()
 
     # Command handlers
-    app.add_handler(CommandHandler("start", start))
-    app.add_handler(CommandHandler("help", help_command))
-    app.add_handler(CommandHandler("language", language_command))
-    app.add_handler(CommandHandler("trending", trending_jobs))
-    app.add_handler(CommandHandler("search", search_command))
-    app.add_handler(CommandHandler("saved", saved_jobs_command))
-    app.add_handler(CommandHandler("applications", applications_command))
-    app.add_handler(CommandHandler("subscribe", subscribe_command))
-    app.add_handler(CommandHandler("unsubscribe", unsubscribe_command))
-    app.add_handler(CommandHandler("clear", clear_session))
+    app.add_handler(CommandHandler("start", traced_handler(start)))
+    app.add_handler(CommandHandler("help", traced_handler(help_command)))
+    app.add_handler(CommandHandler("language", traced_handler(language_command)))
+    app.add_handler(CommandHandler("trending", traced_handler(trending_jobs)))
+    app.add_handler(CommandHandler("search", traced_handler(search_command)))
+    app.add_handler(CommandHandler("saved", traced_handler(saved_jobs_command)))
+    app.add_handler(CommandHandler("applications", traced_handler(applications_command)))
+    app.add_handler(CommandHandler("subscribe", traced_handler(subscribe_command)))
+    app.add_handler(CommandHandler("unsubscribe", traced_handler(unsubscribe_command)))
+    app.add_handler(CommandHandler("subscriptions", traced_handler(subscriptions_command)))
+    app.add_handler(CommandHandler("alerttime", traced_handler(alert_time_command)))
+    app.add_handler(CommandHandler("clear", traced_handler(clear_session)))
 
     # Message handler
-    app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message))
+    app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND & filters.UpdateType.MESSAGES, traced_handler(handle_message)))
 
     # Callback query handler
-    app.add_handler(CallbackQueryHandler(callback_handler))
+    app.add_handler(CallbackQueryHandler(traced_handler(callback_handler)))
 
     # PDF Document handler for AI Resume Parsing
-    app.add_handler(MessageHandler(filters.Document.PDF, handle_resume_pdf))
+    app.add_handler(MessageHandler(filters.Document.PDF, traced_handler(handle_resume_pdf)))
 
     # Error handler
     app.add_error_handler(error_handler)
+    return app
+
+def main():
+    if not TELEGRAM_BOT_TOKEN:
+        raise ValueError("TELEGRAM_BOT_TOKEN .env file mein set nahi hai!")
+    if not searcher.providers:
+        raise ValueError("RAPIDAPI_KEY .env file mein set nahi hai! (ya ADZUNA_APP_ID/ADZUNA_APP_KEY / JOB_FIXTURES_FILE)")
+
+    print("[BOT] Telegram Job Search Bot starting...")
+    load_state()
+    
+    # Start Health Check Server in background
+    print("[WEB] Starting Health Check Server...")
+    threading.Thread(target=run_health_check_server, daemon=True).start()
+    
+    print("[OK]  Press Ctrl+C to stop")
+
+    # Updates are handled one at a time unless CONCURRENT_UPDATES is set (see benchmarks/load_generator.py)
+    app = build_application(TELEGRAM_BOT_TOKEN, concurrent_updates=int(os.getenv("CONCURRENT_UPDATES", "0")) or False)
+
+    # Daily alerts: tick every minute, AlertScheduler spreads users over the window
+    app.job_queue.run_repeating(send_daily_jobs, interval=60, first=10)
+    if PREFETCH_INTERVAL_MINUTES > 0:
+        app.job_queue.run_repeating(prefetch_tick, interval=PREFETCH_INTERVAL_MINUTES * 60, first=30)
 
     print("[LIVE] Bot is running! Telegram pe /start karo")
     app.run_polling(allowed_updates=Update.ALL_TYPES)
@@ -0,0 +1,155 @@
+"""
+🔘 Callback Codec Module
+Compact, signed callback_data for inline buttons:
+  → "~" + base64url(version | action | packed fields | HMAC-SHA256[:8])
+  → Fields are packed by type (a 10-hex job hash is 5 bytes, a user id 8),
+    so every payload stays far below Telegram's 64-byte limit
+  → The HMAC makes payloads unforgeable: a page button can't be edited to
+    read another user's session
+  → parse_legacy() still understands the old "save_<hash>" style buttons on
+    messages sent before the upgrade. They are unsigned, so anyone could
+    send them: CallbackCodec.parse() accepts them only until `legacy_until`
+
+decode(), parse_legacy() and parse() return (action, args) for a dispatch table.
+"""
+
+import time
+import hmac
+import base64
+import struct
+import hashlib
+from typing import Optional
+
+VERSION = 1
+PREFIX = "~"
+MAC_BYTES = 8
+MAX_CALLBACK_BYTES = 64
+
+# action → (code, field types); codes are part of the wire format, never reuse one
+ACTIONS = {
+    "lang": (1, ("str",)),
+    "save": (2, ("hash",)),
+    "unsave": (3, ("hash",)),
+    "applied": (4, ("hash",)),
+    "status": (5, ("hash", "str")),
+    "remapp": (6, ("hash",)),
+    "page": (7, ("u8", "uid")),
+    "new_search": (8, ()),
+}
+_BY_CODE = {code: (action, fields) for action, (code, fields) in ACTIONS.items()}
+
+_U8 = struct.Struct(">B")
+_UID = struct.Struct(">q")
+HASH_BYTES = 5
+
+
+class CallbackCodec:
+    def __init__(self, secret: bytes, legacy_until: Optional[float] = None):
+        """
+        Args:
+            secret: HMAC key
+            legacy_until: Unix time until which unsigned legacy payloads are
+                still accepted (a migration window); None rejects them
+        """
+        self.secret = secret
+        self.legacy_until = legacy_until
+
+    def parse(self, data: str, now: Optional[float] = None) -> Optional[tuple[str, tuple]]:
+        """(action, args) of a signed payload, or of a legacy one inside the migration window."""
+        if data.startswith(PREFIX):
+            return self.decode(data)
+        if self.legacy_until is None or (time.time() if now is None else now) >= self.legacy_until:
+            return None
+        return parse_legacy(data)
+
+    def _mac(self, body: bytes) -> bytes:
+        return hmac.new(self.secret, body, hashlib.sha256).digest()[:MAC_BYTES]
+
+    def encode(self, action: str, *args) -> str:
+        code, fields = ACTIONS[action]
+        if len(args) != len(fields):
+            raise ValueError(f"{action} takes {len(fields)} arguments, got {len(args)}")
+        body = bytearray((VERSION, code))
+        for kind, value in zip(fields, args):
+            if kind == "hash":
+                packed = bytes.fromhex(value)
+                if len(packed) != HASH_BYTES:
+                    raise ValueError(f"job hash must be {HASH_BYTES * 2} hex digits: {value!r}")
+                body += packed
+            elif kind == "uid":
+                body += _UID.pack(int(value))
+            elif kind == "u8":
+                body += _U8.pack(value)
+            else:
+                raw = str(value).encode("utf-8")
+                body += _U8.pack(len(raw)) + raw
+        body += self._mac(bytes(body))
+        data = PREFIX + base64.urlsafe_b64encode(bytes(body)).decode("ascii").rstrip("=")
+        if len(data) > MAX_CALLBACK_BYTES:
+            raise ValueError(f"callback data for {action} is {len(data)} bytes")
+        return data
+
+    def decode(self, data: str) -> Optional[tuple[str, tuple]]:
+        """(action, args) of a payload made by encode(), or None if it is malformed or forged."""
+        if not data.startswith(PREFIX):
+            return None
+        encoded = data[len(PREFIX):]
+        try:
+            raw = base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+        except ValueError:
+            return None
+        if len(raw) < 2 + MAC_BYTES or raw[0] != VERSION:
+            return None
+        body, mac = raw[:-MAC_BYTES], raw[-MAC_BYTES:]
+        if not hmac.compare_digest(mac, self._mac(body)):
+            return None
+        entry = _BY_CODE.get(body[1])
+        if entry is None:
+            return None
+        action, fields = entry
+
+        args = []
+        offset = 2
+        try:
+            for kind in fields:
+                if kind == "hash":
+                    if offset + HASH_BYTES > len(body):
+                        return None
+                    args.append(body[offset:offset + HASH_BYTES].hex())
+                    offset += HASH_BYTES
+                elif kind == "uid":
+                    args.append(_UID.unpack_from(body, offset)[0])
+                    offset += _UID.size
+                elif kind == "u8":
+                    args.append(body[offset])
+                    offset += 1
+                else:
+                    length = body[offset]
+                    if offset + 1 + length > len(body):
+                        return None
+                    args.append(body[offset + 1:offset + 1 + length].decode("utf-8"))
+                    offset += 1 + length
+        except (IndexError, struct.error, UnicodeDecodeError):
+            return None
+        if offset != len(body):
+            return None
+        return action, tuple(args)
+
+
+def parse_legacy(data: str) -> Optional[tuple[str, tuple]]:
+    """(action, args) of an old underscore-separated callback, or None."""
+    if data == "new_search":
+        return "new_search", ()
+    action, _, rest = data.partition("_")
+    if action not in ACTIONS or not rest:
+        return None
+    if action == "status":
+        # Status keys may contain underscores, the hash never does
+        job_hash, _, status = rest.partition("_")
+        return (action, (job_hash, status)) if status else None
+    if action == "page":
+        page, _, user_id = rest.partition("_")
+        if not (page.isdigit() and user_id.lstrip("-").isdigit()):
+            return None
+        return action, (int(page), int(user_id))
+    return action, (rest,)
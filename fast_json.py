@@ -0,0 +1,128 @@
+"""
+⚡ Fast JSON Module
+One place for JSON encoding/decoding with the fastest backend installed:
+  → msgspec (typed decoding of JSearch responses, skips unused fields)
+  → orjson
+  → stdlib json (always available fallback)
+"""
+
+import os
+import json
+import logging
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # Optional dependency
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # Optional dependency
+    msgspec = None
+
+BACKEND = "orjson" if orjson else ("msgspec" if msgspec else "json")
+
+
+def loads(data) -> Any:
+    """Decode JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    if msgspec is not None:
+        return msgspec.json.decode(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode to compact UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    if msgspec is not None:
+        return msgspec.json.encode(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def load_file(path: str, default: Any = None) -> Any:
+    """Read a JSON file, returning `default` if it does not exist."""
+    if not os.path.exists(path):
+        return default
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+def dump_file(path: str, obj: Any):
+    """Write `obj` as JSON atomically (temp file + rename)."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(dumps(obj))
+    os.replace(tmp_path, path)
+
+
+# ─── Typed JSearch decoding ──────────────────────────────────────────────────
+
+if msgspec is not None:
+
+    class JSearchRecord(msgspec.Struct, omit_defaults=True):
+        """
+        The JSearch fields JobSearcher reads. Every other field of a record
+        (and there are dozens) is skipped by the decoder instead of being
+        materialized as Python objects.
+        """
+
+        job_title: Optional[str] = None
+        employer_name: Optional[str] = None
+        employer_website: Optional[str] = None
+        employer_company_type: Optional[str] = None
+        job_publisher: Optional[str] = None
+        job_employment_type: Optional[str] = None
+        job_apply_link: Optional[str] = None
+        job_google_link: Optional[str] = None
+        job_description: Optional[str] = None
+        job_is_remote: Optional[bool] = None
+        job_posted_at_datetime_utc: Optional[str] = None
+        job_city: Optional[str] = None
+        job_state: Optional[str] = None
+        job_country: Optional[str] = None
+        job_min_salary: Optional[float] = None
+        job_max_salary: Optional[float] = None
+        job_salary_currency: Optional[str] = None
+        job_salary_period: Optional[str] = None
+        job_highlights: Optional[dict[str, list[str]]] = None
+        job_required_skills: Optional[list[str]] = None
+        job_required_experience: Optional[dict[str, Any]] = None
+
+        def get(self, key: str, default=None):
+            """dict-style access, so the parser works on records and dicts alike."""
+            value = getattr(self, key, None)
+            return default if value is None else value
+
+    class JSearchResponse(msgspec.Struct):
+        status: Optional[str] = None
+        data: list[JSearchRecord] = []
+
+        def get(self, key: str, default=None):
+            value = getattr(self, key, None)
+            return default if value is None else value
+
+    _jsearch_decoder = msgspec.json.Decoder(JSearchResponse)
+else:
+    _jsearch_decoder = None
+
+
+def decode_jsearch_response(data: bytes):
+    """
+    Decode a JSearch /search response body.
+
+    With msgspec installed this returns a typed JSearchResponse whose records
+    hold only the fields the parser uses; otherwise a plain dict. Both
+    support `.get()`, which is all the parser needs.
+    """
+    if _jsearch_decoder is not None:
+        try:
+            return _jsearch_decoder.decode(data)
+        except msgspec.ValidationError as e:
+            # Schema drift upstream: fall back to untyped decoding
+            logger.warning(f"Typed JSearch decode failed, using untyped JSON: {e}")
+    return loads(data)
@@ -0,0 +1,97 @@
+"""
+🧾 HTML Format Module
+Builds Telegram HTML messages that are valid before they are sent:
+  → escape(): every dynamic string (job fields, user queries, translations)
+  → validate(): the Bot API's rules, checked locally (allowed tags, proper
+    nesting, no bare <, > or &, length limit)
+  → safe_html(): the message if it is valid, else the same text with the
+    tags stripped and escaped, so the first send never fails on parsing
+
+Translators can mangle markup ("<b>" → "< b >", "&amp;" → "&"), which is
+why translated templates go through safe_html() too.
+"""
+
+import re
+import html
+from typing import Optional
+
+MAX_MESSAGE_LENGTH = 4096
+
+# Tags the Bot API accepts in parse_mode=HTML
+ALLOWED_TAGS = frozenset({
+    "b", "strong", "i", "em", "u", "ins", "s", "strike", "del", "a", "code", "pre",
+    "tg-spoiler", "span", "blockquote", "tg-emoji",
+})
+
+_TAG_RE = re.compile(r"<(/?)([a-zA-Z][a-zA-Z0-9-]*)((?:\s+[a-zA-Z-]+=\"[^\"<>]*\")*)\s*>")
+_ENTITY_RE = re.compile(r"&(?:lt|gt|amp|quot|#\d{1,7}|#x[0-9a-fA-F]{1,6});")
+
+
+def escape(text) -> str:
+    """Text safe to place anywhere in an HTML message."""
+    return html.escape(str(text), quote=False)
+
+
+def bold(text) -> str:
+    return f"<b>{escape(text)}</b>"
+
+
+def code(text) -> str:
+    return f"<code>{escape(text)}</code>"
+
+
+def validate(text: str) -> Optional[str]:
+    """Why Telegram would reject `text` as HTML, or None if it is valid."""
+    stack = []
+    visible = 0
+    position = 0
+    for match in _TAG_RE.finditer(text):
+        error = _check_text(text[position:match.start()])
+        if error:
+            return error
+        visible += len(html.unescape(text[position:match.start()]))
+        position = match.end()
+
+        closing, name = match.group(1), match.group(2).lower()
+        if name not in ALLOWED_TAGS:
+            return f"unsupported tag <{name}>"
+        if closing:
+            if not stack or stack.pop() != name:
+                return f"unexpected </{name}>"
+        else:
+            stack.append(name)
+    error = _check_text(text[position:])
+    if error:
+        return error
+    visible += len(html.unescape(text[position:]))
+    if stack:
+        return f"unclosed <{stack[-1]}>"
+    if visible > MAX_MESSAGE_LENGTH:
+        return f"{visible} characters (max {MAX_MESSAGE_LENGTH})"
+    return None
+
+
+def _check_text(segment: str) -> Optional[str]:
+    if "<" in segment or ">" in segment:
+        return "unescaped < or >"
+    amp = segment.find("&")
+    while amp != -1:
+        if not _ENTITY_RE.match(segment, amp):
+            return "unescaped &"
+        amp = segment.find("&", amp + 1)
+    return None
+
+
+def strip_tags(text: str) -> str:
+    """Plain text of an HTML message (entities decoded)."""
+    return html.unescape(_TAG_RE.sub("", text))
+
+
+def safe_html(text: str) -> str:
+    """`text` if Telegram will accept it, else its plain text escaped (and cut to fit)."""
+    if validate(text) is None:
+        return text
+    plain = strip_tags(text)
+    if len(plain) > MAX_MESSAGE_LENGTH:
+        plain = plain[:MAX_MESSAGE_LENGTH - 1] + "…"
+    return escape(plain)
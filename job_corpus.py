@@ -0,0 +1,217 @@
+"""
+📚 Job Corpus Module
+Local full-text index of every job the searcher has parsed, so overlapping
+searches can be answered without an upstream call:
+  → SQLite FTS5 table over title, company, location, skills and description
+  → Ranked by BM25 (title and location weigh most) times a freshness decay
+    based on when the job was posted (`posted_at`)
+  → Old jobs and the overflow above `max_jobs` are pruned on ingest
+  → Each job's yearly pay in INR (salary.best_salary) is stored as a number,
+    so a pay floor is a column comparison in the same query
+
+One connection, opened on first use, is shared under a lock; the methods
+block, so async callers run them with `asyncio.to_thread`.
+"""
+
+import re
+import time
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from typing import Callable, Optional
+
+import fast_json
+import metrics
+from salary import best_salary
+
+logger = logging.getLogger(__name__)
+
+FRESH_DAYS = 30             # Jobs posted longer ago are not served (and pruned)
+HALF_LIFE_DAYS = 7.0        # Freshness weight halves every week
+CANDIDATE_FACTOR = 4        # BM25 candidates fetched per result before the freshness rerank
+PRUNE_EVERY = 200           # Ingest calls between pruning passes
+
+# bm25() weights for the FTS columns, in schema order
+COLUMN_WEIGHTS = (10.0, 2.0, 4.0, 3.0, 1.0)
+
+# Words that say nothing about which jobs match ("python jobs in pune")
+QUERY_STOPWORDS = frozenset({
+    "a", "an", "and", "at", "for", "in", "of", "the", "to", "with", "india",
+    "job", "jobs", "vacancy", "vacancies", "opening", "openings", "hiring", "near", "me",
+})
+
+_WORD_RE = re.compile(r"\w+")
+_TAG_RE = re.compile(r"<[^>]*>")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    hash TEXT NOT NULL UNIQUE,
+    posted_at REAL NOT NULL,
+    ingested_at REAL NOT NULL,
+    data BLOB NOT NULL,
+    salary_inr REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_posted_at ON jobs (posted_at);
+CREATE INDEX IF NOT EXISTS jobs_ingested_at ON jobs (ingested_at);
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5 (
+    title, company, location, skills, description,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+
+def parse_posted_at(value: str) -> Optional[float]:
+    """Epoch seconds of an ISO timestamp such as JSearch's `job_posted_at_datetime_utc`."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def match_expression(query: str) -> Optional[str]:
+    """
+    FTS5 MATCH expression requiring every meaningful query word. Words of
+    three or more characters also match as prefixes ("develop" → "developers").
+    """
+    terms = []
+    for word in _WORD_RE.findall(query.lower()):
+        if word in QUERY_STOPWORDS:
+            continue
+        terms.append(f'"{word}"*' if len(word) >= 3 else f'"{word}"')
+    return " ".join(terms) or None
+
+
+class JobCorpus:
+    def __init__(self, path: str, hash_job: Callable[[dict], str], max_jobs: int = 50_000,
+                 fresh_days: float = FRESH_DAYS, half_life_days: float = HALF_LIFE_DAYS):
+        """
+        Args:
+            path: SQLite database file (":memory:" for a throwaway corpus)
+            hash_job: Job identity, the same hash the bot uses for callbacks
+            max_jobs: Most recently ingested jobs kept
+            fresh_days: Maximum job age (by posting date) served and kept
+            half_life_days: Age at which a job's rank is halved
+        """
+        self.path = path
+        self.hash_job = hash_job
+        self.max_jobs = max_jobs
+        self.fresh_seconds = fresh_days * 86400
+        self.half_life = half_life_days * 86400
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.count = 0
+        self._ingests = 0
+        metrics.CORPUS_JOBS.set_function(lambda: self.count)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            # Files created before the salary column existed
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "salary_inr" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN salary_inr REAL")
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_salary_inr ON jobs (salary_inr)")
+            self.count = conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+            self._conn = conn
+        return self._conn
+
+    def ingest(self, jobs: list[dict], now: Optional[float] = None) -> int:
+        """Add or refresh `jobs`; returns how many were new."""
+        now = now or time.time()
+        added = 0
+        with self._lock, self._connect():
+            for job in jobs:
+                job_hash = self.hash_job(job)
+                posted_at = parse_posted_at(job.get("posted_at", "")) or now
+                data = fast_json.dumps(job)
+                salary = best_salary(job)
+                row = self._conn.execute("SELECT id FROM jobs WHERE hash = ?", (job_hash,)).fetchone()
+                if row:
+                    self._conn.execute(
+                        "UPDATE jobs SET ingested_at = ?, data = ?, salary_inr = ? WHERE id = ?",
+                        (now, data, salary, row[0]))
+                    continue
+                job_id = self._conn.execute(
+                    "INSERT INTO jobs (hash, posted_at, ingested_at, data, salary_inr) VALUES (?, ?, ?, ?, ?)",
+                    (job_hash, posted_at, now, data, salary),
+                ).lastrowid
+                description = job.get("description") or _TAG_RE.sub(" ", job.get("_raw_description", ""))
+                self._conn.execute(
+                    "INSERT INTO jobs_fts (rowid, title, company, location, skills, description) VALUES (?, ?, ?, ?, ?, ?)",
+                    (job_id, job.get("title", ""), job.get("company", ""), job.get("location", ""),
+                     job.get("skills", ""), description),
+                )
+                added += 1
+            self.count += added
+            self._ingests += 1
+            if self.count > self.max_jobs or self._ingests % PRUNE_EVERY == 0:
+                self._prune(now)
+        return added
+
+    def search(self, query: str, limit: int, now: Optional[float] = None,
+               min_salary: Optional[float] = None) -> tuple[list[dict], float]:
+        """
+        Best `limit` fresh jobs for `query`, ranked by BM25 × freshness, and
+        with `min_salary` only those paying at least that much per year in
+        INR (or not saying). Returns (jobs, ingest time of the most recently
+        fetched one).
+        """
+        expression = match_expression(query)
+        if expression is None:
+            return [], 0.0
+        now = now or time.time()
+        weights = ", ".join(str(w) for w in COLUMN_WEIGHTS)
+        with self._lock:
+            try:
+                rows = self._connect().execute(
+                    f"SELECT jobs.data, bm25(jobs_fts, {weights}) AS rank, jobs.posted_at, jobs.ingested_at "
+                    "FROM jobs_fts JOIN jobs ON jobs.id = jobs_fts.rowid "
+                    "WHERE jobs_fts MATCH ? AND jobs.posted_at >= ? "
+                    "AND (? IS NULL OR jobs.salary_inr IS NULL OR jobs.salary_inr >= ?) "
+                    "ORDER BY rank LIMIT ?",
+                    (expression, now - self.fresh_seconds, min_salary, min_salary, limit * CANDIDATE_FACTOR),
+                ).fetchall()
+            except sqlite3.OperationalError as e:
+                logger.warning(f"Corpus query {expression!r} failed: {e}")
+                return [], 0.0
+
+        # bm25() is negative (lower is better); decay it by age
+        scored = sorted(
+            rows,
+            key=lambda r: r[1] * 0.5 ** (max(now - r[2], 0.0) / self.half_life),
+        )[:limit]
+        newest = max((r[3] for r in scored), default=0.0)
+        return [fast_json.loads(r[0]) for r in scored], newest
+
+    def _prune(self, now: float):
+        """Drop jobs past the freshness window, then the least recently ingested overflow."""
+        stale = self._conn.execute(
+            "SELECT id FROM jobs WHERE posted_at < ?", (now - self.fresh_seconds,)).fetchall()
+        overflow = len(stale) - (self.count - self.max_jobs)
+        if overflow < 0:
+            stale += self._conn.execute(
+                "SELECT id FROM jobs WHERE posted_at >= ? ORDER BY ingested_at LIMIT ?",
+                (now - self.fresh_seconds, -overflow),
+            ).fetchall()
+        if not stale:
+            return
+        self._conn.executemany("DELETE FROM jobs WHERE id = ?", stale)
+        self._conn.executemany("DELETE FROM jobs_fts WHERE rowid = ?", stale)
+        self.count -= len(stale)
+        metrics.CACHE_EVICTIONS.labels("job_corpus", "prune").inc(len(stale))
+
+    def stats(self) -> dict:
+        return {"jobs": self.count, "path": self.path}
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
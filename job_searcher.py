@@ -1,192 +1,513 @@
 """
 🔍 Job Searcher Module
-Uses JSearch API (RapidAPI) to search jobs from:
-  → LinkedIn, Indeed, Glassdoor, ZipRecruiter, etc.
+Searches jobs through pluggable providers (see providers.py):
+  → JSearch API (RapidAPI): LinkedIn, Indeed, Glassdoor, ZipRecruiter, etc.
+  → Adzuna, local fixtures, ...
+Queries fan out to all providers concurrently and results are merged.
+With a JobCorpus (see job_corpus.py) every result is indexed locally and
+`local_first` searches are answered from it, refreshed in the background.
 """
 
 import httpx
 import asyncio
 import logging
 import re
-from typing import Optional
+import html
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Iterator, Optional
+
+import metrics
+from tracing import span
+from job_corpus import JobCorpus
+from providers import JobProvider, JSearchProvider
+from resilience import CircuitOpenError, QuotaTracker
+from salary import SalaryIndexCache, annotate, annualize
 
 logger = logging.getLogger(__name__)
 
-JSEARCH_BASE_URL = "https://jsearch.p.rapidapi.com"
+FALLBACK_CACHE_SIZE = 500   # Last good results, served while every provider is failing
+CORPUS_REFRESH_SECONDS = 3600  # Corpus hits older than this trigger a background upstream search
+
+DESCRIPTION_LIMIT = 400     # Max characters of description kept per job
+RAW_DESCRIPTION_KEEP = 4000 # Raw HTML kept per job until its description is rendered
+
+LOCATION_KEYWORDS = (
+    "mumbai", "delhi", "bangalore", "bengaluru", "pune", "hyderabad",
+    "chennai", "kolkata", "ahmedabad", "india", "remote", "us", "uk",
+    "noida", "gurgaon", "gurugram", "jaipur", "lucknow", "indore"
+)
+
+JOB_TYPE_MAP = {
+    "FULLTIME": "Full-time",
+    "PARTTIME": "Part-time",
+    "CONTRACTOR": "Contract",
+    "INTERN": "Internship",
+    "TEMPORARY": "Temporary"
+}
+
+SALARY_PERIOD_LABELS = {
+    "YEAR": "/year",
+    "MONTH": "/month",
+    "HOUR": "/hour",
+    "DAY": "/day",
+}
+
+CURRENCY_SYMBOLS = {
+    "INR": "₹",
+    "USD": "$",
+    "GBP": "£",
+    "EUR": "€",
+}
+
+SALARY_HIGHLIGHT_KEYWORDS = ("salary", "lakh", "₹", "$", "ctc", "per month", "annum")
+
+# Fields each view needs; None means every field.
+#   alert → subscription filters + job card + keyboard
+#   card  → everything (search results, saved jobs, trending)
+VIEW_FIELDS = {
+    "alert": frozenset({
+        "title", "company", "location", "salary", "salary_min", "salary_max",
+        "salary_currency", "description", "job_type", "apply_url", "company_url",
+        "rating", "posted", "experience_months", "is_remote",
+    }),
+    "card": None,
+}
+_TAG_RE = re.compile(r"<[^>]*>")
+
+
+def clean_description(text: str, limit: int = DESCRIPTION_LIMIT) -> str:
+    """
+    Strip HTML, decode entities, drop Markdown-breaking characters and cut the
+    text at the last sentence end within `limit` characters.
+
+    Only a prefix of the input is cleaned first (descriptions are often
+    5-10 KB and only the first `limit` characters are kept); the full text is
+    processed only if that prefix turns out too short.
+    """
+    if not text:
+        return "Description not available"
+
+    window = limit * 4
+    if len(text) > window:
+        cut = window
+        # Don't cut inside a tag, entity or word
+        tag_start = text.rfind("<", 0, cut)
+        if tag_start > text.rfind(">", 0, cut):
+            cut = tag_start
+        space = text.rfind(" ", 0, cut)
+        if space > 0:
+            cut = space
+        cleaned = _clean_text(text[:cut])
+        if len(cleaned) <= limit + 1:
+            cleaned = _clean_text(text)
+    else:
+        cleaned = _clean_text(text)
+
+    if len(cleaned) <= limit:
+        return cleaned or "Description not available"
+
+    # Cut after the last full sentence that fits
+    end = cleaned.rfind(". ", 0, limit + 1)
+    if end > 0:
+        return cleaned[:end + 1]
+    return cleaned[:limit]
+
+
+def ensure_description(job: dict) -> dict:
+    """
+    Clean a job's description if it was parsed lazily. Call this before
+    rendering a job; parsing leaves the raw HTML in `_raw_description` so
+    jobs that are never shown never pay for cleaning.
+    """
+    raw = job.pop("_raw_description", None)
+    if raw is not None:
+        job["description"] = clean_description(raw)
+    return job
+
+
+def _clean_text(text: str) -> str:
+    # Chained str.replace and split/join are several times faster than
+    # str.translate or a \s+ regex on these inputs
+    text = _TAG_RE.sub(" ", text)
+    if "&" in text:
+        text = html.unescape(text)
+    # Remove special characters that break Markdown
+    text = text.replace("*", "").replace("`", "").replace("_", " ")
+    return " ".join(text.split())
 
 
 class JobSearcher:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: Optional[str] = None, providers: Optional[list[JobProvider]] = None,
+                 corpus: Optional[JobCorpus] = None, governor=None):
+        """
+        Args:
+            api_key: RapidAPI key; adds a JSearch provider when given
+            providers: Extra providers to fan out to (Adzuna, fixtures, ...)
+            corpus: Local index that stores every result and can answer searches
+            governor: QuotaGovernor (see throttle.py) that holds searches back
+                from the upstream as its quota runs out
+        """
         self.api_key = api_key
-        self.headers = {
-            "X-RapidAPI-Key": api_key,
-            "X-RapidAPI-Host": "jsearch.p.rapidapi.com"
-        }
-
-    async def search_jobs(self, query: str, num_results: int = 8) -> list[dict]:
+        self.providers: list[JobProvider] = []
+        if api_key:
+            self.providers.append(JSearchProvider(api_key, self.parse_jobs))
+        self.providers.extend(providers or [])
+        self._fallback_cache: OrderedDict[str, list[dict]] = OrderedDict()
+        self.salary_indexes = SalaryIndexCache(FALLBACK_CACHE_SIZE)  # Pay-sorted views of result lists
+        self.corpus = corpus
+        self.governor = governor
+        self._refreshed: OrderedDict[str, float] = OrderedDict()  # cache key → last upstream search
+        self._refresh_tasks: dict[str, asyncio.Task] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop = None
+
+    @property
+    def quota(self) -> QuotaTracker:
+        """RapidAPI quota of the JSearch provider (empty tracker if there is none)."""
+        for provider in self.providers:
+            if isinstance(provider, JSearchProvider):
+                return provider.quota
+        return QuotaTracker()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Shared HTTP client, so connections are reused across searches."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(limits=httpx.Limits(max_connections=50, max_keepalive_connections=20))
+            self._client_loop = loop
+        return self._client
+
+    async def search_jobs(self, query: str, num_results: int = 8, view: str = "card", local_first: bool = False,
+                          min_salary: Optional[float] = None) -> list[dict]:
         """
-        Search for jobs using JSearch API.
+        Search for jobs across all providers.
         
         Args:
             query: Job search query (e.g., "Python Developer Mumbai")
             num_results: Number of results to fetch
+            view: Which fields to build, "card" (all) or "alert" (see VIEW_FIELDS)
+            local_first: Answer from the results of the same search if it went
+                upstream in the last CORPUS_REFRESH_SECONDS, else from the
+                corpus when it has `num_results` fresh matches (refreshing the
+                query upstream in the background). Implied while the governor
+                is not in normal mode; in cache-only mode partial corpus
+                results are returned too
+            min_salary: Only jobs paying at least this much (INR/year, see
+                salary.py; unknown pay passes), highest paid first. The
+                corpus applies it in SQL and still returns `num_results`
+                jobs, other sources are filtered afterwards and may return fewer
             
         Returns:
             List of job dictionaries with title, company, location, salary, description
+
+        Every provider runs concurrently and is given up to its own `deadline`;
+        whatever arrived in time is merged and deduplicated. If no provider
+        answered, the last good results for the query are returned.
+
+        Descriptions are cleaned lazily: call `ensure_description()` on a job
+        before rendering it.
         """
         # Enhance query for Indian market
-        enhanced_query = self._enhance_query(query)
-        
-        params = {
-            "query": enhanced_query,
-            "page": "1",
-            "num_pages": "1",
-            "date_posted": "all",
-        }
+        with span("enhance_query"):
+            enhanced_query = self._enhance_query(query)
+        cache_key = f"{view}|{enhanced_query.lower()}"
+
+        mode = self.governor.mode() if self.governor is not None else "normal"
+        if local_first or mode != "normal":
+            jobs = self._recent_results(cache_key, num_results)
+            if jobs:
+                metrics.CORPUS_LOOKUPS.labels("recent").inc()
+                return self._salary_floor(jobs, min_salary)
+            if self.corpus is not None and view == "card":
+                min_results = 1 if mode == "cache_only" else num_results
+                jobs = await self._search_corpus(query, enhanced_query, cache_key, num_results, min_results, min_salary)
+                if jobs:
+                    return self._salary_floor(jobs, min_salary)
+            metrics.CORPUS_LOOKUPS.labels("miss").inc()
+
+        jobs = await self._search_upstream(enhanced_query, cache_key, num_results, view)
+        return self._salary_floor(jobs, min_salary)
+
+    def _salary_floor(self, jobs: list[dict], min_salary: Optional[float]) -> list[dict]:
+        """`jobs` paying at least `min_salary`, highest paid first (see salary_indexes)."""
+        return self.salary_indexes.get(jobs).at_least(min_salary, by_salary=True) if min_salary else jobs
+
+    async def _search_upstream(self, enhanced_query: str, cache_key: str, num_results: int, view: str) -> list[dict]:
+        if not self.providers:
+            logger.error("No job search providers configured")
+            return []
+        if self.governor is not None and not self.governor.allow_upstream():
+            metrics.UPSTREAM_SKIPPED.inc()
+            return self._cached_results(cache_key, num_results)
+
+        client = self._get_client()
+        results = await asyncio.gather(
+            *(self._run_provider(p, client, enhanced_query, num_results, view) for p in self.providers)
+        )
+        answered = [jobs for jobs in results if jobs is not None]
+        if not answered:
+            return self._cached_results(cache_key, num_results)
+
+        merged = self._merge(answered)
+        parsed_jobs = merged[:num_results]
+        metrics.SEARCH_RESULTS.observe(len(parsed_jobs))
+        if not parsed_jobs:
+            return []
 
+        self._refreshed[cache_key] = time.monotonic()
+        self._refreshed.move_to_end(cache_key)
+        while len(self._refreshed) > FALLBACK_CACHE_SIZE:
+            self._refreshed.popitem(last=False)
+        if self.corpus is not None and view == "card":
+            # Shallow copies: the originals get their descriptions cleaned while the thread runs
+            try:
+                await asyncio.to_thread(self.corpus.ingest, [dict(job) for job in merged])
+            except Exception as e:
+                logger.error(f"Corpus ingest failed: {e}")
+
+        self._fallback_cache[cache_key] = parsed_jobs
+        self._fallback_cache.move_to_end(cache_key)
+        while len(self._fallback_cache) > FALLBACK_CACHE_SIZE:
+            self._fallback_cache.popitem(last=False)
+
+        return parsed_jobs
+
+    async def _run_provider(self, provider: JobProvider, client: httpx.AsyncClient, query: str, num_results: int, view: str) -> Optional[list[dict]]:
+        """Run one provider within its deadline. Returns None if it failed."""
+        start = time.perf_counter()
+        outcome = "error"
         try:
-            async with httpx.AsyncClient(timeout=20.0) as client:
-                response = await client.get(
-                    f"{JSEARCH_BASE_URL}/search",
-                    headers=self.headers,
-                    params=params
-                )
-                response.raise_for_status()
-                data = response.json()
-
-        except httpx.TimeoutException:
-            logger.error("JSearch API timeout")
-            return []
+            jobs = await asyncio.wait_for(provider.search(client, query, num_results, view), timeout=provider.deadline)
+            outcome = "ok"
+            return jobs
+        except CircuitOpenError:
+            outcome = "circuit_open"
+            logger.warning(f"{provider.name} circuit open, skipping")
+        except (asyncio.TimeoutError, httpx.TimeoutException):
+            outcome = "timeout"
+            logger.error(f"{provider.name} API timeout")
         except httpx.HTTPStatusError as e:
-            logger.error(f"JSearch API HTTP error: {e.response.status_code}")
-            return []
+            logger.error(f"{provider.name} API HTTP error: {e.response.status_code}")
         except Exception as e:
-            logger.error(f"JSearch API error: {e}")
-            return []
+            logger.error(f"{provider.name} API error: {e}")
+        finally:
+            metrics.UPSTREAM_LATENCY.labels(provider.name, outcome).observe(time.perf_counter() - start)
+        return None
 
-        if data.get("status") != "OK":
-            logger.error(f"JSearch API status not OK: {data.get('status')}")
+    def _merge(self, result_lists: list[list[dict]]) -> list[dict]:
+        """
+        Interleave provider results (keeping each provider's ranking) and drop
+        duplicates of the same title at the same company.
+        """
+        merged = []
+        seen = set()
+        longest = max((len(jobs) for jobs in result_lists), default=0)
+        for i in range(longest):
+            for jobs in result_lists:
+                if i >= len(jobs):
+                    continue
+                job = jobs[i]
+                key = (job.get("title", "").lower().strip(), job.get("company", "").lower().strip())
+                if key in seen:
+                    continue
+                seen.add(key)
+                merged.append(job)
+        return merged
+
+    async def _search_corpus(self, query: str, enhanced_query: str, cache_key: str, num_results: int,
+                             min_results: Optional[int] = None, min_salary: Optional[float] = None) -> list[dict]:
+        """
+        Corpus results for `query` if there are at least `min_results`
+        (default `num_results`), else [].
+        A hit whose jobs were all fetched over CORPUS_REFRESH_SECONDS ago
+        schedules one background upstream search for the query.
+        """
+        try:
+            with span("corpus_search"):
+                jobs, newest = await asyncio.to_thread(self.corpus.search, query, num_results, min_salary=min_salary)
+        except Exception as e:
+            logger.error(f"Corpus search failed: {e}")
             return []
+        if not jobs or len(jobs) < (min_results or num_results):
+            return []
+        metrics.CORPUS_LOOKUPS.labels("hit").inc()
+
+        now = datetime.now(timezone.utc)
+        for job in jobs:
+            job["posted"] = self._format_posted_date(job.get("posted_at", ""), now)
+
+        stale = time.time() - newest > CORPUS_REFRESH_SECONDS
+        if stale and not self._fetched_within(cache_key, CORPUS_REFRESH_SECONDS) and cache_key not in self._refresh_tasks:
+            task = asyncio.create_task(self._refresh(enhanced_query, cache_key, num_results))
+            self._refresh_tasks[cache_key] = task
+            task.add_done_callback(lambda _t: self._refresh_tasks.pop(cache_key, None))
+        return jobs
+
+    async def _refresh(self, enhanced_query: str, cache_key: str, num_results: int):
+        try:
+            jobs = await self._search_upstream(enhanced_query, cache_key, num_results, "card")
+            metrics.CORPUS_REFRESHES.labels("ok" if jobs else "empty").inc()
+        except Exception as e:
+            metrics.CORPUS_REFRESHES.labels("error").inc()
+            logger.error(f"Background refresh of {enhanced_query!r} failed: {e}")
+
+    async def drain(self, timeout: float = 10.0):
+        """Wait (up to `timeout`) for background refreshes, e.g. before shutting down."""
+        if self._refresh_tasks:
+            await asyncio.wait(list(self._refresh_tasks.values()), timeout=timeout)
+
+    def _cached_results(self, cache_key: str, num_results: int) -> list[dict]:
+        """
+        Last good results for a query (used when the upstream is failing).
+        The cached list itself when it fits, so its salary index is reused:
+        don't modify it.
+        """
+        jobs = self._fallback_cache.get(cache_key, [])
+        return jobs if len(jobs) <= num_results else jobs[:num_results]
 
-        raw_jobs = data.get("data", [])
-        if not raw_jobs:
+    def _fetched_within(self, cache_key: str, seconds: float) -> bool:
+        fetched = self._refreshed.get(cache_key)
+        return fetched is not None and time.monotonic() - fetched < seconds
+
+    def _recent_results(self, cache_key: str, num_results: int) -> list[dict]:
+        """The last upstream results for a query if they are fresh and complete, else []."""
+        if not self._fetched_within(cache_key, CORPUS_REFRESH_SECONDS):
             return []
+        jobs = self._cached_results(cache_key, num_results)
+        return jobs if len(jobs) >= num_results else []
 
-        parsed_jobs = []
-        for job in raw_jobs[:num_results]:
-            parsed = self._parse_job(job)
-            if parsed:
-                parsed_jobs.append(parsed)
+    def last_fetched(self, query: str, view: str = "card") -> Optional[float]:
+        """Seconds since `query` last went upstream for `view`, or None."""
+        fetched = self._refreshed.get(f"{view}|{self._enhance_query(query).lower()}")
+        return None if fetched is None else time.monotonic() - fetched
 
-        return parsed_jobs
+    def stats(self) -> dict:
+        """Per-provider health and quota (and corpus size), for the health endpoint."""
+        stats = {provider.name: provider.stats() for provider in self.providers}
+        if self.corpus is not None:
+            stats["corpus"] = self.corpus.stats()
+        return stats
 
     def _enhance_query(self, query: str) -> str:
         """Enhance search query for better results."""
         query = query.strip()
         
         # Add "India" if no location mentioned and query is short
-        location_keywords = [
-            "mumbai", "delhi", "bangalore", "bengaluru", "pune", "hyderabad",
-            "chennai", "kolkata", "ahmedabad", "india", "remote", "us", "uk",
-            "noida", "gurgaon", "gurugram", "jaipur", "lucknow", "indore"
-        ]
-        
         query_lower = query.lower()
-        has_location = any(loc in query_lower for loc in location_keywords)
+        has_location = any(loc in query_lower for loc in LOCATION_KEYWORDS)
         
         if not has_location and len(query.split()) <= 3:
             query = f"{query} India"
         
         return query
 
-    def _parse_job(self, raw: dict) -> Optional[dict]:
-        """Parse raw API response into clean job dict."""
+    def parse_jobs(self, records: list[dict], view: str = "card") -> list[dict]:
+        """
+        Parse a batch of raw JSearch records.
+
+        `now` is computed once for the whole batch, only the fields needed by
+        `view` (see VIEW_FIELDS) are built, and descriptions are left raw
+        until `ensure_description()` is called on a job that gets rendered.
+        """
+        now = datetime.now(timezone.utc)
+        fields = VIEW_FIELDS.get(view)
+        parsed_jobs = []
+        for raw in records:
+            with span("parse_job"):
+                parsed = self._parse_job(raw, now=now, fields=fields)
+            if parsed:
+                parsed_jobs.append(parsed)
+        return parsed_jobs
+
+    def _parse_job(self, raw: dict, now: Optional[datetime] = None, fields: Optional[frozenset] = None) -> Optional[dict]:
+        """
+        Parse raw API response into clean job dict.
+
+        Without `now`/`fields` (single-job use) every field is built and the
+        description is cleaned right away.
+        """
         try:
-            title = raw.get("job_title", "").strip()
+            get = raw.get
+            title = (get("job_title") or "").strip()
             if not title:
                 return None
 
-            company = raw.get("employer_name", "N/A").strip()
-            
-            # Build location
-            city = raw.get("job_city", "")
-            state = raw.get("job_state", "")
-            country = raw.get("job_country", "")
-            is_remote = raw.get("job_is_remote", False)
+            job = {
+                "title": title,
+                "company": (get("employer_name") or "N/A").strip(),
+            }
+            want = fields.__contains__ if fields is not None else (lambda _field: True)
 
+            # Build location
+            is_remote = get("job_is_remote") or False
+            country = get("job_country") or ""
             if is_remote:
                 location = "🏠 Remote"
                 if country:
                     location += f" ({country})"
             else:
-                parts = [p for p in [city, state, country] if p]
+                parts = [p for p in (get("job_city"), get("job_state"), country) if p]
                 location = ", ".join(parts) if parts else "N/A"
+            job["location"] = location
+            job["is_remote"] = is_remote
 
             # Salary parsing
-            salary = self._parse_salary(raw)
-
-            # Description
-            description = raw.get("job_description", "")
-            description = self._clean_description(description)
+            if want("salary"):
+                job["salary"] = self._parse_salary(raw)
+            job["salary_min"], job["salary_max"] = self._annual_salary_range(raw)
+            job["salary_currency"] = get("job_salary_currency") or "INR"
+            annotate(job, self._salary_highlights(raw))
+
+            # Description (cleaned lazily when parsing a batch)
+            description = get("job_description") or ""
+            if now is None:
+                job["description"] = self._clean_description(description)
+            else:
+                job["_raw_description"] = description[:RAW_DESCRIPTION_KEEP]
 
             # Job type
-            employment_type = raw.get("job_employment_type", "")
-            job_type_map = {
-                "FULLTIME": "Full-time",
-                "PARTTIME": "Part-time",
-                "CONTRACTOR": "Contract",
-                "INTERN": "Internship",
-                "TEMPORARY": "Temporary"
-            }
-            job_type = job_type_map.get(employment_type, employment_type or "Full-time")
+            employment_type = get("job_employment_type") or ""
+            job["job_type"] = JOB_TYPE_MAP.get(employment_type, employment_type or "Full-time")
 
             # Apply URL
-            apply_url = (
-                raw.get("job_apply_link") or
-                raw.get("job_google_link") or
-                ""
-            )
+            job["apply_url"] = get("job_apply_link") or get("job_google_link") or ""
 
             # Company URL / logo
-            company_url = raw.get("employer_website", "") or ""
+            company_url = get("employer_website") or ""
             if company_url and not company_url.startswith("http"):
                 company_url = f"https://{company_url}"
+            job["company_url"] = company_url
 
             # Rating
-            rating = raw.get("employer_company_type", "")
+            job["rating"] = get("employer_company_type") or ""
 
             # Posted date
-            posted_at = raw.get("job_posted_at_datetime_utc", "")
-            posted = self._format_posted_date(posted_at)
+            posted_at = get("job_posted_at_datetime_utc") or ""
+            if want("posted"):
+                job["posted"] = self._format_posted_date(posted_at, now)
+            job["posted_at"] = posted_at
 
             # Required skills
-            skills = raw.get("job_required_skills", []) or []
-            skills_str = ", ".join(skills[:5]) if skills else ""
+            if want("skills"):
+                skills = get("job_required_skills") or []
+                job["skills"] = ", ".join(skills[:5]) if skills else ""
 
             # Experience
-            experience = raw.get("job_required_experience", {})
-            exp_years = experience.get("required_experience_in_months", 0)
-            if exp_years:
-                exp_str = f"{exp_years // 12}+ years" if exp_years >= 12 else f"{exp_years} months"
-            else:
-                exp_str = ""
+            experience = get("job_required_experience") or {}
+            exp_months = experience.get("required_experience_in_months") or 0
+            if want("experience"):
+                if exp_months:
+                    job["experience"] = f"{exp_months // 12}+ years" if exp_months >= 12 else f"{exp_months} months"
+                else:
+                    job["experience"] = ""
+            job["experience_months"] = exp_months
 
-            return {
-                "title": title,
-                "company": company,
-                "location": location,
-                "salary": salary,
-                "description": description,
-                "job_type": job_type,
-                "apply_url": apply_url,
-                "company_url": company_url,
-                "rating": rating,
-                "posted": posted,
-                "skills": skills_str,
-                "experience": exp_str,
-                "is_remote": is_remote,
-                "source": self._get_source(raw),
-            }
+            if want("source"):
+                job["source"] = self._get_source(raw)
+
+            return job
 
         except Exception as e:
             logger.warning(f"Failed to parse job: {e}")
@@ -197,24 +518,11 @@ class JobSearcher:
         # Try min/max salary fields
         min_salary = raw.get("job_min_salary")
         max_salary = raw.get("job_max_salary")
-        salary_currency = raw.get("job_salary_currency", "INR")
+        salary_currency = raw.get("job_salary_currency") or "INR"
         salary_period = raw.get("job_salary_period", "")
 
-        period_map = {
-            "YEAR": "/year",
-            "MONTH": "/month",
-            "HOUR": "/hour",
-            "DAY": "/day",
-        }
-        period_str = period_map.get(salary_period, "/year") if salary_period else ""
-
-        currency_symbols = {
-            "INR": "₹",
-            "USD": "$",
-            "GBP": "£",
-            "EUR": "€",
-        }
-        symbol = currency_symbols.get(salary_currency, salary_currency)
+        period_str = SALARY_PERIOD_LABELS.get(salary_period, "/year") if salary_period else ""
+        symbol = CURRENCY_SYMBOLS.get(salary_currency, salary_currency)
 
         if min_salary and max_salary:
             min_f = self._format_number(min_salary, salary_currency)
@@ -226,13 +534,24 @@ class JobSearcher:
             return f"Up to {symbol}{self._format_number(max_salary, salary_currency)}{period_str}"
 
         # Try parsing from highlights
-        highlights = raw.get("job_highlights", {})
+        for item in self._salary_highlights(raw):
+            return item.strip()
+
+        return "Not mentioned"
+
+    def _salary_highlights(self, raw: dict) -> Iterator[str]:
+        """Highlight lines that talk about pay."""
+        highlights = raw.get("job_highlights") or {}
         for section in highlights.values():
             for item in (section or []):
-                if any(kw in item.lower() for kw in ["salary", "lakh", "₹", "$", "ctc", "per month", "annum"]):
-                    return item.strip()
+                item_lower = item.lower()
+                if any(kw in item_lower for kw in SALARY_HIGHLIGHT_KEYWORDS):
+                    yield item
 
-        return "Not mentioned"
+    def _annual_salary_range(self, raw: dict) -> tuple[Optional[float], Optional[float]]:
+        """Structured min/max salary scaled to a yearly figure (job's own currency)."""
+        period = raw.get("job_salary_period")
+        return annualize(raw.get("job_min_salary"), period), annualize(raw.get("job_max_salary"), period)
 
     def _format_number(self, num: float, currency: str) -> str:
         """Format number with Indian/international notation."""
@@ -254,35 +573,15 @@ class JobSearcher:
 
     def _clean_description(self, text: str) -> str:
         """Clean and truncate job description."""
-        if not text:
-            return "Description not available"
-
-        # Remove HTML tags
-        text = re.sub(r"<[^>]+>", "", text)
-        # Remove extra whitespace
-        text = re.sub(r"\s+", " ", text).strip()
-        # Remove special characters that break Markdown
-        text = text.replace("*", "").replace("`", "").replace("_", " ")
-
-        # Get first meaningful paragraph (max 400 chars)
-        sentences = text.split(". ")
-        result = ""
-        for s in sentences:
-            if len(result) + len(s) > 400:
-                break
-            result += s + ". "
-
-        return result.strip() or text[:400]
-
-    def _format_posted_date(self, date_str: str) -> str:
+        return clean_description(text)
+
+    def _format_posted_date(self, date_str: str, now: Optional[datetime] = None) -> str:
         """Format posted date to human readable."""
         if not date_str:
             return ""
         try:
-            from datetime import datetime, timezone
             posted = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-            now = datetime.now(timezone.utc)
-            diff = now - posted
+            diff = (now or datetime.now(timezone.utc)) - posted
             days = diff.days
             if days == 0:
                 return "Aaj posted"
@@ -0,0 +1,170 @@
+"""
+🐕 Event-Loop Watchdog
+Catches code that blocks the asyncio event loop:
+  → A heartbeat task measures loop lag continuously (metrics histogram)
+  → A monitor thread notices when the heartbeat stops; it captures the loop
+    thread's stack while it is still blocked, names the handler and logs it
+  → Debug mode: an audit hook flags synchronous file opens, blocking socket
+    calls, subprocesses and time.sleep made on the loop thread
+
+Configured from the environment:
+  WATCHDOG_THRESHOLD_MS   stall threshold            (default: 250)
+  WATCHDOG_DEBUG          1 to enable the audit hook (default: off)
+"""
+
+import os
+import sys
+import time
+import asyncio
+import logging
+import threading
+import traceback
+from collections import deque
+from typing import Optional
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+# Code in these files is ours; the outermost frame from one of them names the handler
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+# Wrappers that sit around every handler and would otherwise be "the handler"
+INFRA_FILES = {os.path.join(APP_DIR, name) for name in ("loop_watchdog.py", "tracing.py")}
+
+# Audit events that mean blocking work when raised on the loop thread
+BLOCKING_EVENTS = {"open", "socket.connect", "socket.getaddrinfo", "subprocess.Popen", "time.sleep"}
+# Imports open module files; they're one-time costs and would drown out everything else
+MODULE_SUFFIXES = (".py", ".pyc", ".so", ".pyd", ".pth")
+
+
+def _app_frames(frame) -> list:
+    """Frames (innermost first) whose code lives in the bot's own modules."""
+    frames = []
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(APP_DIR) and "benchmarks" not in filename and filename not in INFRA_FILES:
+            frames.append(frame)
+        frame = frame.f_back
+    return frames
+
+
+def describe_frame(frame) -> str:
+    return f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno} in {frame.f_code.co_name}"
+
+
+class LoopWatchdog:
+    def __init__(self, threshold: float = 0.25, interval: float = 0.05, debug: bool = False, history: int = 20):
+        self.threshold = threshold
+        self.interval = interval
+        self.debug = debug
+        self.recent_stalls = deque(maxlen=history)
+        self.blocking_calls = {}  # {(event, call site): count}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._last_beat = time.monotonic()
+        self._stalled = False
+        self._stop = threading.Event()
+        self._in_hook = threading.local()
+
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """Start watching `loop` (default: the running loop). Call from the loop thread."""
+        self._loop = loop or asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._loop.create_task(self._heartbeat(), name="watchdog-heartbeat")
+        threading.Thread(target=self._monitor, name="LoopWatchdog", daemon=True).start()
+        if self.debug:
+            sys.addaudithook(self._audit)
+        logger.info(f"Loop watchdog started (threshold {self.threshold * 1000:.0f} ms, debug={self.debug})")
+
+    def stop(self):
+        self._stop.set()
+
+    async def _heartbeat(self):
+        while not self._stop.is_set():
+            start = time.monotonic()
+            self._last_beat = start
+            await asyncio.sleep(self.interval)
+            lag = time.monotonic() - start - self.interval
+            metrics.EVENT_LOOP_LAG.observe(max(0.0, lag))
+            self._last_beat = time.monotonic()
+
+    def _monitor(self):
+        while not self._stop.wait(self.interval):
+            blocked_for = time.monotonic() - self._last_beat - self.interval
+            if blocked_for < self.threshold:
+                self._stalled = False
+                continue
+            if self._stalled:
+                continue  # Already reported this stall
+            self._stalled = True
+            self._report_stall(blocked_for)
+
+    def _report_stall(self, blocked_for: float):
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return
+        stack = "".join(traceback.format_stack(frame))
+        app_frames = _app_frames(frame)
+        handler = app_frames[-1].f_code.co_name if app_frames else "unknown"
+        task = asyncio.current_task(self._loop)  # Plain dict lookup, safe from this thread
+        stall = {
+            "at": time.time(),
+            "blocked_ms": round(blocked_for * 1000),
+            "handler": handler,
+            "task": task.get_name() if task else None,
+            "location": describe_frame(app_frames[0]) if app_frames else describe_frame(frame),
+            "stack": stack,
+        }
+        self.recent_stalls.append(stall)
+        metrics.LOOP_STALLS.labels(handler).inc()
+        logger.warning(
+            f"Event loop blocked for {stall['blocked_ms']}+ ms in {handler} "
+            f"(at {stall['location']}, task {stall['task']}):\n{stack}"
+        )
+
+    def _audit(self, event: str, args: tuple):
+        if event not in BLOCKING_EVENTS or threading.get_ident() != self._loop_thread_id:
+            return
+        if getattr(self._in_hook, "active", False):
+            return
+        if event == "open" and isinstance(args[0], str) and args[0].endswith(MODULE_SUFFIXES):
+            return
+        if event == "socket.connect" and args[0].gettimeout() == 0.0:
+            return  # Non-blocking socket, i.e. asyncio's own connect
+        if self._loop is None or not self._loop.is_running():
+            return
+
+        self._in_hook.active = True
+        try:
+            frames = _app_frames(sys._getframe(1))
+            if not frames:
+                return  # Library internals (e.g. asyncio, httpx) rather than our code
+            site = describe_frame(frames[0])
+            key = (event, site)
+            count = self.blocking_calls.get(key, 0) + 1
+            self.blocking_calls[key] = count
+            metrics.BLOCKING_CALLS.labels(event).inc()
+            if count == 1:  # Log each call site once
+                detail = args[0] if event in ("open", "subprocess.Popen") else ""
+                logger.warning(f"Blocking {event} {detail} on the event loop thread at {site} (handler {frames[-1].f_code.co_name})")
+        finally:
+            self._in_hook.active = False
+
+    def stats(self) -> dict:
+        """Recent stalls (without stacks) and blocking call sites, for the health endpoint."""
+        return {
+            "threshold_ms": round(self.threshold * 1000),
+            "recent_stalls": [{k: v for k, v in s.items() if k != "stack"} for s in self.recent_stalls],
+            "blocking_calls": [
+                {"event": event, "site": site, "count": count}
+                for (event, site), count in sorted(self.blocking_calls.items(), key=lambda i: -i[1])
+            ],
+        }
+
+
+def configure_from_env() -> LoopWatchdog:
+    return LoopWatchdog(
+        threshold=int(os.getenv("WATCHDOG_THRESHOLD_MS", "250")) / 1000,
+        debug=os.getenv("WATCHDOG_DEBUG", "") in ("1", "true", "yes"),
+    )
@@ -0,0 +1,299 @@
+"""
+📊 Metrics Module
+Tiny Prometheus-compatible metrics (no client library needed):
+  → Counter, Gauge and Histogram with label support
+  → Text exposition for a /metrics HTTP endpoint
+
+Recording an event is a dict lookup plus an addition (a bisect for
+histograms), i.e. ~1 µs; all formatting happens at scrape time.
+"""
+
+import time
+import threading
+from bisect import bisect_left
+from typing import Callable, Optional
+
+# Default latency buckets (seconds), from 1 ms to 30 s
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), registry: Optional["Registry"] = None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+        (registry if registry is not None else REGISTRY).register(self)
+
+    def labels(self, *values):
+        """Child metric for one combination of label values (cached)."""
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.get(values)
+                if child is None:
+                    child = self._children[values] = self._new_child()
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def collect(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in list(self._children.items()):
+            lines.extend(child.samples(self.name, self.labelnames, values))
+        return lines
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+    def samples(self, name, labelnames, values):
+        return [f"{name}{_format_labels(labelnames, values)} {_format_value(self.value)}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        """Increment the unlabelled counter."""
+        self.labels().inc(amount)
+
+
+class _GaugeChild:
+    __slots__ = ("value", "function")
+
+    def __init__(self):
+        self.value = 0.0
+        self.function = None
+
+    def set(self, value: float):
+        self.value = value
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.value -= amount
+
+    def set_function(self, function: Callable[[], Optional[float]]):
+        """Compute the value at scrape time instead of storing it."""
+        self.function = function
+
+    def samples(self, name, labelnames, values):
+        value = self.value
+        if self.function is not None:
+            try:
+                value = self.function()
+            except Exception:
+                value = None
+            if value is None:
+                return []
+        return [f"{name}{_format_labels(labelnames, values)} {_format_value(value)}"]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float):
+        self.labels().set(value)
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1.0):
+        self.labels().dec(amount)
+
+    def set_function(self, function: Callable[[], Optional[float]]):
+        self.labels().set_function(function)
+
+
+class _HistogramChild:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def time(self):
+        """Context manager observing the elapsed seconds of its block."""
+        return _Timer(self)
+
+    def samples(self, name, labelnames, values):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            cumulative += count
+            le = f'le="{_format_value(bound) if bound == float("inf") else bound}"'
+            lines.append(f"{name}_bucket{_format_labels(labelnames, values, le)} {cumulative}")
+        lines.append(f"{name}_sum{_format_labels(labelnames, values)} {_format_value(self.sum)}")
+        lines.append(f"{name}_count{_format_labels(labelnames, values)} {self.count}")
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS, registry=None):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def time(self):
+        return self.labels().time()
+
+
+class _Timer:
+    __slots__ = ("child", "start")
+
+    def __init__(self, child):
+        self.child = child
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.child.observe(time.perf_counter() - self.start)
+        return False
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: list[_Metric] = []
+
+    def register(self, metric: _Metric):
+        self._metrics.append(metric)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (0.0.4)."""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# ─── Bot metrics ─────────────────────────────────────────────────────────────
+# Defined here so every module records into the same series.
+
+UPSTREAM_LATENCY = Histogram(
+    "jobbot_upstream_request_seconds", "Job provider search latency", ("provider", "outcome"))
+UPSTREAM_STATUS = Counter(
+    "jobbot_upstream_responses_total", "Job provider HTTP responses by status code", ("provider", "status"))
+SEARCH_RESULTS = Histogram(
+    "jobbot_search_results", "Jobs returned per search", buckets=(0, 1, 3, 5, 8, 10, 20, 50))
+UPSTREAM_QUOTA_REMAINING = Gauge(
+    "jobbot_rapidapi_quota_remaining", "Remaining RapidAPI requests reported by JSearch")
+
+TRANSLATIONS = Counter(
+    "jobbot_translations_total", "translate_text calls by cache result", ("result",))
+TRANSLATION_LATENCY = Histogram(
+    "jobbot_translation_seconds", "Latency of uncached translations")
+
+CARD_RENDER_LATENCY = Histogram(
+    "jobbot_format_job_card_seconds", "format_job_card latency (including translation)")
+
+TELEGRAM_REQUESTS = Histogram(
+    "jobbot_telegram_request_seconds", "Telegram Bot API call latency", ("method", "status"))
+
+RESUME_STAGE_LATENCY = Histogram(
+    "jobbot_resume_stage_seconds", "Resume PDF handling latency per stage", ("stage",))
+
+ALERTS_SENT = Counter(
+    "jobbot_alerts_total", "Daily alert subscriptions processed by outcome", ("outcome",))
+ALERT_USERS_PER_SECOND = Gauge(
+    "jobbot_alert_users_per_second", "Users processed per second in the last alert tick")
+
+EVENT_LOOP_LAG = Histogram(
+    "jobbot_event_loop_lag_seconds", "Event loop scheduling lag measured by the watchdog heartbeat",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0))
+LOOP_STALLS = Counter(
+    "jobbot_event_loop_stalls_total", "Event loop stalls over the watchdog threshold by handler", ("handler",))
+BLOCKING_CALLS = Counter(
+    "jobbot_blocking_calls_total", "Blocking calls made on the event loop thread (watchdog debug mode)", ("event",))
+
+SESSIONS_LIVE = Gauge(
+    "jobbot_sessions_live", "Live search sessions")
+SESSION_BYTES = Gauge(
+    "jobbot_session_bytes", "Approximate bytes held by search sessions")
+JOB_STORE_JOBS = Gauge(
+    "jobbot_job_store_jobs", "Jobs in the shared job store")
+JOB_STORE_BYTES = Gauge(
+    "jobbot_job_store_bytes", "Approximate bytes held by the shared job store")
+CACHE_EVICTIONS = Counter(
+    "jobbot_cache_evictions_total", "Entries evicted from in-memory stores", ("store", "reason"))
+
+CORPUS_LOOKUPS = Counter(
+    "jobbot_corpus_lookups_total", "local_first searches by source: recent upstream results, corpus (hit) or upstream (miss)", ("outcome",))
+CORPUS_REFRESHES = Counter(
+    "jobbot_corpus_refreshes_total", "Background upstream refreshes after a corpus hit by outcome", ("outcome",))
+CORPUS_JOBS = Gauge(
+    "jobbot_corpus_jobs", "Jobs in the local job corpus")
+PREFETCH_QUERIES = Counter(
+    "jobbot_prefetch_queries_total", "Queries considered by the background warmer by reason and outcome",
+    ("reason", "outcome"))
+
+RENDER_CACHE_LOOKUPS = Counter(
+    "jobbot_render_cache_lookups_total", "Rendered job card lookups by result", ("result",))
+RENDER_CACHE_BYTES = Gauge(
+    "jobbot_render_cache_bytes", "Approximate bytes held by rendered job cards")
+
+CALLBACKS = Counter(
+    "jobbot_callbacks_total", "Inline button presses by action and payload outcome", ("action", "outcome"))
+
+THROTTLED = Counter(
+    "jobbot_throttled_total", "Events refused by the per-user and per-IP rate limits by action", ("action",))
+DEBOUNCED = Counter(
+    "jobbot_debounced_searches_total", "Searches dropped because a newer message from the same user replaced them")
+QUOTA_MODE = Gauge(
+    "jobbot_quota_mode", "Upstream search mode set by the remaining quota: 0 normal, 1 local first, 2 cache only")
+UPSTREAM_SKIPPED = Counter(
+    "jobbot_upstream_skipped_total", "Upstream searches not made because the quota governor is in cache-only mode")
@@ -0,0 +1,157 @@
+"""
+🔥 Prefetch Module
+Keeps the searches users are about to make warm:
+  → QueryTracker: how often each query was searched recently, and in which
+    languages
+  → Prefetcher: on a schedule, re-runs trending, soon-due subscription and
+    frequent queries upstream within a per-run and a RapidAPI quota budget,
+    then pre-renders their first cards in every language that will see them
+
+Warm results are served by `JobSearcher.search_jobs(..., local_first=True)`
+without an upstream call; pre-rendering fills the translation cache.
+"""
+
+import time
+import logging
+from collections import OrderedDict
+from typing import Awaitable, Callable, Iterable, Optional
+
+import metrics
+from query_planner import normalize_query
+
+logger = logging.getLogger(__name__)
+
+
+class QueryTracker:
+    """Search counts per normalized query over a sliding `window` (seconds)."""
+
+    def __init__(self, window: float = 6 * 3600, max_queries: int = 5000):
+        self.window = window
+        self.max_queries = max_queries
+        # query → [timestamps of recent searches, languages of the searchers]
+        self._queries: OrderedDict[str, tuple[list[float], set[str]]] = OrderedDict()
+
+    def record(self, query: str, lang: str, now: Optional[float] = None):
+        now = now or time.time()
+        key = normalize_query(query)
+        if not key:
+            return
+        entry = self._queries.get(key)
+        if entry is None:
+            entry = self._queries[key] = ([], set())
+        else:
+            self._queries.move_to_end(key)
+        entry[0].append(now)
+        entry[1].add(lang)
+        while len(self._queries) > self.max_queries:
+            self._queries.popitem(last=False)
+
+    def _trim(self, now: float):
+        cutoff = now - self.window
+        # Least recently searched first, so stop at the first live one
+        while self._queries:
+            key, (times, _) = next(iter(self._queries.items()))
+            if times[-1] >= cutoff:
+                break
+            self._queries.popitem(last=False)
+        for times, _ in self._queries.values():
+            while times and times[0] < cutoff:
+                times.pop(0)
+
+    def top(self, n: int, now: Optional[float] = None) -> list[tuple[str, set[str]]]:
+        """The `n` most searched queries in the window, with their languages."""
+        self._trim(now or time.time())
+        ranked = sorted(self._queries.items(), key=lambda item: len(item[1][0]), reverse=True)
+        return [(key, set(langs)) for key, (times, langs) in ranked[:n] if times]
+
+    def languages(self, now: Optional[float] = None) -> set[str]:
+        """Languages of everyone who searched in the window."""
+        self._trim(now or time.time())
+        return set().union(*(langs for _, langs in self._queries.values()))
+
+    def __len__(self) -> int:
+        return len(self._queries)
+
+
+class PrefetchTarget:
+    __slots__ = ("query", "view", "langs", "reason")
+
+    def __init__(self, query: str, view: str, langs: Iterable[str], reason: str):
+        self.query = query
+        self.view = view
+        self.langs = set(langs)
+        self.reason = reason
+
+
+class Prefetcher:
+    def __init__(
+        self,
+        searcher,
+        render: Callable[[list[dict], set[str]], Awaitable[None]],
+        max_queries: int = 10,
+        num_results: int = 10,
+        quota_reserve: float = 0.3,
+        refresh_after: float = 1800.0,
+    ):
+        """
+        Args:
+            searcher: JobSearcher whose results are warmed
+            render: Pre-renders a query's jobs in the given languages
+            max_queries: Upstream searches allowed per run
+            num_results: Results fetched per query (at least what the bot asks for)
+            quota_reserve: Stop once less than this fraction of the RapidAPI quota is left
+            refresh_after: Skip queries fetched upstream more recently than this (seconds)
+        """
+        self.searcher = searcher
+        self.render = render
+        self.max_queries = max_queries
+        self.num_results = num_results
+        self.quota_reserve = quota_reserve
+        self.refresh_after = refresh_after
+        self.last_run: dict = {}
+
+    def _quota_low(self) -> bool:
+        fraction = self.searcher.quota.fraction_remaining()
+        return fraction is not None and fraction < self.quota_reserve
+
+    async def run(self, targets: Iterable[PrefetchTarget]) -> dict:
+        """
+        Warm `targets` in order (duplicates are merged, languages combined)
+        until the budget is spent. Returns a summary for logs and /health.
+        """
+        merged: OrderedDict[tuple[str, str], PrefetchTarget] = OrderedDict()
+        for target in targets:
+            key = (target.view, normalize_query(target.query))
+            if key in merged:
+                merged[key].langs |= target.langs
+            else:
+                merged[key] = target
+
+        start = time.perf_counter()
+        summary = {"fetched": 0, "fresh": 0, "failed": 0, "budget": 0, "rendered": 0}
+        for target in merged.values():
+            age = self.searcher.last_fetched(target.query, target.view)
+            if age is not None and age < self.refresh_after:
+                outcome = "fresh"
+            elif summary["fetched"] + summary["failed"] >= self.max_queries or self._quota_low():
+                outcome = "budget"
+            else:
+                try:
+                    jobs = await self.searcher.search_jobs(target.query, num_results=self.num_results, view=target.view)
+                except Exception as e:
+                    logger.error(f"Prefetch of {target.query!r} failed: {e}")
+                    jobs = None
+                outcome = "fetched" if jobs else "failed"
+                if jobs and target.langs:
+                    try:
+                        await self.render(jobs, target.langs)
+                        summary["rendered"] += 1
+                    except Exception as e:
+                        logger.error(f"Pre-rendering {target.query!r} failed: {e}")
+            summary[outcome] += 1
+            metrics.PREFETCH_QUERIES.labels(target.reason, outcome).inc()
+
+        summary["seconds"] = round(time.perf_counter() - start, 3)
+        self.last_run = summary
+        logger.info(f"Prefetch: {summary}")
+        return summary
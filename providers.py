@@ -0,0 +1,260 @@
+"""
+🔌 Job Providers Module
+Search backends that JobSearcher fans out to:
+  → JSearchProvider  — RapidAPI JSearch (LinkedIn, Indeed, Glassdoor, ...)
+  → AdzunaProvider   — Adzuna jobs API
+  → FixtureProvider  — local JSON file, for tests and offline runs
+
+Every provider returns jobs already parsed into the common job dict format.
+Providers that reuse JobSearcher's parser may leave the description raw until
+job_searcher.ensure_description() is called on it.
+"""
+
+import time
+import asyncio
+import logging
+from typing import Callable, Optional
+
+import httpx
+
+import fast_json
+import metrics
+from tracing import span
+from salary import annotate
+from resilience import (
+    CircuitBreaker, CircuitOpenError, RetryBudget, QuotaTracker,
+    backoff_delay, parse_retry_after,
+)
+
+logger = logging.getLogger(__name__)
+
+JSEARCH_BASE_URL = "https://jsearch.p.rapidapi.com"
+ADZUNA_BASE_URL = "https://api.adzuna.com/v1/api/jobs"
+
+MAX_ATTEMPTS = 3            # First try + up to 2 retries (if the retry budget allows)
+ATTEMPT_TIMEOUT = 8.0       # Seconds per HTTP attempt
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+ADZUNA_CURRENCIES = {"in": "INR", "gb": "GBP", "us": "USD", "de": "EUR", "fr": "EUR", "nl": "EUR"}
+
+
+class JobProvider:
+    """
+    Base class for search backends.
+
+    Subclasses set `name` and implement `search()`. `deadline` is how long
+    JobSearcher waits for this provider before moving on without it.
+    """
+
+    name = "provider"
+
+    def __init__(self, deadline: float = 10.0):
+        self.deadline = deadline
+        self.breaker = CircuitBreaker(failure_threshold=5, reset_timeout=30.0)
+        self.retry_budget = RetryBudget(ratio=0.2, min_retries=3)
+
+    async def search(self, client: httpx.AsyncClient, query: str, num_results: int, view: str = "card") -> list[dict]:
+        """Return up to `num_results` parsed jobs; `view` selects the fields needed."""
+        raise NotImplementedError
+
+    async def _get_json(self, client: httpx.AsyncClient, url: str, decode: Optional[Callable] = None, **kwargs):
+        """
+        GET `url` with retries, backoff and the circuit breaker. The body is
+        decoded with `decode` (default: fast_json.loads).
+
+        Timeouts, connection errors, 429 and 5xx are retried while the retry
+        budget and the provider deadline allow; a Retry-After header is
+        honoured. Raises CircuitOpenError without calling out while the
+        circuit is open.
+        """
+        deadline = time.monotonic() + self.deadline
+        self.retry_budget.record_request()
+
+        attempt = 0
+        while True:
+            if not self.breaker.allow():
+                raise CircuitOpenError(f"{self.name}: retry in {self.breaker.retry_in():.0f}s")
+
+            retry_after = None
+            try:
+                remaining = deadline - time.monotonic()
+                with span("http.get", provider=self.name, attempt=attempt) as http_span:
+                    response = await client.get(url, timeout=min(ATTEMPT_TIMEOUT, remaining), **kwargs)
+                    http_span.set("status", response.status_code)
+                metrics.UPSTREAM_STATUS.labels(self.name, str(response.status_code)).inc()
+                self._on_response(response)
+                response.raise_for_status()
+                data = (decode or fast_json.loads)(response.content)
+                self.breaker.record_success()
+                return data
+            except httpx.HTTPStatusError as e:
+                status = e.response.status_code
+                if status not in RETRYABLE_STATUS:
+                    # Client errors (bad key, bad params) say nothing about upstream health
+                    self.breaker.record_success()
+                    raise
+                self.breaker.record_failure()
+                retry_after = parse_retry_after(e.response.headers.get("Retry-After"))
+                error = e
+            except (httpx.TimeoutException, httpx.TransportError) as e:
+                self.breaker.record_failure()
+                error = e
+            except (Exception, asyncio.CancelledError):
+                # Cancelled usually means the provider deadline ran out
+                self.breaker.record_failure()
+                raise
+
+            attempt += 1
+            delay = retry_after if retry_after is not None else backoff_delay(attempt - 1)
+            if (
+                attempt >= MAX_ATTEMPTS
+                or time.monotonic() + delay >= deadline - 1.0
+                or not self.retry_budget.try_spend()
+            ):
+                raise error
+            logger.warning(f"{self.name} attempt {attempt} failed ({error!r}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    def _on_response(self, response: httpx.Response):
+        """Hook for inspecting every HTTP response (e.g. quota headers)."""
+
+    def stats(self) -> dict:
+        return {
+            "circuit": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+        }
+
+
+class JSearchProvider(JobProvider):
+    """RapidAPI JSearch. Raw records are parsed with JobSearcher's `parse_jobs`."""
+
+    name = "jsearch"
+
+    def __init__(self, api_key: str, parse_jobs: Callable[[list[dict], str], list[dict]], deadline: float = 15.0):
+        super().__init__(deadline=deadline)
+        self.headers = {
+            "X-RapidAPI-Key": api_key,
+            "X-RapidAPI-Host": "jsearch.p.rapidapi.com"
+        }
+        self.parse_jobs = parse_jobs
+        self.quota = QuotaTracker()
+
+    async def search(self, client: httpx.AsyncClient, query: str, num_results: int, view: str = "card") -> list[dict]:
+        params = {
+            "query": query,
+            "page": "1",
+            "num_pages": "1",
+            "date_posted": "all",
+        }
+        data = await self._get_json(
+            client, f"{JSEARCH_BASE_URL}/search",
+            decode=fast_json.decode_jsearch_response,
+            headers=self.headers, params=params,
+        )
+        if data.get("status") != "OK":
+            raise ValueError(f"JSearch API status not OK: {data.get('status')}")
+        return self.parse_jobs((data.get("data") or [])[:num_results], view)
+
+    def _on_response(self, response: httpx.Response):
+        self.quota.update(response.headers)
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        stats["quota"] = self.quota.snapshot()
+        return stats
+
+
+class AdzunaProvider(JobProvider):
+    """Adzuna search API (https://developer.adzuna.com)."""
+
+    name = "adzuna"
+
+    def __init__(self, app_id: str, app_key: str, country: str = "in", deadline: float = 10.0):
+        super().__init__(deadline=deadline)
+        self.app_id = app_id
+        self.app_key = app_key
+        self.country = country
+
+    async def search(self, client: httpx.AsyncClient, query: str, num_results: int, view: str = "card") -> list[dict]:
+        params = {
+            "app_id": self.app_id,
+            "app_key": self.app_key,
+            "what": query,
+            "results_per_page": str(num_results),
+            "content-type": "application/json",
+        }
+        data = await self._get_json(client, f"{ADZUNA_BASE_URL}/{self.country}/search/1", params=params)
+        parsed_jobs = []
+        for raw in (data.get("results") or [])[:num_results]:
+            parsed = self._parse(raw)
+            if parsed:
+                parsed_jobs.append(parsed)
+        return parsed_jobs
+
+    def _parse(self, raw: dict) -> Optional[dict]:
+        title = (raw.get("title") or "").strip()
+        if not title:
+            return None
+        currency = ADZUNA_CURRENCIES.get(self.country, "")
+        salary_min = raw.get("salary_min")
+        salary_max = raw.get("salary_max")
+        if salary_min and salary_max and salary_min != salary_max:
+            salary = f"{currency} {salary_min:,.0f} - {salary_max:,.0f}/year".strip()
+        elif salary_min or salary_max:
+            salary = f"{currency} {(salary_min or salary_max):,.0f}/year".strip()
+        else:
+            salary = "Not mentioned"
+        contract_time = {"full_time": "Full-time", "part_time": "Part-time"}.get(raw.get("contract_time"), "")
+        contract_type = {"contract": "Contract"}.get(raw.get("contract_type"), "")
+        description = " ".join((raw.get("description") or "").split())
+        return annotate({
+            "title": title,
+            "company": ((raw.get("company") or {}).get("display_name") or "N/A").strip(),
+            "location": (raw.get("location") or {}).get("display_name") or "N/A",
+            "salary": salary,
+            "salary_min": float(salary_min) if salary_min else None,
+            "salary_max": float(salary_max) if salary_max else None,
+            "salary_currency": currency,
+            "description": description[:400] or "Description not available",
+            "job_type": contract_type or contract_time or "Full-time",
+            "apply_url": raw.get("redirect_url") or "",
+            "company_url": "",
+            "rating": "",
+            "posted": "",
+            "posted_at": raw.get("created") or "",
+            "skills": "",
+            "experience": "",
+            "experience_months": 0,
+            "is_remote": "remote" in f"{title} {description}".lower(),
+            "source": "Adzuna",
+        })
+
+
+class FixtureProvider(JobProvider):
+    """
+    Serves JSearch-shaped records from a local JSON file (either a full
+    `{"status": "OK", "data": [...]}` response or a bare list). Records whose
+    title shares a word with the query are returned, all records otherwise.
+    """
+
+    name = "fixture"
+
+    def __init__(self, path: str, parse_jobs: Callable[[list[dict], str], list[dict]], latency: float = 0.0, deadline: float = 5.0):
+        super().__init__(deadline=deadline)
+        self.path = path
+        self.parse_jobs = parse_jobs
+        self.latency = latency
+        self._records: Optional[list[dict]] = None
+
+    def _load(self) -> list[dict]:
+        if self._records is None:
+            data = fast_json.load_file(self.path, default=[])
+            self._records = data.get("data", []) if isinstance(data, dict) else data
+        return self._records
+
+    async def search(self, client: httpx.AsyncClient, query: str, num_results: int, view: str = "card") -> list[dict]:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        records = self._load()
+        words = {w for w in query.lower().split() if len(w) > 2}
+        matching = [r for r in records if words & set(r.get("job_title", "").lower().split())]
+        return self.parse_jobs((matching or records)[:num_results], view)
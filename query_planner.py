@@ -0,0 +1,144 @@
+"""
+🗺️ Query Planner Module
+Turns many saved searches into as few upstream calls as possible:
+  → Subscriptions with the same query share one JSearch call
+  → Each subscription's filters are then applied locally to the shared results
+"""
+
+import re
+from typing import Optional
+
+from salary import UNITS, best_salary
+
+JOB_TYPE_ALIASES = {
+    "fulltime": "Full-time", "full-time": "Full-time", "full": "Full-time",
+    "parttime": "Part-time", "part-time": "Part-time", "part": "Part-time",
+    "contract": "Contract", "contractor": "Contract",
+    "intern": "Internship", "internship": "Internship",
+    "temporary": "Temporary", "temp": "Temporary",
+}
+
+_SALARY_RE = re.compile(r"^(\d+(?:\.\d+)?)\s*(k|l|lpa|lakh|lakhs|cr|crore|m)?$")
+# A pay floor typed into a search: "min 10 LPA", "above 8L", "salary 12 lakh", "10+ lpa"
+_SEARCH_SALARY_RE = re.compile(
+    r"(?:\b(?:min(?:imum)?|above|over|salary|ctc)\s*[:=]?\s*|>=?\s*)"
+    r"(\d+(?:\.\d+)?)\s*(k|l|lpa|lakh|lakhs|cr|crore)\b\+?"
+    r"|\b(\d+(?:\.\d+)?)\s*\+\s*(l|lpa|lakh|lakhs|cr|crore)\b",
+    re.IGNORECASE,
+)
+
+
+def normalize_query(query: str) -> str:
+    """Canonical form used to group identical searches."""
+    return " ".join(query.lower().split())
+
+
+def parse_salary_amount(text: str) -> Optional[float]:
+    """Parse '10L', '10 lpa', '1.2cr', '80k' or '500000' into a yearly number."""
+    match = _SALARY_RE.match(text.strip().lower().replace(",", ""))
+    if not match:
+        return None
+    return float(match.group(1)) * UNITS[match.group(2)]
+
+
+def split_salary_filter(query: str) -> tuple[str, Optional[float]]:
+    """
+    Take a pay floor out of a search query:
+    "python developer min 10 LPA" → ("python developer", 1000000.0).
+    """
+    match = _SEARCH_SALARY_RE.search(query)
+    if not match:
+        return query, None
+    amount, unit = (match.group(1), match.group(2)) if match.group(1) else (match.group(3), match.group(4))
+    rest = " ".join(f"{query[:match.start()]} {query[match.end():]}".split())
+    return rest, float(amount) * UNITS[unit.lower()]
+
+
+def parse_subscription_args(args: list[str]) -> tuple[str, dict]:
+    """
+    Split /subscribe arguments into the search query and filter options.
+
+    Filters are `key=value` tokens (or the bare word `remote`):
+      remote=yes  type=internship  salary=10L  exp=3
+    Everything else is part of the query.
+    """
+    query_words = []
+    filters = {}
+    for token in args:
+        key, sep, value = token.partition("=")
+        key = key.lower()
+        if not sep:
+            if key == "remote":
+                filters["remote"] = True
+            else:
+                query_words.append(token)
+            continue
+        if key == "remote":
+            filters["remote"] = value.lower() in ("yes", "y", "true", "1")
+        elif key in ("type", "jobtype"):
+            job_type = JOB_TYPE_ALIASES.get(value.lower())
+            if job_type:
+                filters["job_type"] = job_type
+        elif key in ("salary", "minsalary", "min"):
+            amount = parse_salary_amount(value)
+            if amount:
+                filters["min_salary"] = amount
+        elif key in ("exp", "experience"):
+            try:
+                filters["experience"] = int(float(value))
+            except ValueError:
+                pass
+        else:
+            query_words.append(token)
+    return " ".join(query_words), filters
+
+
+def describe_filters(filters: dict) -> str:
+    """Short human readable summary, e.g. 'Remote • Internship • ₹10.0L+ • ≤3 yrs'."""
+    parts = []
+    if filters.get("remote"):
+        parts.append("Remote")
+    if filters.get("job_type"):
+        parts.append(filters["job_type"])
+    if filters.get("min_salary"):
+        parts.append(f"₹{filters['min_salary'] / 100000:.1f}L+")
+    if filters.get("experience") is not None:
+        parts.append(f"≤{filters['experience']} yrs")
+    return " • ".join(parts)
+
+
+def matches_filters(job: dict, filters: dict) -> bool:
+    """
+    Evaluate a subscription's filters against one parsed job.
+
+    Jobs that don't state a salary pass a min-salary filter; only a known
+    salary below the floor (compared in INR/year, see salary.py) rejects a job.
+    """
+    if filters.get("remote") and not job.get("is_remote"):
+        return False
+    if filters.get("job_type") and job.get("job_type") != filters["job_type"]:
+        return False
+    min_salary = filters.get("min_salary")
+    if min_salary:
+        best = best_salary(job)
+        if best and best < min_salary:
+            return False
+    experience = filters.get("experience")
+    if experience is not None:
+        required_months = job.get("experience_months") or 0
+        if required_months > experience * 12:
+            return False
+    return True
+
+
+def plan_queries(entries) -> dict[str, list]:
+    """
+    Group (user_id, subscription) pairs by normalized query.
+
+    Returns {normalized_query: [(user_id, subscription), ...]}, so the caller
+    runs one upstream search per key and fans the results out locally.
+    """
+    plan = {}
+    for user_id, sub in entries:
+        plan.setdefault(normalize_query(sub["query"]), []).append((user_id, sub))
+    return plan
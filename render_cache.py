@@ -0,0 +1,81 @@
+"""
+🖼️ Render Cache Module
+Finished job cards, so showing a job again costs no formatting and no
+translation calls:
+  → Keyed by (job hash, language, view, TEMPLATE_VERSION): changing a card
+    template means bumping the version, which orphans every old entry
+  → Stores the HTML body (already validated, see html_format.py) and the
+    keyboard; the "# N" index header differs per message and is added on
+    the way out
+  → LRU-evicted under a byte budget, entries expire after `ttl` (the
+    "posted 2 days ago" text goes stale)
+"""
+
+import sys
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import metrics
+
+TEMPLATE_VERSION = 2    # 2: HTML instead of Markdown
+KEYBOARD_BYTES = 1500   # Rough footprint of an InlineKeyboardMarkup with 3 rows
+
+CARD_RULE = "━━━━━━━━━━━━━━━━━━━━━━━━━"
+
+
+class RenderedCard:
+    """One job rendered for one language and view."""
+
+    __slots__ = ("body", "keyboard", "created", "size")
+
+    def __init__(self, body: str, keyboard):
+        self.body = body
+        self.keyboard = keyboard
+        self.created = time.monotonic()
+        self.size = sys.getsizeof(self) + sys.getsizeof(body) + KEYBOARD_BYTES
+
+    def html(self, index: int) -> str:
+        """The message text (parse_mode=HTML) for position `index`."""
+        return f"{CARD_RULE}\n🔢 <b># {index}</b>\n{CARD_RULE}\n{self.body}"
+
+
+class RenderCache:
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024, ttl: float = 6 * 3600):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._cards: OrderedDict[tuple, RenderedCard] = OrderedDict()
+        self.bytes = 0
+        metrics.RENDER_CACHE_BYTES.set_function(lambda: self.bytes)
+
+    def get(self, job_hash: str, lang: str, view: str) -> Optional[RenderedCard]:
+        key = (job_hash, lang, view, TEMPLATE_VERSION)
+        card = self._cards.get(key)
+        if card is None:
+            metrics.RENDER_CACHE_LOOKUPS.labels("miss").inc()
+            return None
+        if time.monotonic() - card.created > self.ttl:
+            self._remove(key)
+            metrics.CACHE_EVICTIONS.labels("render_cache", "ttl").inc()
+            metrics.RENDER_CACHE_LOOKUPS.labels("miss").inc()
+            return None
+        self._cards.move_to_end(key)
+        metrics.RENDER_CACHE_LOOKUPS.labels("hit").inc()
+        return card
+
+    def put(self, job_hash: str, lang: str, view: str, card: RenderedCard) -> RenderedCard:
+        key = (job_hash, lang, view, TEMPLATE_VERSION)
+        if key in self._cards:
+            self._remove(key)
+        self._cards[key] = card
+        self.bytes += card.size
+        while self.bytes > self.max_bytes and len(self._cards) > 1:
+            self._remove(next(iter(self._cards)))
+            metrics.CACHE_EVICTIONS.labels("render_cache", "memory").inc()
+        return card
+
+    def _remove(self, key: tuple):
+        self.bytes -= self._cards.pop(key).size
+
+    def __len__(self) -> int:
+        return len(self._cards)
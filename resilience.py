@@ -0,0 +1,174 @@
+"""
+🛡️ Resilience Module
+Building blocks for calling flaky upstream APIs:
+  → Circuit breaker that fails fast while the upstream is down
+  → Retry budget with jittered exponential backoff and Retry-After support
+  → RapidAPI quota accounting from response headers
+"""
+
+import time
+import random
+import datetime
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is refused because the circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Classic three-state breaker.
+
+    closed    → calls go through; `failure_threshold` consecutive failures open it
+    open      → calls are refused until `reset_timeout` seconds have passed
+    half_open → one trial call is let through; success closes, failure re-opens
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+
+    def allow(self) -> bool:
+        """Whether a call may be attempted right now."""
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            self.state = self.HALF_OPEN
+            self._trial_in_flight = False
+        # Half-open: only a single trial call at a time
+        if self._trial_in_flight:
+            return False
+        self._trial_in_flight = True
+        return True
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def retry_in(self) -> float:
+        """Seconds until an open circuit allows a trial call."""
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+
+class RetryBudget:
+    """
+    Caps retries to a fraction of recent requests, so retries can't multiply
+    load on an upstream that is already struggling.
+
+    Over a sliding `window` seconds at most `ratio * requests + min_retries`
+    retries are allowed.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_retries: int = 3, window: float = 60.0):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window = window
+        self._requests: list[float] = []
+        self._retries: list[float] = []
+
+    def _trim(self, now: float):
+        cutoff = now - self.window
+        self._requests = [t for t in self._requests if t > cutoff]
+        self._retries = [t for t in self._retries if t > cutoff]
+
+    def record_request(self):
+        self._requests.append(time.monotonic())
+
+    def try_spend(self) -> bool:
+        """Take one retry from the budget; False if it is exhausted."""
+        now = time.monotonic()
+        self._trim(now)
+        if len(self._retries) >= self.ratio * len(self._requests) + self.min_retries:
+            return False
+        self._retries.append(now)
+        return True
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 8.0) -> float:
+    """Full-jitter exponential backoff for retry number `attempt` (0-based)."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+        now = datetime.datetime.now(datetime.timezone.utc)
+        return max(0.0, (when - now).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class QuotaTracker:
+    """Remaining RapidAPI quota, as reported by the X-RateLimit-* response headers."""
+
+    HEADER_LIMIT = "x-ratelimit-requests-limit"
+    HEADER_REMAINING = "x-ratelimit-requests-remaining"
+    HEADER_RESET = "x-ratelimit-requests-reset"
+
+    def __init__(self):
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_seconds: Optional[int] = None
+        self.updated_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def update(self, headers):
+        """Read quota headers from an httpx response (missing headers are ignored)."""
+        values = {}
+        for attr, header in (
+            ("limit", self.HEADER_LIMIT),
+            ("remaining", self.HEADER_REMAINING),
+            ("reset_seconds", self.HEADER_RESET),
+        ):
+            raw = headers.get(header)
+            if raw is not None and str(raw).strip().isdigit():
+                values[attr] = int(raw)
+        if not values:
+            return
+        with self._lock:
+            for attr, value in values.items():
+                setattr(self, attr, value)
+            self.updated_at = time.time()
+
+    def fraction_remaining(self) -> Optional[float]:
+        if self.remaining is None or not self.limit:
+            return None
+        return self.remaining / self.limit
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "remaining": self.remaining,
+                "reset_seconds": self.reset_seconds,
+                "updated_at": self.updated_at,
+            }
@@ -0,0 +1,74 @@
+"""
+📄 Resume PDF Module
+Gets an uploaded resume from Telegram into text without touching disk:
+  → download(): streams the file in chunks through the bot's own request
+    object (so its proxy settings and the Bot API metrics apply) into a
+    BytesIO, and stops as soon as it passes `max_bytes`, so the cap holds
+    even when the upload's `file_size` is missing or wrong
+  → extract_text(): PyPDF2 reads straight from the buffer (run it in a
+    worker thread, parsing a large PDF takes a while)
+
+PyPDF2 is imported on first use, so this module is cheap to import.
+"""
+
+import io
+import os
+import asyncio
+
+CHUNK_SIZE = 64 * 1024
+
+
+class FileTooLargeError(Exception):
+    """Raised when a download passes its size cap."""
+
+
+async def download(file, max_bytes: int, request) -> bytes:
+    """
+    The contents of a Telegram `File` (from Bot.get_file), at most
+    `max_bytes` of them. Raises FileTooLargeError as soon as the file turns
+    out to be bigger, without reading the rest.
+
+    `request` is the bot's request object (bot.request); its stream(url)
+    yields a streamed httpx response. In local mode (`file_path` is a path)
+    the file is read in a worker thread instead.
+    """
+    if file.file_size and file.file_size > max_bytes:
+        raise FileTooLargeError(f"{file.file_size} bytes (max {max_bytes})")
+    if not file.file_path.startswith(("http://", "https://")):
+        return await asyncio.to_thread(_read_local, file.file_path, max_bytes)
+
+    buffer = io.BytesIO()
+    async with request.stream(file.file_path) as response:
+        response.raise_for_status()
+        declared = response.headers.get("content-length", "")
+        if declared.isdigit() and int(declared) > max_bytes:
+            raise FileTooLargeError(f"{declared} bytes (max {max_bytes})")
+        async for chunk in response.aiter_bytes(CHUNK_SIZE):
+            if buffer.tell() + len(chunk) > max_bytes:
+                raise FileTooLargeError(f"over {max_bytes} bytes")
+            buffer.write(chunk)
+    return buffer.getvalue()
+
+
+def _read_local(path: str, max_bytes: int) -> bytes:
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size > max_bytes:
+            raise FileTooLargeError(f"over {max_bytes} bytes")
+        # Read one byte past the cap in case the file grew since fstat
+        data = f.read(max_bytes + 1)
+    if len(data) > max_bytes:
+        raise FileTooLargeError(f"over {max_bytes} bytes")
+    return data
+
+
+def extract_text(data: bytes) -> str:
+    """Text of every page of a PDF held in memory."""
+    import PyPDF2
+
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    pages = []
+    for page in reader.pages:
+        text = page.extract_text()
+        if text:
+            pages.append(text)
+    return "".join(text + "\n" for text in pages)
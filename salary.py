@@ -0,0 +1,218 @@
+"""
+💰 Salary Module
+Pay as numbers, so jobs can be filtered and sorted by it:
+  → annotate(): every parsed job gets `salary_min_inr`/`salary_max_inr`, a
+    yearly range in INR from the structured fields (any currency in FX_TO_INR)
+    or, when those are missing, from salary lines in the job highlights
+    ("₹5-8 LPA", "CTC 12 lakh", "₹40,000 per month", "$120k a year")
+  → SortedIndex / SalaryIndex: values kept sorted with bisect, so "at least
+    10 LPA" is a binary search instead of a pass over every job;
+    SalaryIndexCache keeps one index per result list, so a list that is
+    filtered again (the next alert tick, another subscriber) isn't re-sorted
+  → annualize(): the one place a pay period becomes a yearly figure
+
+A job whose pay is unknown passes salary filters: only a known salary below
+the floor rejects a job.
+"""
+
+import re
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Hashable, Iterable, Optional
+
+# INR per unit of each currency. Deliberately static: good enough to compare
+# pay across postings, and no network call on the parsing path.
+FX_TO_INR = {
+    "INR": 1.0, "USD": 83.0, "EUR": 90.0, "GBP": 105.0, "AUD": 55.0, "CAD": 61.0,
+    "SGD": 62.0, "AED": 22.6, "CHF": 95.0, "NZD": 50.0, "JPY": 0.56,
+}
+
+# Amount suffixes ("10L", "1.2 cr", "80k")
+UNITS = {
+    None: 1, "k": 1_000, "l": 100_000, "lpa": 100_000, "lac": 100_000, "lacs": 100_000, "lakh": 100_000,
+    "lakhs": 100_000, "cr": 10_000_000, "crore": 10_000_000, "crores": 10_000_000, "m": 1_000_000,
+    "mn": 1_000_000, "million": 1_000_000,
+}
+
+PERIOD_MULTIPLIERS = {"HOUR": 2080, "DAY": 260, "WEEK": 52, "MONTH": 12, "YEAR": 1}
+
+# Without a stated period, smaller INR figures are monthly pay ("Salary: ₹40,000")
+MONTHLY_BELOW_INR = 150_000
+
+# Symbols are checked before words; words only count as whole words, so the
+# "rs" in "5+ years" or "40 hours" isn't rupees
+_CURRENCY_MARKERS = tuple((name, re.compile(pattern)) for name, pattern in (
+    ("INR", r"₹"), ("USD", r"\$"), ("EUR", r"€"), ("GBP", r"£"),
+    ("INR", r"\binr\b|\brs\.?(?=\s|\d)"), ("USD", r"\busd\b"), ("EUR", r"\beur\b"), ("GBP", r"\bgbp\b"),
+))
+_PERIOD_MARKERS = tuple((name, re.compile(pattern)) for name, pattern in (
+    ("HOUR", r"\bper hour\b|/hour\b|/hr\b|\bhourly\b|\ban hour\b"),
+    ("DAY", r"\bper day\b|/day\b|\bdaily\b|\ba day\b"),
+    ("WEEK", r"\bper week\b|/week\b|/wk\b|\bweekly\b|\ba week\b"),
+    ("MONTH", r"\bper month\b|/month\b|/mo\b|\bmonthly\b|\ba month\b|\bp\.m\.|\bpm\b|\bstipend\b"),
+    ("YEAR", r"\bper annum\b|\bper year\b|/year\b|/yr\b|\byearly\b|\bannual|\ba year\b|\blpa\b|\bctc\b|\bp\.a\.|\bpa\b"),
+))
+# Words that make a bare "80k" pay rather than, say, a 401k plan
+_PAY_CONTEXT_RE = re.compile(r"\b(?:salary|pay|paid|ctc|compensation|stipend|package|wages?|earn)", re.IGNORECASE)
+_UNIT_PATTERN = "|".join(sorted((u for u in UNITS if u), key=len, reverse=True))
+_AMOUNT_RE = re.compile(rf"(\d+(?:,\d{{2,3}})*(?:\.\d+)?)\s*({_UNIT_PATTERN})?\b", re.IGNORECASE)
+_RANGE_RE = re.compile(
+    rf"(\d+(?:,\d{{2,3}})*(?:\.\d+)?)\s*({_UNIT_PATTERN})?\s*(?:-|–|to)\s*"
+    rf"(?:₹|\brs\.?|\binr\b|\$|\busd\b|€|\beur\b|£|\bgbp\b)?\s*(\d+(?:,\d{{2,3}})*(?:\.\d+)?)\s*({_UNIT_PATTERN})?\b",
+    re.IGNORECASE,
+)
+# Numbers that are clearly not pay ("3+ years", "50%")
+_NOT_PAY_RE = re.compile(r"^\s*\+?\s*(?:years?|yrs?|months?|%|hours?|days?|employees|openings)\b", re.IGNORECASE)
+
+
+def annualize(amount: Optional[float], period: Optional[str]) -> Optional[float]:
+    """`amount` per `period` ("HOUR", "MONTH", ...; default "YEAR") as a yearly figure."""
+    if not amount:
+        return None
+    return float(amount) * PERIOD_MULTIPLIERS.get((period or "YEAR").upper(), 1)
+
+
+def to_inr(amount: Optional[float], currency: str) -> Optional[float]:
+    rate = FX_TO_INR.get((currency or "INR").upper())
+    if not amount or rate is None:
+        return None
+    return float(amount) * rate
+
+
+def _number(text: str, unit: Optional[str]) -> float:
+    return float(text.replace(",", "")) * UNITS[unit.lower() if unit else None]
+
+
+def _detect(text: str, markers) -> Optional[str]:
+    for name, pattern in markers:
+        if pattern.search(text):
+            return name
+    return None
+
+
+def parse_salary_text(text: str, default_currency: str = "INR") -> Optional[tuple[float, float]]:
+    """
+    Yearly (min, max) in INR stated by a free-text salary line, or None.
+    Ranges ("5-8 LPA", "₹4,00,000 to ₹6,00,000") and single amounts work; a
+    unit after the second number applies to the first one too.
+
+    A lone amount under 1000 only counts with a stated period ("$25 per
+    hour"), and "80k" only with a currency or a word like "salary" next to it.
+    """
+    lowered = f" {text.lower()} "
+    marked = _detect(lowered, _CURRENCY_MARKERS)
+    currency = marked or default_currency
+    period = _detect(lowered, _PERIOD_MARKERS)
+    pay_context = marked is not None or _PAY_CONTEXT_RE.search(lowered) is not None
+
+    def is_pay(number: str, unit: Optional[str]) -> bool:
+        if unit:
+            return pay_context or unit.lower() != "k"
+        return period is not None or float(number.replace(",", "")) >= 1000
+
+    match = _RANGE_RE.search(lowered)
+    if match and not _NOT_PAY_RE.match(lowered, match.end()):
+        unit = match.group(2) or match.group(4)
+        if not is_pay(match.group(3), unit):
+            return None
+        low, high = _number(match.group(1), unit), _number(match.group(3), match.group(4))
+    else:
+        amounts = [
+            _number(m.group(1), m.group(2)) for m in _AMOUNT_RE.finditer(lowered)
+            if not _NOT_PAY_RE.match(lowered, m.end()) and is_pay(m.group(1), m.group(2))
+        ]
+        if not amounts:
+            return None
+        low = high = max(amounts)
+    if low > high:
+        low, high = high, low
+
+    if period is None:
+        period = "MONTH" if currency == "INR" and high < MONTHLY_BELOW_INR else "YEAR"
+    low, high = to_inr(annualize(low, period), currency), to_inr(annualize(high, period), currency)
+    if not low or not high:
+        return None
+    return low, high
+
+
+def annotate(job: dict, salary_lines: Iterable[str] = ()) -> dict:
+    """
+    Set `salary_min_inr`/`salary_max_inr` on a parsed job from its yearly
+    `salary_min`/`salary_max` and `salary_currency`, else from the first
+    of `salary_lines` that states an amount. Returns the job.
+    """
+    currency = job.get("salary_currency") or "INR"
+    low, high = to_inr(job.get("salary_min"), currency), to_inr(job.get("salary_max"), currency)
+    if low is None and high is None:
+        for line in salary_lines:
+            parsed = parse_salary_text(line, currency if currency in FX_TO_INR else "INR")
+            if parsed:
+                low, high = parsed
+                break
+    job["salary_min_inr"], job["salary_max_inr"] = low, high
+    return job
+
+
+def best_salary(job: dict) -> Optional[float]:
+    """The most a job pays per year in INR, or None if unknown."""
+    if "salary_max_inr" in job:
+        return job["salary_max_inr"] or job["salary_min_inr"]
+    # Jobs parsed before salaries were normalized (saved jobs, snapshots)
+    return to_inr(job.get("salary_max") or job.get("salary_min"), job.get("salary_currency") or "INR")
+
+
+class SortedIndex:
+    """Keys ordered by a numeric value; range lookups are binary searches."""
+
+    def __init__(self, items: Iterable[tuple[float, Hashable]] = ()):
+        pairs = sorted(items, key=lambda pair: pair[0])
+        self._values = [value for value, _ in pairs]
+        self._keys = [key for _, key in pairs]
+
+    def at_least(self, value: float) -> list:
+        """Keys with a value >= `value`, lowest first."""
+        return self._keys[bisect_left(self._values, value):]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+class SalaryIndex:
+    """One result list indexed by best_salary(); jobs without a salary are kept aside."""
+
+    def __init__(self, jobs: list[dict]):
+        self.jobs = jobs
+        self._salaries = [best_salary(job) for job in jobs]
+        self._index = SortedIndex((salary, i) for i, salary in enumerate(self._salaries) if salary)
+        self._unknown = [i for i, salary in enumerate(self._salaries) if not salary]
+
+    def at_least(self, min_salary: float, by_salary: bool = False) -> list[dict]:
+        """
+        Jobs paying at least `min_salary` plus those with unknown pay: in
+        result order, or with `by_salary` highest paid first (unknown last).
+        """
+        if by_salary:
+            positions = self._index.at_least(min_salary)[::-1] + self._unknown
+            return [self.jobs[i] for i in positions]
+        return [job for job, salary in zip(self.jobs, self._salaries) if not salary or salary >= min_salary]
+
+
+class SalaryIndexCache:
+    """
+    SalaryIndex per result list (by identity), least recently used dropped
+    first. An entry holds its list, so the id can't be reused while cached.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._indexes: OrderedDict[int, SalaryIndex] = OrderedDict()
+
+    def get(self, jobs: list[dict]) -> SalaryIndex:
+        index = self._indexes.get(id(jobs))
+        if index is not None and index.jobs is jobs:
+            self._indexes.move_to_end(id(jobs))
+            return index
+        index = self._indexes[id(jobs)] = SalaryIndex(jobs)
+        while len(self._indexes) > self.max_entries:
+            self._indexes.popitem(last=False)
+        return index
@@ -0,0 +1,193 @@
+"""
+👀 Seen Jobs Filter Module
+Remembers which jobs a subscription has already been sent, so daily alerts
+only deliver new ones.
+  → One small Bloom filter per subscription (two rotating generations)
+  → Stored together in a single compact binary file of fixed-size records,
+    so a save rewrites only the subscriptions that changed, in place
+"""
+
+import os
+import struct
+import logging
+
+logger = logging.getLogger(__name__)
+
+FILTER_BITS = 1024          # 128 bytes per generation
+FILTER_HASHES = 5
+GENERATION_CAPACITY = 100   # Items per generation before rotating (~1% false positives)
+
+_FILE_MAGIC = b"SEEN1"
+_RECORD_HEADER = struct.Struct(">HH")  # key length, items in current generation
+_TOMBSTONE = 0xFFFF  # Item count of a record whose subscription was forgotten
+
+
+class SeenFilter:
+    """
+    Bloom filter with two generations. New hashes go into `current`; once it
+    holds GENERATION_CAPACITY items it becomes `previous` and a fresh one is
+    started. Lookups check both, so memory stays fixed per subscription while
+    roughly the last 100-200 delivered jobs are remembered.
+    """
+
+    __slots__ = ("current", "previous", "count")
+
+    def __init__(self, current: bytes = b"", previous: bytes = b"", count: int = 0):
+        size = FILTER_BITS // 8
+        self.current = bytearray(current or size)
+        self.previous = bytearray(previous or size)
+        self.count = count
+
+    @staticmethod
+    def _positions(job_hash: str):
+        # job hashes are already md5-derived hex, so split them into two
+        # independent values and use double hashing for the k positions
+        value = int(job_hash, 16)
+        h1 = value & 0xFFFFF
+        h2 = (value >> 20) | 1
+        for i in range(FILTER_HASHES):
+            yield (h1 + i * h2) % FILTER_BITS
+
+    def __contains__(self, job_hash: str) -> bool:
+        positions = list(self._positions(job_hash))
+        for bits in (self.current, self.previous):
+            if all(bits[p >> 3] & (1 << (p & 7)) for p in positions):
+                return True
+        return False
+
+    def add(self, job_hash: str):
+        if job_hash in self:
+            return
+        if self.count >= GENERATION_CAPACITY:
+            self.previous = self.current
+            self.current = bytearray(FILTER_BITS // 8)
+            self.count = 0
+        for p in self._positions(job_hash):
+            self.current[p >> 3] |= 1 << (p & 7)
+        self.count += 1
+
+
+class SeenStore:
+    """
+    All subscription filters, persisted to one binary file.
+
+    A record's size only depends on its key, so save() overwrites the records
+    of changed filters where they are and appends new ones; a forgotten
+    filter's record is marked as a tombstone. The whole file is rewritten
+    only when it doesn't exist yet, after rename(), or once tombstones
+    outnumber the live records.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.filters: dict[str, SeenFilter] = {}
+        self._offsets: dict[str, int] = {}  # key → offset of its record in the file
+        self._changed: set[str] = set()
+        self._tombstones: list[int] = []     # Offsets of records to mark forgotten
+        self._dead = 0                       # Tombstones in the file
+        self._rewrite = False
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        size = FILTER_BITS // 8
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+            if not data.startswith(_FILE_MAGIC):
+                logger.error("Seen jobs file has an unknown format, ignoring it")
+                return
+            offset = len(_FILE_MAGIC)
+            while offset < len(data):
+                record_offset = offset
+                key_len, count = _RECORD_HEADER.unpack_from(data, offset)
+                offset += _RECORD_HEADER.size
+                key = data[offset:offset + key_len].decode("utf-8")
+                offset += key_len
+                current = data[offset:offset + size]
+                previous = data[offset + size:offset + 2 * size]
+                offset += 2 * size
+                if count == _TOMBSTONE:
+                    self._dead += 1
+                    continue
+                self.filters[key] = SeenFilter(current, previous, count)
+                self._offsets[key] = record_offset
+        except Exception as e:
+            logger.error(f"Failed to load seen jobs: {e}")
+
+    @staticmethod
+    def _record(key: str, seen: SeenFilter) -> bytes:
+        key_bytes = key.encode("utf-8")
+        return _RECORD_HEADER.pack(len(key_bytes), seen.count) + key_bytes + seen.current + seen.previous
+
+    def save(self):
+        """Write the filters that changed since the last save."""
+        if not (self._changed or self._tombstones or self._rewrite):
+            return
+        if self._rewrite or not os.path.exists(self.path) or self._dead + len(self._tombstones) > len(self.filters):
+            self._save_all()
+            return
+        try:
+            with open(self.path, "r+b") as f:
+                for offset in self._tombstones:
+                    f.seek(offset + 2)  # The item count
+                    f.write(struct.pack(">H", _TOMBSTONE))
+                self._dead += len(self._tombstones)
+                self._tombstones.clear()
+                end = f.seek(0, os.SEEK_END)
+                for key in self._changed:
+                    seen = self.filters.get(key)
+                    if seen is None:
+                        continue
+                    offset = self._offsets.get(key)
+                    if offset is None:
+                        offset = self._offsets[key] = end
+                    f.seek(offset)
+                    end = max(end, offset + f.write(self._record(key, seen)))
+            self._changed.clear()
+        except Exception as e:
+            logger.error(f"Failed to save seen jobs: {e}")
+
+    def _save_all(self):
+        tmp_path = f"{self.path}.tmp"
+        offsets = {}
+        try:
+            with open(tmp_path, "wb") as f:
+                offset = f.write(_FILE_MAGIC)
+                for key, seen in self.filters.items():
+                    offsets[key] = offset
+                    offset += f.write(self._record(key, seen))
+            os.replace(tmp_path, self.path)
+            self._offsets = offsets
+            self._changed.clear()
+            self._tombstones.clear()
+            self._dead = 0
+            self._rewrite = False
+        except Exception as e:
+            logger.error(f"Failed to save seen jobs: {e}")
+
+    def unseen(self, key: str, job_hashes: list[str]) -> list[str]:
+        """Return the hashes (in order) that `key` has not been sent yet."""
+        seen = self.filters.get(key)
+        if seen is None:
+            return list(job_hashes)
+        return [h for h in job_hashes if h not in seen]
+
+    def mark_seen(self, key: str, job_hashes):
+        seen = self.filters.setdefault(key, SeenFilter())
+        for h in job_hashes:
+            seen.add(h)
+        self._changed.add(key)
+
+    def rename(self, old_key: str, new_key: str):
+        seen = self.filters.pop(old_key, None)
+        if seen is not None:
+            self.filters[new_key] = seen
+            self._rewrite = True
+
+    def forget(self, key: str):
+        if self.filters.pop(key, None) is not None:
+            self._changed.discard(key)
+            offset = self._offsets.pop(key, None)
+            if offset is not None:
+                self._tombstones.append(offset)
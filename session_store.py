@@ -0,0 +1,243 @@
+"""
+🗂️ Session Store Module
+Bounded in-memory state for search sessions:
+  → JobStore: one shared copy of every rendered job, keyed by job hash,
+    LRU-evicted under a byte budget; storing a job again keeps the fields
+    only the older copy had
+  → SessionStore: per-user search sessions holding job hashes (not copies),
+    expired after an idle TTL and LRU-evicted under a byte budget
+  → The query of an evicted session is remembered, so paging can re-run it
+  → export()/restore() move sessions across a restart (see snapshot.py)
+"""
+
+import sys
+import time
+from collections import OrderedDict
+from typing import Callable, Iterator, Optional
+
+import metrics
+
+
+def estimate_size(obj) -> int:
+    """Approximate bytes held by a job-like structure (dicts, lists, strings, numbers)."""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += sys.getsizeof(key) + estimate_size(value)
+    elif isinstance(obj, (list, tuple)):
+        for item in obj:
+            size += estimate_size(item)
+    return size
+
+
+class JobStore:
+    """
+    Job dicts by hash, shared by sessions, keyboards and callbacks.
+    Supports the dict operations the bot uses (get, [], in, iteration).
+    On a miss, get() asks `fallback` (e.g. a restored snapshot) and keeps
+    what it returns.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, hash_job: Optional[Callable[[dict], str]] = None):
+        self.max_bytes = max_bytes
+        self.hash_job = hash_job
+        self._jobs: OrderedDict[str, tuple[dict, int]] = OrderedDict()
+        self.bytes = 0
+        self.fallback: Optional[Callable[[str], Optional[dict]]] = None
+        metrics.JOB_STORE_JOBS.set_function(lambda: len(self._jobs))
+        metrics.JOB_STORE_BYTES.set_function(lambda: self.bytes)
+
+    def put(self, job_hash: str, job: dict):
+        """
+        Store `job`. If the hash is already stored, fields the new dict lacks
+        are copied over from the old one first, so a job parsed for a reduced
+        view (e.g. alerts, without skills) doesn't replace a complete copy.
+        """
+        old = self._jobs.pop(job_hash, None)
+        if old is not None:
+            self.bytes -= old[1]
+            if old[0] is not job:
+                for field, value in old[0].items():
+                    if field not in job and not field.startswith("_"):
+                        job[field] = value
+        size = estimate_size(job)
+        self._jobs[job_hash] = (job, size)
+        self.bytes += size
+        while self.bytes > self.max_bytes and len(self._jobs) > 1:
+            _, (_, evicted_size) = self._jobs.popitem(last=False)
+            self.bytes -= evicted_size
+            metrics.CACHE_EVICTIONS.labels("job_store", "memory").inc()
+
+    def add_all(self, jobs: list[dict]) -> list[str]:
+        """Store `jobs` and return their hashes (in order)."""
+        hashes = []
+        for job in jobs:
+            job_hash = self.hash_job(job)
+            self.put(job_hash, job)
+            hashes.append(job_hash)
+        return hashes
+
+    def get(self, job_hash: str, default=None) -> Optional[dict]:
+        entry = self._jobs.get(job_hash)
+        if entry is None:
+            job = self.fallback(job_hash) if self.fallback is not None else None
+            if job is None:
+                return default
+            self.put(job_hash, job)
+            return job
+        self._jobs.move_to_end(job_hash)
+        return entry[0]
+
+    def __setitem__(self, job_hash: str, job: dict):
+        self.put(job_hash, job)
+
+    def __getitem__(self, job_hash: str) -> dict:
+        job = self.get(job_hash)
+        if job is None:
+            raise KeyError(job_hash)
+        return job
+
+    def __contains__(self, job_hash: str) -> bool:
+        return job_hash in self._jobs
+
+    def items(self) -> list[tuple[str, dict]]:
+        """Snapshot of (hash, job) pairs, least recently used first."""
+        return [(job_hash, entry[0]) for job_hash, entry in self._jobs.items()]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._jobs))
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+
+class Session:
+    __slots__ = ("query", "hashes", "page", "last_access", "size")
+
+    def __init__(self, query: str, hashes: list[str], page: int = 0):
+        self.query = query
+        self.hashes = hashes
+        self.page = page
+        self.last_access = time.monotonic()
+        self.size = sys.getsizeof(self) + sys.getsizeof(query) + sys.getsizeof(hashes) + sum(sys.getsizeof(h) for h in hashes)
+
+
+class SessionStore:
+    """
+    Search sessions by user id. A session lives until it has been idle for
+    `ttl` seconds or is the least recently used one when the store exceeds
+    `max_bytes`. Queries of dropped sessions are kept (up to `max_queries`)
+    so a late "show more" click can search again instead of failing.
+    """
+
+    def __init__(self, jobs: JobStore, ttl: float = 1800.0, max_bytes: int = 8 * 1024 * 1024,
+                 max_queries: int = 50_000):
+        self.jobs = jobs
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.max_queries = max_queries
+        self._sessions: OrderedDict[int, Session] = OrderedDict()
+        self._last_queries: OrderedDict[int, str] = OrderedDict()
+        self.bytes = 0
+        metrics.SESSIONS_LIVE.set_function(lambda: len(self._sessions))
+        metrics.SESSION_BYTES.set_function(lambda: self.bytes)
+
+    def put(self, user_id: int, query: str, jobs: list[dict]) -> Session:
+        """Start a new session for `user_id` with `jobs` as its results."""
+        self.delete(user_id, forget_query=False)
+        session = Session(query, self.jobs.add_all(jobs))
+        self._sessions[user_id] = session
+        self.bytes += session.size
+        self._last_queries.pop(user_id, None)
+        self._evict()
+        return session
+
+    def get(self, user_id: int) -> Optional[Session]:
+        """The live session of `user_id` (refreshing its TTL), or None."""
+        session = self._sessions.get(user_id)
+        if session is None:
+            return None
+        now = time.monotonic()
+        if now - session.last_access > self.ttl:
+            self._drop(user_id, "ttl")
+            return None
+        session.last_access = now
+        self._sessions.move_to_end(user_id)
+        return session
+
+    def results(self, session: Session) -> Optional[list[dict]]:
+        """The session's jobs, or None if any was evicted from the job store."""
+        jobs = [self.jobs.get(job_hash) for job_hash in session.hashes]
+        return None if any(job is None for job in jobs) else jobs
+
+    def last_query(self, user_id: int) -> Optional[str]:
+        """Query of the live or most recently dropped session of `user_id`."""
+        session = self._sessions.get(user_id)
+        return session.query if session else self._last_queries.get(user_id)
+
+    def delete(self, user_id: int, forget_query: bool = True):
+        session = self._sessions.pop(user_id, None)
+        if session is not None:
+            self.bytes -= session.size
+        if forget_query:
+            self._last_queries.pop(user_id, None)
+
+    def _drop(self, user_id: int, reason: str):
+        session = self._sessions.pop(user_id)
+        self.bytes -= session.size
+        self._last_queries[user_id] = session.query
+        self._last_queries.move_to_end(user_id)
+        while len(self._last_queries) > self.max_queries:
+            self._last_queries.popitem(last=False)
+        metrics.CACHE_EVICTIONS.labels("sessions", reason).inc()
+
+    def _evict(self):
+        # Sessions are in access order, so idle ones are at the front
+        cutoff = time.monotonic() - self.ttl
+        while self._sessions:
+            user_id, session = next(iter(self._sessions.items()))
+            if session.last_access < cutoff:
+                self._drop(user_id, "ttl")
+            elif self.bytes > self.max_bytes and len(self._sessions) > 1:
+                self._drop(user_id, "memory")
+            else:
+                break
+
+    def export(self) -> list[tuple[int, str, list[str], float]]:
+        """(user id, query, job hashes, idle seconds) of every live session."""
+        now = time.monotonic()
+        return [(user_id, session.query, session.hashes, now - session.last_access)
+                for user_id, session in self._sessions.items() if now - session.last_access <= self.ttl]
+
+    def last_queries(self) -> list[tuple[int, str]]:
+        return list(self._last_queries.items())
+
+    def restore(self, sessions: list[tuple[int, str, list[str], float]], last_queries: list[tuple[int, str]]):
+        """
+        Add exported sessions (least recently used first) and remembered
+        queries. Sessions idle for longer than the TTL only keep their query;
+        jobs are not checked, they come from the JobStore fallback.
+        """
+        for user_id, query in last_queries:
+            if user_id not in self._sessions:
+                self._last_queries[user_id] = query
+        now = time.monotonic()
+        for user_id, query, hashes, idle in sessions:
+            if user_id in self._sessions:
+                continue
+            if idle > self.ttl:
+                self._last_queries[user_id] = query
+                continue
+            session = Session(query, hashes)
+            session.last_access = now - idle
+            self._sessions[user_id] = session
+            self.bytes += session.size
+        while len(self._last_queries) > self.max_queries:
+            self._last_queries.popitem(last=False)
+        self._evict()
+
+    def __contains__(self, user_id: int) -> bool:
+        return self.get(user_id) is not None
+
+    def __len__(self) -> int:
+        return len(self._sessions)
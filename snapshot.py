@@ -0,0 +1,234 @@
+"""
+💾 Snapshot Module
+Carries the in-memory caches over a restart:
+  → write_snapshot(): JOB_CACHE, live search sessions (with their idle time),
+    remembered queries and the translation cache in one compact binary file
+  → Snapshot: memory-maps that file on start. Only the small job index and
+    the sessions are parsed up front; a job is decompressed the first time
+    it is asked for (see JobStore.fallback) and the translations when
+    translations() is called, off the event loop
+
+Layout (big-endian):
+    magic | header | job index | sessions | last queries | translations | jobs
+    header       created (unix time), job/session/query counts, translations length
+    job index    [key len u8][key][offset u64][length u32] per job
+    sessions     [user id i64][idle seconds f64][query len u16][query][n u16][n × (len u8, hash)]
+    last queries [user id i64][query len u16][query]
+    translations zlib(JSON object)
+    jobs         zlib(JSON) per job, at the offsets in the index
+"""
+
+import os
+import mmap
+import time
+import zlib
+import struct
+import logging
+from typing import Iterable, Optional
+
+import fast_json
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"JOBSNAP\x01"
+_HEADER = struct.Struct(">dIIIQ")
+_INDEX_ENTRY = struct.Struct(">QI")
+_SESSION = struct.Struct(">qd")
+_USER = struct.Struct(">q")
+_U8 = struct.Struct(">B")
+_U16 = struct.Struct(">H")
+
+COMPRESS_LEVEL = 1  # Snapshots are written at shutdown, favour speed
+
+
+def _short(text: str, limit: int) -> bytes:
+    """`text` as UTF-8, cut to `limit` bytes on a character boundary."""
+    raw = text.encode("utf-8")
+    return raw if len(raw) <= limit else raw[:limit].decode("utf-8", "ignore").encode("utf-8")
+
+
+def encode_job(job: dict) -> bytes:
+    return zlib.compress(fast_json.dumps(job), COMPRESS_LEVEL)
+
+
+def write_snapshot(
+    path: str,
+    jobs: Iterable[tuple[str, bytes]],
+    sessions: Iterable[tuple[int, str, list[str], float]],
+    last_queries: Iterable[tuple[int, str]],
+    translations: dict,
+    previous: Optional["Snapshot"] = None,
+) -> dict:
+    """
+    Write a snapshot atomically (temp file + rename).
+
+    Args:
+        jobs: (hash, encode_job(job)) pairs; the first of a hash wins
+        sessions: (user id, query, job hashes, idle seconds)
+        last_queries: (user id, query) of dropped sessions
+        translations: The translation cache
+        previous: Snapshot open on `path`, closed before it is replaced
+
+    Returns counts and the file size, for the log.
+    """
+    index, records, seen = bytearray(), [], set()
+    for job_hash, record in jobs:
+        key = job_hash.encode("ascii")
+        if job_hash in seen or len(key) > 255:
+            continue
+        seen.add(job_hash)
+        records.append((key, record))
+
+    session_bytes, n_sessions = bytearray(), 0
+    for user_id, query, hashes, idle in sessions:
+        raw_query = _short(query, 65535)
+        hashes = [h.encode("ascii") for h in hashes[:65535]]
+        session_bytes += _SESSION.pack(user_id, idle) + _U16.pack(len(raw_query)) + raw_query + _U16.pack(len(hashes))
+        for key in hashes:
+            session_bytes += _U8.pack(len(key)) + key
+        n_sessions += 1
+
+    query_bytes, n_queries = bytearray(), 0
+    for user_id, query in last_queries:
+        raw_query = _short(query, 65535)
+        query_bytes += _USER.pack(user_id) + _U16.pack(len(raw_query)) + raw_query
+        n_queries += 1
+
+    translation_bytes = zlib.compress(fast_json.dumps(translations), COMPRESS_LEVEL)
+
+    index_size = sum(_U8.size + len(key) + _INDEX_ENTRY.size for key, _ in records)
+    offset = len(_MAGIC) + _HEADER.size + index_size + len(session_bytes) + len(query_bytes) + len(translation_bytes)
+    for key, record in records:
+        index += _U8.pack(len(key)) + key + _INDEX_ENTRY.pack(offset, len(record))
+        offset += len(record)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_MAGIC)
+        f.write(_HEADER.pack(time.time(), len(records), n_sessions, n_queries, len(translation_bytes)))
+        f.write(index)
+        f.write(session_bytes)
+        f.write(query_bytes)
+        f.write(translation_bytes)
+        for _, record in records:
+            f.write(record)
+    if previous is not None:
+        previous.close()  # Windows can't replace a mapped file
+    os.replace(tmp_path, path)
+    return {"jobs": len(records), "sessions": n_sessions, "queries": n_queries,
+            "translations": len(translations), "bytes": offset}
+
+
+class Snapshot:
+    """A snapshot file mapped into memory. Use Snapshot.open()."""
+
+    def __init__(self, path: str, file, mapped: mmap.mmap):
+        self.path = path
+        self._file = file
+        self._map = mapped
+        self.created, n_jobs, n_sessions, n_queries, translations_length = _HEADER.unpack_from(mapped, len(_MAGIC))
+        offset = len(_MAGIC) + _HEADER.size
+
+        # hash → (offset, length) of jobs not handed out yet
+        self._jobs: dict[str, tuple[int, int]] = {}
+        for _ in range(n_jobs):
+            key_len = mapped[offset]
+            key = mapped[offset + 1:offset + 1 + key_len].decode("ascii")
+            offset += 1 + key_len
+            self._jobs[key] = _INDEX_ENTRY.unpack_from(mapped, offset)
+            offset += _INDEX_ENTRY.size
+
+        self.sessions: list[tuple[int, str, list[str], float]] = []
+        for _ in range(n_sessions):
+            user_id, idle = _SESSION.unpack_from(mapped, offset)
+            offset += _SESSION.size
+            query, offset = self._read_text(offset)
+            count = _U16.unpack_from(mapped, offset)[0]
+            offset += _U16.size
+            hashes = []
+            for _ in range(count):
+                key_len = mapped[offset]
+                hashes.append(mapped[offset + 1:offset + 1 + key_len].decode("ascii"))
+                offset += 1 + key_len
+            self.sessions.append((user_id, query, hashes, idle))
+
+        self.last_queries: list[tuple[int, str]] = []
+        for _ in range(n_queries):
+            user_id = _USER.unpack_from(mapped, offset)[0]
+            query, offset = self._read_text(offset + _USER.size)
+            self.last_queries.append((user_id, query))
+
+        self._translations = (offset, translations_length)
+
+    @classmethod
+    def open(cls, path: str) -> Optional["Snapshot"]:
+        """The snapshot at `path`, or None if there is none or it can't be read."""
+        if not path or not os.path.exists(path):
+            return None
+        f = open(path, "rb")
+        mapped = None
+        try:
+            if os.fstat(f.fileno()).st_size < len(_MAGIC) + _HEADER.size:
+                raise ValueError("truncated")
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            if mapped[:len(_MAGIC)] != _MAGIC:
+                raise ValueError("unknown format")
+            return cls(path, f, mapped)
+        except (ValueError, IndexError, struct.error, UnicodeDecodeError, OSError) as e:
+            if mapped is not None:
+                mapped.close()
+            f.close()
+            logger.error(f"Ignoring snapshot {path}: {e}")
+            return None
+
+    def _read_text(self, offset: int) -> tuple[str, int]:
+        length = _U16.unpack_from(self._map, offset)[0]
+        start = offset + _U16.size
+        return self._map[start:start + length].decode("utf-8"), start + length
+
+    @property
+    def age(self) -> float:
+        """Seconds since the snapshot was written."""
+        return max(0.0, time.time() - self.created)
+
+    def job(self, job_hash: str) -> Optional[dict]:
+        """Decode a job (once: it is meant to move into the JobStore), or None."""
+        if self._map is None:
+            return None
+        entry = self._jobs.pop(job_hash, None)
+        if entry is None:
+            return None
+        offset, length = entry
+        try:
+            return fast_json.loads(zlib.decompress(self._map[offset:offset + length]))
+        except (zlib.error, ValueError) as e:
+            logger.error(f"Corrupt job {job_hash} in snapshot: {e}")
+            return None
+
+    def job_records(self) -> list[tuple[str, bytes]]:
+        """(hash, encoded job) of every job not decoded yet, to carry into the next snapshot."""
+        if self._map is None:
+            return []
+        return [(job_hash, self._map[offset:offset + length]) for job_hash, (offset, length) in self._jobs.items()]
+
+    def translations(self) -> dict:
+        """The translation cache (decompressed on every call)."""
+        if self._map is None:
+            return {}
+        offset, length = self._translations
+        try:
+            return fast_json.loads(zlib.decompress(self._map[offset:offset + length]))
+        except (zlib.error, ValueError) as e:
+            logger.error(f"Corrupt translations in snapshot: {e}")
+            return {}
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+            self._map = None
+            self._jobs.clear()
+
+    def __len__(self) -> int:
+        """Jobs not decoded yet."""
+        return len(self._jobs)
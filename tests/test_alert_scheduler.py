@@ -0,0 +1,166 @@
+import datetime
+
+from alert_scheduler import AlertScheduler, parse_alert_time, parse_timezone
+
+UTC = datetime.timezone.utc
+
+
+def at(day: int, hour: int, minute: int = 0) -> datetime.datetime:
+    return datetime.datetime(2026, 3, day, hour, minute, tzinfo=UTC)
+
+
+def scheduler(tmp_path, **kwargs) -> AlertScheduler:
+    kwargs.setdefault("window_minutes", 0)  # Every shard at the base time
+    s = AlertScheduler(str(tmp_path / "prefs.json"), str(tmp_path / "checkpoint.log"), **kwargs)
+    s.load()
+    return s
+
+
+# ─── Test: parsing ───────────────────────────────────────────────
+
+class TestParsing:
+
+    def test_alert_time(self):
+        assert parse_alert_time("07:30") == datetime.time(7, 30)
+        assert parse_alert_time("25:00") is None
+        assert parse_alert_time("seven") is None
+
+    def test_timezone(self):
+        assert parse_timezone("+05:30").utcoffset(None) == datetime.timedelta(hours=5, minutes=30)
+        assert parse_timezone("-04").utcoffset(None) == datetime.timedelta(hours=-4)
+        assert parse_timezone("Europe/London") is not None
+        assert parse_timezone("+15:00") is None
+        assert parse_timezone("Mars/Olympus") is None
+
+
+# ─── Test: slots ─────────────────────────────────────────────────
+
+class TestSlots:
+
+    def test_default_slot_is_nine_in_kolkata(self, tmp_path):
+        s = scheduler(tmp_path)
+        s.track(["u1"], now=at(1, 0))
+        assert s.due_users(now=at(1, 3, 29)) == []
+        assert s.due_users(now=at(1, 3, 30)) == ["u1"]  # 09:00 IST
+
+    def test_user_time_zone(self, tmp_path):
+        s = scheduler(tmp_path)
+        s.prefs["u1"] = {"time": "08:00", "tz": "America/New_York"}
+        s.track(["u1"], now=at(10, 0))
+        # 2026-03-10 is after the US switch to daylight time: 08:00 EDT = 12:00 UTC
+        assert s.due_users(now=at(10, 11, 59)) == []
+        assert s.due_users(now=at(10, 12, 0)) == ["u1"]
+
+    def test_set_preference_reschedules(self, tmp_path):
+        s = scheduler(tmp_path)
+        s.track(["u1"], now=at(1, 0))
+        s.set_preference("u1", "06:00", "+00:00")
+        now = datetime.datetime.now(UTC)
+        slot = s.next_slot("u1", now)
+        assert (slot.hour, slot.minute) == (6, 0)
+        assert s.upcoming(slot) == ["u1"]
+
+    def test_shards_spread_over_window(self, tmp_path):
+        s = scheduler(tmp_path, window_minutes=60, num_shards=12)
+        day = datetime.date(2026, 3, 1)
+        base = s.slot_for("nobody", day, (datetime.time(9), UTC, datetime.timedelta(0)))
+        offsets = {s.slot_for(f"u{n}", day) - base for n in range(200)}
+        # Users default to Kolkata: base 09:00 UTC is 5.5 h after their 09:00 IST
+        offsets = {o + datetime.timedelta(hours=5, minutes=30) for o in offsets}
+        assert offsets == {datetime.timedelta(minutes=5 * k) for k in range(12)}
+
+    def test_slot_rolled_past_midnight(self, tmp_path):
+        s = scheduler(tmp_path, window_minutes=60, num_shards=2)
+        user = next(f"u{n}" for n in range(100) if s.shard_of(f"u{n}") == 1)  # +30 min
+        s.prefs[user] = {"time": "23:50", "tz": "UTC"}
+        s.track([user], now=at(1, 12))
+        assert s.due_users(now=at(2, 0, 19)) == []
+        assert s.due_users(now=at(2, 0, 20)) == [user]
+
+
+# ─── Test: delivery ──────────────────────────────────────────────
+
+class TestDelivery:
+
+    def test_delivered_user_due_again_next_day(self, tmp_path):
+        s = scheduler(tmp_path)
+        s.track(["u1"], now=at(1, 0))
+        assert s.due_users(now=at(1, 3, 30)) == ["u1"]
+        s.mark_delivered("u1", now=at(1, 3, 31))
+        assert s.due_users(now=at(1, 20)) == []
+        assert s.due_users(now=at(2, 3, 29)) == []
+        assert s.due_users(now=at(2, 3, 30)) == ["u1"]
+
+    def test_due_until_marked(self, tmp_path):
+        s = scheduler(tmp_path)
+        s.track(["u1"], now=at(1, 0))
+        assert s.due_users(now=at(1, 3, 30)) == ["u1"]
+        assert s.due_users(now=at(1, 3, 31)) == ["u1"]
+
+    def test_failed_user_retried_later(self, tmp_path):
+        s = scheduler(tmp_path, retry_minutes=10)
+        s.track(["u1"], now=at(1, 0))
+        s.due_users(now=at(1, 3, 30))
+        s.mark_failed("u1", now=at(1, 3, 31))
+        assert s.due_users(now=at(1, 3, 40)) == []
+        assert s.due_users(now=at(1, 3, 41)) == ["u1"]
+
+    def test_failure_past_lateness_moves_to_next_day(self, tmp_path):
+        s = scheduler(tmp_path, max_lateness_hours=1, retry_minutes=10)
+        s.track(["u1"], now=at(1, 0))
+        s.due_users(now=at(1, 4, 25))
+        s.mark_failed("u1", now=at(1, 4, 25))
+        assert s.due_users(now=at(1, 12)) == []
+        assert s.due_users(now=at(2, 3, 30)) == ["u1"]
+
+    def test_too_late_slot_skipped(self, tmp_path):
+        s = scheduler(tmp_path, max_lateness_hours=12)
+        s.track(["u1"], now=at(1, 16))  # 12.5 h after the slot
+        assert s.due_users(now=at(1, 16)) == []
+        assert s.due_users(now=at(2, 3, 30)) == ["u1"]
+
+    def test_inactive_users_forgotten(self, tmp_path):
+        s = scheduler(tmp_path)
+        s.track(["u1", "u2"], now=at(1, 0))
+        assert s.due_users(now=at(1, 3, 30), active={"u2"}) == ["u2"]
+        assert s.due_users(now=at(1, 3, 31)) == ["u2"]
+
+    def test_max_per_tick(self, tmp_path):
+        s = scheduler(tmp_path, max_per_tick=3)
+        s.track([f"u{n}" for n in range(10)], now=at(1, 0))
+        first = s.due_users(now=at(1, 3, 30))
+        assert len(first) == 3
+        for user_id in first:
+            s.mark_delivered(user_id, now=at(1, 3, 30))
+        second = s.due_users(now=at(1, 3, 31))
+        assert len(second) == 3 and not set(first) & set(second)
+
+
+# ─── Test: crash resume ──────────────────────────────────────────
+
+class TestCrashResume:
+
+    def test_restart_skips_users_served_today(self, tmp_path):
+        s = scheduler(tmp_path)
+        s.track(["u1", "u2", "u3"], now=at(1, 0))
+        assert sorted(s.due_users(now=at(1, 3, 30))) == ["u1", "u2", "u3"]
+        s.mark_delivered("u1", now=at(1, 3, 30))
+        s.mark_delivered("u2", now=at(1, 3, 31))
+        # Crash before u3; a new process replays the checkpoint log
+        restarted = scheduler(tmp_path)
+        restarted.track(["u1", "u2", "u3"], now=at(1, 3, 35))
+        assert restarted.due_users(now=at(1, 3, 35)) == ["u3"]
+        assert sorted(restarted.due_users(now=at(2, 3, 30))) == ["u1", "u2", "u3"]
+
+    def test_compacted_log_keeps_active_users(self, tmp_path):
+        s = scheduler(tmp_path)
+        s.track(["u1", "u2"], now=at(1, 0))
+        s.due_users(now=at(1, 3, 30))
+        s.mark_delivered("u1", now=at(1, 3, 30))
+        s.mark_delivered("u2", now=at(1, 3, 30))
+        s.mark_delivered("u1", now=at(2, 3, 30))
+        s.compact_checkpoint(["u1"])
+        lines = (tmp_path / "checkpoint.log").read_text().splitlines()
+        assert lines == ["2026-03-02 u1"]
+        restarted = scheduler(tmp_path)
+        assert restarted.delivered == {"u1": "2026-03-02"}
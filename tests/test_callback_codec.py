@@ -0,0 +1,112 @@
+import base64
+
+import pytest
+
+from callback_codec import ACTIONS, MAX_CALLBACK_BYTES, PREFIX, CallbackCodec, parse_legacy
+
+SECRET = b"test-secret"
+JOB_HASH = "0123456789"
+EXAMPLES = {
+    "lang": ("hi",),
+    "save": (JOB_HASH,),
+    "unsave": (JOB_HASH,),
+    "applied": (JOB_HASH,),
+    "status": (JOB_HASH, "interview_scheduled"),
+    "remapp": (JOB_HASH,),
+    "page": (3, -1001234567890),
+    "new_search": (),
+}
+
+
+def raw_bytes(data: str) -> bytearray:
+    encoded = data[len(PREFIX):]
+    return bytearray(base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4)))
+
+
+def to_data(raw: bytes) -> str:
+    return PREFIX + base64.urlsafe_b64encode(bytes(raw)).decode("ascii").rstrip("=")
+
+
+# ─── Test: signed payloads ───────────────────────────────────────
+
+class TestSignedPayloads:
+
+    def test_every_action_round_trips(self):
+        assert set(EXAMPLES) == set(ACTIONS)
+        codec = CallbackCodec(SECRET)
+        for action, args in EXAMPLES.items():
+            data = codec.encode(action, *args)
+            assert len(data.encode("utf-8")) <= MAX_CALLBACK_BYTES
+            assert codec.decode(data) == (action, args)
+            assert codec.parse(data) == (action, args)
+
+    def test_other_secret_rejected(self):
+        data = CallbackCodec(b"attacker").encode("page", 0, 42)
+        assert CallbackCodec(SECRET).decode(data) is None
+
+    def test_tampered_body_rejected(self):
+        codec = CallbackCodec(SECRET)
+        raw = raw_bytes(codec.encode("page", 1, 42))
+        raw[3] ^= 0x01  # Part of the user id
+        assert codec.decode(to_data(raw)) is None
+
+    def test_tampered_signature_rejected(self):
+        codec = CallbackCodec(SECRET)
+        raw = raw_bytes(codec.encode("save", JOB_HASH))
+        raw[-1] ^= 0x80
+        assert codec.decode(to_data(raw)) is None
+
+    def test_truncated_and_garbage_rejected(self):
+        codec = CallbackCodec(SECRET)
+        data = codec.encode("status", JOB_HASH, "applied")
+        assert codec.decode(data[:-4]) is None
+        assert codec.decode(PREFIX + "!!!") is None
+        assert codec.decode(PREFIX) is None
+
+    def test_payload_over_limit_refused(self):
+        codec = CallbackCodec(SECRET)
+        with pytest.raises(ValueError):
+            codec.encode("status", JOB_HASH, "x" * 40)
+
+    def test_bad_arguments_refused(self):
+        codec = CallbackCodec(SECRET)
+        with pytest.raises(ValueError):
+            codec.encode("save", "abc")
+        with pytest.raises(ValueError):
+            codec.encode("page", 1)
+
+
+# ─── Test: legacy payloads ───────────────────────────────────────
+
+class TestLegacyPayloads:
+
+    def test_rejected_without_window(self):
+        assert CallbackCodec(SECRET).parse(f"save_{JOB_HASH}", now=0) is None
+
+    def test_accepted_before_legacy_until(self):
+        codec = CallbackCodec(SECRET, legacy_until=1000.0)
+        assert codec.parse(f"save_{JOB_HASH}", now=999.0) == ("save", (JOB_HASH,))
+
+    def test_rejected_from_legacy_until_on(self):
+        codec = CallbackCodec(SECRET, legacy_until=1000.0)
+        assert codec.parse(f"save_{JOB_HASH}", now=1000.0) is None
+        assert codec.parse(f"save_{JOB_HASH}", now=2000.0) is None
+
+    def test_signed_payloads_unaffected_by_window(self):
+        codec = CallbackCodec(SECRET, legacy_until=1000.0)
+        data = codec.encode("new_search")
+        assert codec.parse(data, now=2000.0) == ("new_search", ())
+
+    def test_status_keys_with_underscores(self):
+        assert parse_legacy(f"status_{JOB_HASH}_interview_scheduled") == (
+            "status", (JOB_HASH, "interview_scheduled"))
+        assert parse_legacy(f"status_{JOB_HASH}") is None
+
+    def test_page(self):
+        assert parse_legacy("page_2_-100123") == ("page", (2, -100123))
+        assert parse_legacy("page_x_1") is None
+
+    def test_unknown_and_bare(self):
+        assert parse_legacy("new_search") == ("new_search", ())
+        assert parse_legacy("delete_0123456789") is None
+        assert parse_legacy("save_") is None
@@ -0,0 +1,52 @@
+import numpy as np
+
+import resume_matcher
+from resume_matcher import JobIndex, ResumeProfile
+
+RESUME = "Python developer with 4 years of Django, PostgreSQL and AWS. 2019 - 2023 at Acme."
+
+
+def job(n: int, batch: int) -> tuple[str, dict]:
+    # Every batch brings its own words, so dropped jobs leave dead terms behind
+    return f"b{batch}-{n}", {
+        "title": f"Python Developer {n}",
+        "skills": "Python, Django" if n % 2 else "Java, Spring",
+        "description": " ".join(f"word{batch}x{n}x{i}" for i in range(40)),
+        "experience_months": 24 * (n % 4),
+    }
+
+
+# ─── Test: JobIndex ──────────────────────────────────────────────
+
+class TestJobIndex:
+
+    def test_vocabulary_compacted_after_rebuilds(self, monkeypatch):
+        monkeypatch.setattr(resume_matcher, "MIN_COMPACT_TERMS", 0)
+        index, profile = JobIndex(), ResumeProfile(RESUME)
+        for batch in range(10):
+            index.sync(job(n, batch) for n in range(50))
+            index.score(profile)
+        used = {int(t) for doc in index._docs.values() for t in doc[0]}
+        assert len(index.vocabulary) <= 2 * len(used)
+        assert set(index.vocabulary.values()) >= used
+
+    def test_compacted_scores_match_fresh_index(self, monkeypatch):
+        monkeypatch.setattr(resume_matcher, "MIN_COMPACT_TERMS", 0)
+        profile = ResumeProfile(RESUME)
+        index = JobIndex()
+        for batch in range(5):
+            index.sync(job(n, batch) for n in range(30))
+            index.score(profile)
+        fresh = JobIndex()
+        fresh.sync(job(n, 4) for n in range(30))
+        hashes, scores = index.score(profile)
+        fresh_hashes, fresh_scores = fresh.score(profile)
+        assert hashes == fresh_hashes
+        assert np.allclose(scores, fresh_scores, atol=1e-6)
+
+    def test_top_prefers_matching_skills(self):
+        index = JobIndex()
+        index.sync(job(n, 0) for n in range(10))
+        best = index.top(ResumeProfile(RESUME), k=3)
+        assert len(best) == 3
+        assert all("Django" in j["skills"] for j, _ in best)
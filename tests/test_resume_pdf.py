@@ -0,0 +1,83 @@
+import asyncio
+import contextlib
+
+import httpx
+import pytest
+
+import resume_pdf
+from resume_pdf import FileTooLargeError
+
+
+class FakeFile:
+    def __init__(self, file_path: str, file_size=None):
+        self.file_path = file_path
+        self.file_size = file_size
+
+
+class FakeRequest:
+    """Stands in for bot.request: streams from an in-process transport."""
+
+    def __init__(self, body: bytes, content_length: bool = True):
+        self.body = body
+        self.content_length = content_length
+        self.chunks_sent = 0
+
+    def _handler(self, request: httpx.Request) -> httpx.Response:
+        def chunks():
+            for start in range(0, len(self.body), 1024):
+                self.chunks_sent += 1
+                yield self.body[start:start + 1024]
+        headers = {"content-length": str(len(self.body))} if self.content_length else {}
+        return httpx.Response(200, headers=headers, stream=_Stream(chunks()))
+
+    @contextlib.asynccontextmanager
+    async def stream(self, url: str):
+        async with httpx.AsyncClient(transport=httpx.MockTransport(self._handler)) as client:
+            async with client.stream("GET", url) as response:
+                yield response
+
+
+class _Stream(httpx.AsyncByteStream):
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+URL = "https://api.telegram.org/file/bot123/documents/file_1.pdf"
+
+
+# ─── Test: download ──────────────────────────────────────────────
+
+class TestDownload:
+
+    def test_returns_body_under_cap(self):
+        body = b"%PDF" + b"x" * 5000
+        data = asyncio.run(resume_pdf.download(FakeFile(URL), 10_000, FakeRequest(body)))
+        assert data == body
+
+    def test_declared_size_rejected_before_fetch(self):
+        request = FakeRequest(b"x" * 100)
+        with pytest.raises(FileTooLargeError):
+            asyncio.run(resume_pdf.download(FakeFile(URL, file_size=20_000), 10_000, request))
+        assert request.chunks_sent == 0
+
+    def test_content_length_over_cap(self):
+        request = FakeRequest(b"x" * 50_000)
+        with pytest.raises(FileTooLargeError):
+            asyncio.run(resume_pdf.download(FakeFile(URL), 10_000, request))
+
+    def test_stream_aborts_once_past_cap(self):
+        # No Content-Length and no file_size: only the chunk count stops it
+        request = FakeRequest(b"x" * 200_000, content_length=False)
+        with pytest.raises(FileTooLargeError):
+            asyncio.run(resume_pdf.download(FakeFile(URL), 10_000, request))
+        assert request.chunks_sent < 200
+
+    def test_local_path(self, tmp_path):
+        path = tmp_path / "resume.pdf"
+        path.write_bytes(b"%PDF local")
+        data = asyncio.run(resume_pdf.download(FakeFile(str(path)), 10_000, request=None))
+        assert data == b"%PDF local"
@@ -0,0 +1,83 @@
+import pytest
+
+from salary import SalaryIndex, SalaryIndexCache, annotate, annualize, parse_salary_text
+
+USD = 83.0
+
+
+# ─── Test: parse_salary_text() ───────────────────────────────────
+
+class TestParseSalaryText:
+
+    @pytest.mark.parametrize("text, expected", [
+        ("₹5-8 LPA", (500_000, 800_000)),
+        ("CTC 12 lakh", (1_200_000, 1_200_000)),
+        ("₹40,000 per month", (480_000, 480_000)),
+        ("Rs. 25,000 stipend", (300_000, 300_000)),
+        ("Rs 4,00,000 to Rs 6,00,000", (400_000, 600_000)),
+        ("INR 15L - 20L per annum", (1_500_000, 2_000_000)),
+    ])
+    def test_inr(self, text, expected):
+        assert parse_salary_text(text) == pytest.approx(expected)
+
+    @pytest.mark.parametrize("text, expected", [
+        ("$120k a year", (120_000 * USD, 120_000 * USD)),
+        ("Salary: $5,000 monthly", (60_000 * USD, 60_000 * USD)),
+        ("Pay: $25.00 per hour", (25 * 2080 * USD, 25 * 2080 * USD)),
+    ])
+    def test_usd(self, text, expected):
+        assert parse_salary_text(text) == pytest.approx(expected)
+
+    def test_years_is_not_rupees(self):
+        # "rs" inside "years" used to mark this as INR and make it monthly
+        assert parse_salary_text("$100k, 5+ years") == pytest.approx((100_000 * USD, 100_000 * USD))
+
+    def test_hours_is_not_rupees(self):
+        result = parse_salary_text("$50 - $60 per hour, 40 hours per week")
+        assert result == pytest.approx((50 * 2080 * USD, 60 * 2080 * USD))
+
+    def test_engineers_is_not_rupees(self):
+        assert parse_salary_text("Salary for engineers: $90k") == pytest.approx((90_000 * USD, 90_000 * USD))
+
+    def test_401k_is_not_pay(self):
+        assert parse_salary_text("Benefits include 401k") is None
+
+    def test_k_with_pay_context(self):
+        assert parse_salary_text("Salary 80k", "USD") == pytest.approx((80_000 * USD, 80_000 * USD))
+
+    def test_small_amount_without_period_is_ignored(self):
+        assert parse_salary_text("Team of 25 people") is None
+
+    def test_experience_is_not_pay(self):
+        assert parse_salary_text("3-5 years of experience") is None
+
+
+# ─── Test: annotate() / SalaryIndex ─────────────────────────────
+
+class TestSalaryIndex:
+
+    def test_structured_fields_win(self):
+        job = annotate({"salary_min": 1000, "salary_max": 2000, "salary_currency": "USD"}, ["₹5 LPA"])
+        assert (job["salary_min_inr"], job["salary_max_inr"]) == (1000 * USD, 2000 * USD)
+
+    def test_at_least_keeps_unknown_pay(self):
+        jobs = [
+            {"title": "low", "salary_min_inr": 300_000, "salary_max_inr": 400_000},
+            {"title": "unknown", "salary_min_inr": None, "salary_max_inr": None},
+            {"title": "high", "salary_min_inr": 1_500_000, "salary_max_inr": 2_000_000},
+            {"title": "mid", "salary_min_inr": 900_000, "salary_max_inr": 1_000_000},
+        ]
+        index = SalaryIndex(jobs)
+        assert [j["title"] for j in index.at_least(1_000_000)] == ["unknown", "high", "mid"]
+        assert [j["title"] for j in index.at_least(1_000_000, by_salary=True)] == ["high", "mid", "unknown"]
+
+    def test_cache_reuses_index_per_list(self):
+        cache = SalaryIndexCache(max_entries=2)
+        jobs = [{"salary_min_inr": 1, "salary_max_inr": 2}]
+        assert cache.get(jobs) is cache.get(jobs)
+        assert cache.get(list(jobs)) is not cache.get(jobs)
+
+    def test_annualize(self):
+        assert annualize(40_000, "MONTH") == 480_000
+        assert annualize(100, None) == 100
+        assert annualize(None, "HOUR") is None
@@ -0,0 +1,137 @@
+import hashlib
+import os
+
+from seen_filter import GENERATION_CAPACITY, SeenFilter, SeenStore
+
+
+def job_hash(n: int) -> str:
+    # Same shape as bot.get_job_hash(): 10 hex digits of an md5
+    return hashlib.md5(f"job-{n}".encode()).hexdigest()[:10]
+
+
+# ─── Test: SeenFilter ────────────────────────────────────────────
+
+class TestSeenFilter:
+
+    def test_no_false_negatives(self):
+        seen = SeenFilter()
+        hashes = [job_hash(n) for n in range(GENERATION_CAPACITY)]
+        for h in hashes:
+            seen.add(h)
+        assert all(h in seen for h in hashes)
+
+    def test_false_positive_rate_at_capacity(self):
+        seen = SeenFilter()
+        for n in range(GENERATION_CAPACITY):
+            seen.add(job_hash(n))
+        probes = [job_hash(n) for n in range(100_000, 120_000)]
+        rate = sum(h in seen for h in probes) / len(probes)
+        assert rate < 0.02  # ~0.9% expected for 1024 bits, 5 hashes, 100 items
+
+    def test_false_positive_rate_with_both_generations_full(self):
+        seen = SeenFilter()
+        for n in range(2 * GENERATION_CAPACITY):
+            seen.add(job_hash(n))
+        probes = [job_hash(n) for n in range(100_000, 120_000)]
+        rate = sum(h in seen for h in probes) / len(probes)
+        assert rate < 0.04
+
+    def test_rotation_keeps_previous_generation(self):
+        seen = SeenFilter()
+        first = [job_hash(n) for n in range(GENERATION_CAPACITY)]
+        for h in first:
+            seen.add(h)
+        seen.add(job_hash(GENERATION_CAPACITY))  # Rotates: `first` is now the previous generation
+        assert seen.count == 1
+        assert all(h in seen for h in first)
+
+    def test_rotation_forgets_oldest_generation(self):
+        seen = SeenFilter()
+        first = [job_hash(n) for n in range(GENERATION_CAPACITY)]
+        for n in range(3 * GENERATION_CAPACITY):
+            seen.add(job_hash(n))
+        remembered = sum(h in seen for h in first)
+        assert remembered < GENERATION_CAPACITY * 0.05  # Only false positives are left
+
+    def test_adding_a_seen_hash_does_not_count(self):
+        seen = SeenFilter()
+        seen.add(job_hash(1))
+        seen.add(job_hash(1))
+        assert seen.count == 1
+
+
+# ─── Test: SeenStore ─────────────────────────────────────────────
+
+class TestSeenStore:
+
+    def reload(self, path) -> SeenStore:
+        store = SeenStore(str(path))
+        store.load()
+        return store
+
+    def test_round_trip(self, tmp_path):
+        path = tmp_path / "seen.bin"
+        store = SeenStore(str(path))
+        store.mark_seen("1:1", [job_hash(1), job_hash(2)])
+        store.mark_seen("2:1", [job_hash(3)])
+        store.save()
+
+        loaded = self.reload(path)
+        assert loaded.unseen("1:1", [job_hash(1), job_hash(2), job_hash(4)]) == [job_hash(4)]
+        assert loaded.unseen("2:1", [job_hash(3)]) == []
+
+    def test_save_updates_records_in_place(self, tmp_path):
+        path = tmp_path / "seen.bin"
+        store = SeenStore(str(path))
+        store.mark_seen("1:1", [job_hash(1)])
+        store.mark_seen("2:1", [job_hash(2)])
+        store.save()
+        size = os.path.getsize(path)
+
+        store.mark_seen("1:1", [job_hash(5)])
+        store.save()
+        assert os.path.getsize(path) == size
+        assert self.reload(path).unseen("1:1", [job_hash(1), job_hash(5)]) == []
+
+    def test_new_subscription_is_appended(self, tmp_path):
+        path = tmp_path / "seen.bin"
+        store = SeenStore(str(path))
+        store.mark_seen("1:1", [job_hash(1)])
+        store.save()
+        store.mark_seen("3:1", [job_hash(7)])
+        store.save()
+        assert set(self.reload(path).filters) == {"1:1", "3:1"}
+
+    def test_forget_survives_reload(self, tmp_path):
+        path = tmp_path / "seen.bin"
+        store = SeenStore(str(path))
+        for key in ("1:1", "2:1", "3:1"):
+            store.mark_seen(key, [job_hash(1)])
+        store.save()
+        store.forget("2:1")
+        store.save()
+
+        loaded = self.reload(path)
+        assert set(loaded.filters) == {"1:1", "3:1"}
+        assert loaded.unseen("2:1", [job_hash(1)]) == [job_hash(1)]
+
+    def test_forget_then_resubscribe(self, tmp_path):
+        path = tmp_path / "seen.bin"
+        store = SeenStore(str(path))
+        store.mark_seen("1:1", [job_hash(1)])
+        store.save()
+        store.forget("1:1")
+        store.mark_seen("1:1", [job_hash(2)])
+        store.save()
+
+        loaded = self.reload(path)
+        assert loaded.unseen("1:1", [job_hash(1), job_hash(2)]) == [job_hash(1)]
+
+    def test_rename_rewrites_file(self, tmp_path):
+        path = tmp_path / "seen.bin"
+        store = SeenStore(str(path))
+        store.mark_seen("1", [job_hash(1)])
+        store.save()
+        store.rename("1", "1:1")
+        store.save()
+        assert set(self.reload(path).filters) == {"1:1"}
@@ -0,0 +1,50 @@
+from session_store import JobStore
+
+
+def full_job() -> dict:
+    return {
+        "title": "Python Developer", "company": "Acme", "location": "Pune",
+        "skills": "Python, Django", "experience": "2 years", "source": "jsearch",
+        "description": "Build things.",
+    }
+
+
+def alert_job() -> dict:
+    # What parse_jobs(view="alert") builds for the same listing
+    return {"title": "Python Developer", "company": "Acme", "location": "Pune, MH",
+            "_raw_description": "<p>Build things.</p>"}
+
+
+# ─── Test: JobStore ──────────────────────────────────────────────
+
+class TestJobStore:
+
+    def test_reduced_view_keeps_richer_fields(self):
+        store = JobStore()
+        store["h1"] = full_job()
+        store["h1"] = alert_job()
+        job = store["h1"]
+        assert job["skills"] == "Python, Django"
+        assert job["experience"] == "2 years"
+        assert job["source"] == "jsearch"
+        assert job["location"] == "Pune, MH"  # Fields both have take the newer value
+
+    def test_private_fields_not_copied(self):
+        store = JobStore()
+        store["h1"] = alert_job()
+        store["h1"] = full_job()
+        assert "_raw_description" not in store["h1"]
+        assert store["h1"]["description"] == "Build things."
+
+    def test_same_dict_stored_again(self):
+        store, job = JobStore(), full_job()
+        store["h1"] = job
+        store["h1"] = job
+        assert store["h1"] is job and len(store) == 1
+
+    def test_byte_budget_evicts_oldest(self):
+        store = JobStore(max_bytes=4000)
+        for n in range(20):
+            store[f"h{n}"] = dict(full_job(), title=f"Job {n}")
+        assert "h19" in store and "h0" not in store
+        assert store.bytes <= 4000
@@ -0,0 +1,82 @@
+from snapshot import Snapshot, encode_job, write_snapshot
+
+JOBS = {
+    "0123456789": {"title": "Python Developer", "company": "Acme", "skills": "Python, Django",
+                   "salary_min_inr": 1200000.0, "is_remote": False},
+    "abcdefabcd": {"title": "डेटा विश्लेषक", "company": "Café Ltd", "location": "Pune"},
+}
+SESSIONS = [(42, "python developer pune", ["0123456789", "abcdefabcd"], 12.5)]
+LAST_QUERIES = [(-1001, "data analyst"), (7, "जावा")]
+TRANSLATIONS = {"hi:Apply Now": "अभी आवेदन करें"}
+
+
+def write(path, **overrides):
+    args = dict(
+        jobs=((h, encode_job(job)) for h, job in JOBS.items()),
+        sessions=SESSIONS, last_queries=LAST_QUERIES, translations=TRANSLATIONS,
+    )
+    args.update(overrides)
+    return write_snapshot(str(path), **args)
+
+
+# ─── Test: Snapshot ──────────────────────────────────────────────
+
+class TestSnapshot:
+
+    def test_round_trip(self, tmp_path):
+        path = tmp_path / "snap.bin"
+        stats = write(path)
+        assert stats["jobs"] == 2 and stats["sessions"] == 1 and stats["queries"] == 2
+
+        snap = Snapshot.open(str(path))
+        try:
+            assert snap.sessions == SESSIONS
+            assert snap.last_queries == LAST_QUERIES
+            assert snap.translations() == TRANSLATIONS
+            assert 0 <= snap.age < 60
+            assert len(snap) == 2
+            for job_hash, job in JOBS.items():
+                assert snap.job(job_hash) == job
+            assert len(snap) == 0
+            assert snap.job("0123456789") is None  # Handed out once
+        finally:
+            snap.close()
+
+    def test_undecoded_jobs_carried_into_next_snapshot(self, tmp_path):
+        path = tmp_path / "snap.bin"
+        write(path)
+        snap = Snapshot.open(str(path))
+        snap.job("0123456789")
+        live = [("fedcba9876", encode_job({"title": "New"}))]
+        write(path, jobs=live + snap.job_records(), sessions=[], last_queries=[], translations={},
+              previous=snap)
+
+        snap = Snapshot.open(str(path))
+        try:
+            assert {h for h, _ in snap.job_records()} == {"fedcba9876", "abcdefabcd"}
+            assert snap.job("abcdefabcd") == JOBS["abcdefabcd"]
+        finally:
+            snap.close()
+
+    def test_first_record_of_a_hash_wins(self, tmp_path):
+        path = tmp_path / "snap.bin"
+        jobs = [("0123456789", encode_job({"title": "newer"})), ("0123456789", encode_job({"title": "older"}))]
+        assert write(path, jobs=jobs)["jobs"] == 1
+        snap = Snapshot.open(str(path))
+        assert snap.job("0123456789") == {"title": "newer"}
+        snap.close()
+
+    def test_missing_or_corrupt_file(self, tmp_path):
+        assert Snapshot.open(str(tmp_path / "none.bin")) is None
+        bad = tmp_path / "bad.bin"
+        bad.write_bytes(b"not a snapshot at all, just some bytes")
+        assert Snapshot.open(str(bad)) is None
+
+    def test_closed_snapshot_is_empty(self, tmp_path):
+        path = tmp_path / "snap.bin"
+        write(path)
+        snap = Snapshot.open(str(path))
+        snap.close()
+        assert snap.job("0123456789") is None
+        assert snap.translations() == {}
+        assert snap.job_records() == []
@@ -0,0 +1,59 @@
+import asyncio
+
+from throttle import Debouncer
+
+
+def record(calls: list, name: str):
+    async def func():
+        calls.append((name, asyncio.get_running_loop().time()))
+    return func
+
+
+# ─── Test: Debouncer ─────────────────────────────────────────────
+
+class TestDebouncer:
+
+    def test_single_call_runs_immediately(self):
+        async def run():
+            debouncer, calls = Debouncer(0.2), []
+            start = asyncio.get_running_loop().time()
+            await debouncer.call("u1", record(calls, "a"))
+            assert calls and calls[0][1] - start < 0.05
+            await debouncer.drain()
+            return calls
+        assert [name for name, _ in asyncio.run(run())] == ["a"]
+
+    def test_burst_runs_first_and_last(self):
+        async def run():
+            debouncer, calls = Debouncer(0.1), []
+            for name in "abcd":
+                await debouncer.call("u1", record(calls, name))
+            await debouncer.drain()
+            return calls
+        assert [name for name, _ in asyncio.run(run())] == ["a", "d"]
+
+    def test_keys_are_independent(self):
+        async def run():
+            debouncer, calls = Debouncer(0.1), []
+            await debouncer.call("u1", record(calls, "a"))
+            await debouncer.call("u2", record(calls, "b"))
+            return calls
+        assert [name for name, _ in asyncio.run(run())] == ["a", "b"]
+
+    def test_window_closes(self):
+        async def run():
+            debouncer, calls = Debouncer(0.05), []
+            await debouncer.call("u1", record(calls, "a"))
+            await asyncio.sleep(0.1)
+            await debouncer.call("u1", record(calls, "b"))
+            await debouncer.drain()
+            return calls
+        assert [name for name, _ in asyncio.run(run())] == ["a", "b"]
+
+    def test_zero_delay_runs_every_call(self):
+        async def run():
+            debouncer, calls = Debouncer(0), []
+            for name in "abc":
+                await debouncer.call("u1", record(calls, name))
+            return calls
+        assert [name for name, _ in asyncio.run(run())] == ["a", "b", "c"]
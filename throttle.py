@@ -0,0 +1,202 @@
+"""
+🚦 Throttle Module
+Keeps single users (and scrapers of the web endpoints) from spending
+everyone's upstream and translation quota:
+  → RateLimiter: sliding-window limits per key and action class
+    ("search", "pdf", "callback", "http"), e.g. 5 searches per 60 s per user
+  → Debouncer: a user's first message is searched at once; the follow-ups
+    (or edits) arriving within the next moment collapse into one search for
+    the last of them
+  → QuotaGovernor: as the RapidAPI quota runs low, searches go local first,
+    then cache-only until the quota resets
+
+clip_query() caps the length of anything a user can send into a search.
+"""
+
+import time
+import asyncio
+import logging
+import threading
+from collections import OrderedDict, deque
+from typing import Awaitable, Callable, Hashable, Optional
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+MAX_QUERY_CHARS = 120
+MAX_QUERY_WORDS = 12
+
+
+def parse_limit(value: Optional[str]) -> Optional[tuple[int, float]]:
+    """"5/60" → 5 events per 60 seconds; empty or "0" → None (unlimited)."""
+    if not value or value.strip() == "0":
+        return None
+    count, _, window = value.partition("/")
+    return int(count), float(window or 60)
+
+
+def clip_query(text: str, max_chars: int = MAX_QUERY_CHARS, max_words: int = MAX_QUERY_WORDS) -> Optional[str]:
+    """`text` as a search query (whitespace collapsed), or None if it is too long to be one."""
+    words = text.split()
+    query = " ".join(words)
+    if len(query) > max_chars or len(words) > max_words:
+        return None
+    return query
+
+
+class RateLimiter:
+    """
+    Sliding-window log: at most `count` events per `window` seconds for each
+    (action, key). Actions without a limit are never refused. Thread-safe,
+    the Flask endpoints call it from their own threads.
+    """
+
+    def __init__(self, limits: dict[str, Optional[tuple[int, float]]], max_keys: int = 50000):
+        self.limits = {action: limit for action, limit in limits.items() if limit}
+        self.max_keys = max_keys
+        # (action, key) → [event timestamps in the window, refusal already reported]
+        self._events: OrderedDict[tuple[str, Hashable], list] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def check(self, action: str, key: Hashable, now: Optional[float] = None) -> tuple[float, bool]:
+        """
+        Record one event. Returns (retry_after, notify): retry_after is 0.0 if
+        the event is allowed, else the seconds until it would be; notify is
+        True for the first refusal since the last allowed event, so the user
+        is told once instead of on every message.
+        """
+        limit = self.limits.get(action)
+        if limit is None:
+            return 0.0, False
+        count, window = limit
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            entry = self._events.get((action, key))
+            if entry is None:
+                entry = self._events[(action, key)] = [deque(), False]
+                while len(self._events) > self.max_keys:
+                    self._events.popitem(last=False)
+            else:
+                self._events.move_to_end((action, key))
+            times = entry[0]
+            while times and times[0] <= now - window:
+                times.popleft()
+            if len(times) < count:
+                times.append(now)
+                entry[1] = False
+                return 0.0, False
+            notify = not entry[1]
+            entry[1] = True
+            retry_after = times[0] + window - now
+        metrics.THROTTLED.labels(action).inc()
+        return retry_after, notify
+
+
+class Debouncer:
+    """
+    Per-key debounce on the leading edge: a call with no recent one for its
+    key runs at once and opens a `delay`-second window. Calls arriving inside
+    the window replace each other, and only the last of them runs when the
+    window closes (opening the next one). A lone call is never delayed; a
+    burst runs twice, for its first and its last call.
+    """
+
+    def __init__(self, delay: float = 1.5):
+        self.delay = delay
+        self._pending: dict[Hashable, Callable[[], Awaitable]] = {}  # Last follow-up per open window
+        self._windows: dict[Hashable, asyncio.Task] = {}
+
+    async def call(self, key: Hashable, func: Callable[[], Awaitable]):
+        """Run `func()` now, or when the window of a recent call for `key` closes."""
+        if self.delay <= 0:
+            await func()
+            return
+        if key in self._windows:
+            if self._pending.get(key) is not None:
+                metrics.DEBOUNCED.inc()
+            self._pending[key] = func
+            return
+        self._windows[key] = asyncio.create_task(self._window(key))
+        await func()
+
+    async def drain(self, timeout: float = 10.0):
+        """Wait (up to `timeout`) for deferred calls, e.g. before shutting down."""
+        if self._windows:
+            await asyncio.wait(list(self._windows.values()), timeout=timeout)
+
+    async def _window(self, key: Hashable):
+        try:
+            while True:
+                await asyncio.sleep(self.delay)
+                func = self._pending.pop(key, None)
+                if func is None:
+                    return
+                try:
+                    await func()
+                except Exception as e:
+                    logger.error(f"Debounced call for {key!r} failed: {e}", exc_info=True)
+        finally:
+            self._pending.pop(key, None)
+            del self._windows[key]
+
+
+class QuotaGovernor:
+    """
+    Decides how much upstream traffic the remaining RapidAPI quota allows:
+
+    normal      → searches go upstream as their caller asks
+    local_first → below `local_first_below` of the quota, every search is
+                  answered from recent results or the corpus when possible
+    cache_only  → below `cache_only_below`, nothing goes upstream except one
+                  probe every `probe_interval` seconds (to learn the quota)
+                  until the reported reset time has passed
+    """
+
+    NORMAL = "normal"
+    LOCAL_FIRST = "local_first"
+    CACHE_ONLY = "cache_only"
+    LEVELS = (NORMAL, LOCAL_FIRST, CACHE_ONLY)
+
+    def __init__(self, quota, local_first_below: float = 0.2, cache_only_below: float = 0.05,
+                 probe_interval: float = 600.0):
+        """
+        Args:
+            quota: QuotaTracker of the upstream (see resilience.py)
+            local_first_below: Fraction of the quota below which searches go local first
+            cache_only_below: Fraction below which searches don't go upstream at all
+            probe_interval: Seconds between upstream calls let through in cache-only mode
+        """
+        self.quota = quota
+        self.local_first_below = local_first_below
+        self.cache_only_below = cache_only_below
+        self.probe_interval = probe_interval
+        self._last_probe: Optional[float] = None
+        metrics.QUOTA_MODE.set_function(lambda: self.LEVELS.index(self.mode()))
+
+    def mode(self, now: Optional[float] = None) -> str:
+        fraction = self.quota.fraction_remaining()
+        if fraction is None:
+            return self.NORMAL
+        reset, updated = self.quota.reset_seconds, self.quota.updated_at
+        if reset is not None and updated is not None and (now or time.time()) >= updated + reset:
+            # The quota has reset since the headers were read; the next call reports the new one
+            return self.NORMAL
+        if fraction < self.cache_only_below:
+            return self.CACHE_ONLY
+        if fraction < self.local_first_below:
+            return self.LOCAL_FIRST
+        return self.NORMAL
+
+    def allow_upstream(self) -> bool:
+        """Whether a search may go upstream now (cache-only mode lets a probe through now and then)."""
+        if self.mode() != self.CACHE_ONLY:
+            return True
+        now = time.monotonic()
+        if self._last_probe is None or now - self._last_probe >= self.probe_interval:
+            self._last_probe = now
+            return True
+        return False
+
+    def stats(self) -> dict:
+        return {"mode": self.mode(), "fraction_remaining": self.quota.fraction_remaining()}
@@ -0,0 +1,272 @@
+"""
+🧭 Tracing Module
+Lightweight per-update tracing:
+  → A trace id per Telegram update, propagated with contextvars (so it
+    follows awaits, tasks and asyncio.to_thread)
+  → `span()` context manager for timing pipeline steps
+  → Head sampling; unsampled traces cost one contextvar lookup per span
+  → Exporters: local JSONL file or an OTLP/HTTP (JSON) collector
+
+Configured from the environment:
+  TRACE_EXPORTER      none | jsonl | otlp      (default: none)
+  TRACE_SAMPLE_RATE   0.0 - 1.0                (default: 0.05)
+  TRACE_FILE          JSONL path               (default: traces.jsonl)
+  OTLP_ENDPOINT       collector URL            (default: http://localhost:4318/v1/traces)
+"""
+
+import os
+import time
+import queue
+import random
+import logging
+import functools
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Optional
+
+import fast_json
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "telegram-job-bot"
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+
+
+class Span:
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, trace_id: str, parent_id: Optional[str], name: str, attributes: dict):
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.name = name
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes = attributes
+        self.error = None
+
+    def set(self, key: str, value):
+        self.attributes[key] = value
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class _NoopSpan:
+    """Returned for unsampled traces so callers can call .set() unconditionally."""
+
+    __slots__ = ()
+
+    def set(self, key: str, value):
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+# ─── Exporters ───────────────────────────────────────────────────────────────
+
+class _BatchExporter:
+    """Collects finished spans on a queue and writes them from a daemon thread."""
+
+    def __init__(self, batch_size: int = 256, flush_interval: float = 2.0, max_queue: int = 10_000):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name=type(self).__name__, daemon=True)
+        self._thread.start()
+
+    def submit(self, span: Span):
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            pass  # Drop spans rather than block the event loop
+
+    def _run(self):
+        while True:
+            batch = []
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            if batch:
+                try:
+                    self.export(batch)
+                except Exception as e:
+                    logger.warning(f"Trace export failed: {e}")
+
+    def export(self, spans: list[Span]):
+        raise NotImplementedError
+
+
+class JsonlExporter(_BatchExporter):
+    """Appends one JSON object per span to a local file."""
+
+    def __init__(self, path: str, **kwargs):
+        self.path = path
+        super().__init__(**kwargs)
+
+    def export(self, spans: list[Span]):
+        with open(self.path, "ab") as f:
+            f.write(b"".join(fast_json.dumps(span.to_dict()) + b"\n" for span in spans))
+
+
+class OtlpHttpExporter(_BatchExporter):
+    """Posts spans to an OpenTelemetry collector using OTLP/HTTP with JSON encoding."""
+
+    def __init__(self, endpoint: str, **kwargs):
+        self.endpoint = endpoint
+        self._client = None
+        super().__init__(**kwargs)
+
+    @staticmethod
+    def _attribute(key: str, value) -> dict:
+        if isinstance(value, bool):
+            return {"key": key, "value": {"boolValue": value}}
+        if isinstance(value, int):
+            return {"key": key, "value": {"intValue": str(value)}}
+        if isinstance(value, float):
+            return {"key": key, "value": {"doubleValue": value}}
+        return {"key": key, "value": {"stringValue": str(value)}}
+
+    def export(self, spans: list[Span]):
+        import httpx
+
+        if self._client is None:
+            self._client = httpx.Client(timeout=5.0)
+        otlp_spans = []
+        for span in spans:
+            item = {
+                "traceId": span.trace_id,
+                "spanId": span.span_id,
+                "name": span.name,
+                "kind": 1,
+                "startTimeUnixNano": str(span.start_ns),
+                "endTimeUnixNano": str(span.end_ns),
+                "attributes": [self._attribute(k, v) for k, v in span.attributes.items()],
+                "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+            }
+            if span.parent_id:
+                item["parentSpanId"] = span.parent_id
+            otlp_spans.append(item)
+        payload = {
+            "resourceSpans": [{
+                "resource": {"attributes": [self._attribute("service.name", SERVICE_NAME)]},
+                "scopeSpans": [{"scope": {"name": "tracing"}, "spans": otlp_spans}],
+            }]
+        }
+        self._client.post(self.endpoint, json=payload).raise_for_status()
+
+
+# ─── Tracer ──────────────────────────────────────────────────────────────────
+
+class Tracer:
+    def __init__(self, exporter: Optional[_BatchExporter] = None, sample_rate: float = 0.05):
+        self.exporter = exporter
+        self.sample_rate = sample_rate if exporter else 0.0
+
+    @contextmanager
+    def trace(self, name: str, **attributes):
+        """
+        Start a new trace (root span) for one unit of work, e.g. an update.
+        The sampling decision is made here; nested spans inherit it.
+        """
+        if self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            token = _current_span.set(None)
+            try:
+                yield _NOOP
+            finally:
+                _current_span.reset(token)
+            return
+        root = Span(f"{random.getrandbits(128):032x}", None, name, attributes)
+        yield from self._run_span(root)
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """Time a step of the current trace. No-op outside a sampled trace."""
+        parent = _current_span.get()
+        if parent is None:
+            yield _NOOP
+            return
+        yield from self._run_span(Span(parent.trace_id, parent.span_id, name, attributes))
+
+    def _run_span(self, span: Span):
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end_ns = time.time_ns()
+            self.exporter.submit(span)
+
+
+def current_trace_id() -> Optional[str]:
+    span = _current_span.get()
+    return span.trace_id if span else None
+
+
+def configure_from_env() -> Tracer:
+    kind = os.getenv("TRACE_EXPORTER", "none").lower()
+    sample_rate = float(os.getenv("TRACE_SAMPLE_RATE", "0.05"))
+    exporter = None
+    if kind == "jsonl":
+        exporter = JsonlExporter(os.getenv("TRACE_FILE", "traces.jsonl"))
+    elif kind == "otlp":
+        exporter = OtlpHttpExporter(os.getenv("OTLP_ENDPOINT", "http://localhost:4318/v1/traces"))
+    return Tracer(exporter, sample_rate)
+
+
+tracer = configure_from_env()
+
+
+def span(name: str, **attributes):
+    """Shortcut for `tracer.span(...)`."""
+    return tracer.span(name, **attributes)
+
+
+def traced_handler(handler):
+    """Wrap a Telegram handler so every update it processes starts a trace."""
+
+    @functools.wraps(handler)
+    async def wrapper(update, context, *args, **kwargs):
+        attributes = {"handler": handler.__name__}
+        update_id = getattr(update, "update_id", None)
+        if update_id is not None:
+            attributes["update_id"] = update_id
+        with tracer.trace(f"update.{handler.__name__}", **attributes):
+            return await handler(update, context, *args, **kwargs)
+
+    return wrapper
+
+
+def traced(name: str):
+    """Decorator: run an async function inside a span of the current trace."""
+
+    def decorator(function):
+        @functools.wraps(function)
+        async def wrapper(*args, **kwargs):
+            with tracer.span(name):
+                return await function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator